@@ -1,6 +1,18 @@
 """othpc module."""
 
 from .submit_function import SubmitFunction
+from .local_executor import LocalPoolExecutor
+from .dispatch import DispatchExecutor
+from .ask_tell import AskTellDriver
+from .runtime_model import RuntimeModel
+from .shared_scheduler import SharedScheduler
+from .template import InputTemplate
+from .persistent_model import PersistentModel
+from .field_store import FieldStore
+from .result_store import ResultStore
+from .telemetry import Telemetry
+from .evaluation_group import EvaluationGroup, get_evaluation_group
+from .simulation import SchedulerSimulator, load_task_runtimes, load_queue_waits
 from .utils import (
     TempSimuDir,
     make_report_file,
@@ -8,6 +20,9 @@ from .utils import (
     evaluation_error_log,
     load_cache,
     fake_load,
+    mpi_launch_command,
+    slurm_job_limit,
+    slurm_queued_jobs,
 )
 
 # To circumvent a bug in OpenTURNS 1.24
@@ -27,11 +42,29 @@ if Version(_ot.__version__) < Version("1.25"):
 
 __all__ = [
     "SubmitFunction",
+    "LocalPoolExecutor",
+    "DispatchExecutor",
+    "SchedulerSimulator",
+    "AskTellDriver",
+    "RuntimeModel",
+    "SharedScheduler",
+    "InputTemplate",
+    "EvaluationGroup",
+    "PersistentModel",
+    "FieldStore",
+    "ResultStore",
+    "Telemetry",
     "TempSimuDir",
     "make_report_file",
     "make_summary_file",
     "evaluation_error_log",
     "load_cache",
     "fake_load",
+    "mpi_launch_command",
+    "get_evaluation_group",
+    "slurm_job_limit",
+    "slurm_queued_jobs",
+    "load_task_runtimes",
+    "load_queue_waits",
 ]
 __version__ = "0.1"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import time
+import openturns as ot
+
+
+class AskTellDriver(object):
+    """
+    Asynchronous ask/tell interface on top of a :class:`~othpc.SubmitFunction`.
+
+    Sequential and adaptive algorithms usually alternate between computing new points and
+    evaluating them synchronously, so that the cluster idles while the algorithm computes.
+    This driver keeps a target number of evaluations in flight instead: the algorithm
+    asks how many points it should propose, tells them to the driver which submits them
+    as soon as there is room, and collects the results as they arrive.
+
+    Parameters
+    ----------
+    submit_function : :class:`~othpc.SubmitFunction`
+        Function evaluating the points, whose executor and batching settings are used.
+    max_in_flight : int
+        Target number of evaluations submitted and not yet collected.
+        By default, twice the number of tasks per job.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import openturns as ot
+    >>> f = ot.SymbolicFunction(["x"], ["2 * x"])
+    >>> sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local")
+    >>> driver = othpc.AskTellDriver(sf, max_in_flight=4)
+    >>> driver.ask()
+    4
+    >>> ids = driver.tell([[1.0], [2.0], [3.0]])
+    >>> ids, X, Y = driver.results(wait=True)
+    """
+
+    def __init__(self, submit_function, max_in_flight=None):
+        self.submit_function = submit_function
+        if max_in_flight is None:
+            max_in_flight = 2 * submit_function.points_per_job
+        self.max_in_flight = max_in_flight
+        self._inputs = ot.Sample(0, submit_function.getInputDimension())
+        self._inputs.setDescription(submit_function.getInputDescription())
+        self._attempts = []
+        self._queued = []
+        self._jobs = []
+
+    @property
+    def n_in_flight(self):
+        """Number of points submitted and not yet collected."""
+        return sum(len(batch) for _, batch in self._jobs)
+
+    @property
+    def n_queued(self):
+        """Number of points told and waiting for room to be submitted."""
+        return len(self._queued)
+
+    def ask(self):
+        """
+        Returns the number of new points the algorithm should propose to keep the target in flight.
+        """
+        return max(0, self.max_in_flight - self.n_in_flight - self.n_queued)
+
+    def tell(self, X):
+        """
+        Adds points to evaluate, which are submitted as soon as there is room.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points to evaluate.
+
+        Returns
+        -------
+        ids : list of int
+            Identifiers of the points, as returned by :meth:`results`.
+        """
+        X = ot.Sample(X)
+        start = self._inputs.getSize()
+        self._inputs.add(X)
+        ids = list(range(start, start + X.getSize()))
+        self._attempts += [0] * X.getSize()
+        self._queued += ids
+        self._submit()
+        return ids
+
+    def _submit(self):
+        """Packs the queued points into jobs while the target in flight is not reached."""
+        sf = self.submit_function
+        while len(self._queued) > 0 and self.n_in_flight < self.max_in_flight:
+            size = min(
+                sf.points_per_job, len(self._queued), self.max_in_flight - self.n_in_flight
+            )
+            batch = self._queued[:size]
+            self._queued = self._queued[size:]
+            job = sf._submit_jobs(self._inputs, [batch])[0]
+            self._jobs.append((job, batch))
+
+    def results(self, wait=False):
+        """
+        Collects the evaluations completed since the last call.
+
+        Parameters
+        ----------
+        wait : bool
+            If True, blocks until at least one evaluation is completed,
+            unless nothing is in flight.
+
+        Returns
+        -------
+        ids : list of int
+            Identifiers of the points evaluated.
+        X : :py:class:`openturns.Sample`
+            Points evaluated.
+        Y : :py:class:`openturns.Sample`
+            Corresponding outputs, NaN for the failed evaluations.
+        """
+        sf = self.submit_function
+        ids = []
+        Y = ot.Sample(0, sf.getOutputDimension())
+        Y.setDescription(sf.getOutputDescription())
+        while True:
+            running = []
+            for job, batch in self._jobs:
+                if not job.done():
+                    running.append((job, batch))
+                    continue
+                job_results, failed = sf._gather_job(job, batch)
+                for k, index in enumerate(batch):
+                    # Points lost because of the infrastructure go back to the queue
+                    if index in failed and self._attempts[index] < sf.max_retries:
+                        self._attempts[index] += 1
+                        self._queued.append(index)
+                        continue
+                    ids.append(index)
+                    Y.add(job_results[k])
+            self._jobs = running
+            self._submit()
+            if len(ids) > 0 or not wait or len(self._jobs) == 0:
+                break
+            time.sleep(1)  # Avoids spamming the scheduler
+        X = self._inputs.select(ids)
+        sf._update_cache(X, Y)
+        return ids, X, Y
+
+    def cancel(self):
+        """Cancels the jobs in flight and forgets the queued points."""
+        for job, _ in self._jobs:
+            job.cancel(check=False)
+        self._jobs = []
+        self._queued = []
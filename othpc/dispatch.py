@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import glob
+import time
+import openturns as ot
+
+
+class DispatchExecutor(object):
+    """
+    Executor dispatching the jobs across several executors, for example one per SLURM partition or cluster.
+
+    It follows the interface of the submitit executors, so that it can be passed as the `backend`
+    of a :class:`~othpc.SubmitFunction`, which returns one ordered sample whatever the executor of each job.
+    Each job goes to the executor where it is expected to finish first, according to the queue wait and
+    the duration of the jobs observed so far on each executor, and to the number of jobs it already has in flight
+    relative to its weight. Before any observation, the jobs are spread in proportion to the weights.
+
+    Parameters
+    ----------
+    executors : list
+        Executors, such as `submitit.AutoExecutor` or :class:`~othpc.LocalPoolExecutor`.
+    parameters : list of dict
+        Parameters specific to each executor (for example `{"slurm_partition": "bm"}`),
+        applied over the parameters set by :meth:`update_parameters`. None by default.
+    weights : list of float
+        Relative capacity of each executor. Equal weights by default.
+    history : int
+        Number of recent jobs of an executor averaged to estimate its queue wait and job duration.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import openturns as ot
+    >>> executor = othpc.DispatchExecutor(
+    ...     [othpc.LocalPoolExecutor(cpus=1), othpc.LocalPoolExecutor(cpus=2)], weights=[1.0, 2.0]
+    ... )
+    >>> f = ot.SymbolicFunction(["x"], ["2 * x"])
+    >>> sf = othpc.SubmitFunction(f, backend=executor)
+    >>> Y = sf([[1.0], [2.0], [3.0]])
+    >>> sum(executor.submitted)
+    3
+    """
+
+    def __init__(self, executors, parameters=None, weights=None, history=10):
+        self.executors = list(executors)
+        if parameters is None:
+            parameters = [{} for _ in self.executors]
+        if weights is None:
+            weights = [1.0] * len(self.executors)
+        if len(parameters) != len(self.executors) or len(weights) != len(self.executors):
+            raise ValueError("One set of parameters and one weight are expected per executor.")
+        self.parameters = list(parameters)
+        self.weights = list(weights)
+        self.history = history
+        # Jobs in flight of each executor, with their submission and start times
+        self._in_flight = [[] for _ in self.executors]
+        self._waits = [[] for _ in self.executors]
+        self._durations = [[] for _ in self.executors]
+        self.submitted = [0] * len(self.executors)
+        for executor, executor_parameters in zip(self.executors, self.parameters):
+            if len(executor_parameters) > 0:
+                executor.update_parameters(**executor_parameters)
+
+    def __getstate__(self):
+        # The jobs in flight hold threads and locks, which are not sent to the workers
+        state = self.__dict__.copy()
+        state["_in_flight"] = [[] for _ in self.executors]
+        return state
+
+    def update_parameters(self, **kwargs):
+        """
+        Updates the parameters of the jobs submitted afterwards to every executor,
+        the parameters specific to an executor taking precedence.
+        """
+        for executor, executor_parameters in zip(self.executors, self.parameters):
+            executor.update_parameters(**{**kwargs, **executor_parameters})
+
+    def _task_times(self, job):
+        """
+        Returns the time at which the first task of a job started and the time at which its last task ended,
+        read from the files written by the tasks of :class:`~othpc.SubmitFunction`, None if there are none yet.
+        """
+        folder = os.path.join("logs", str(job.job_id))
+        starts = [
+            os.path.getmtime(filename)
+            for filename in glob.glob(os.path.join(folder, "*_input.csv"))
+        ]
+        ends = []
+        for filename in glob.glob(os.path.join(folder, "*_timing.csv")):
+            timing = ot.Sample.ImportFromCSVFile(filename)[0]
+            starts.append(timing[0])
+            ends.append(timing[0] + timing[1])
+        start = min(starts) if len(starts) > 0 else None
+        end = max(ends) if len(ends) > 0 else None
+        return start, end
+
+    def refresh(self):
+        """
+        Records the queue wait and duration of the jobs which started or finished.
+
+        The start of a job is the start of its first task, and its end the end of its last task,
+        as recorded in their files. A job which ended without running any task, for example cancelled
+        while it was queued, is not recorded. It is called by :class:`~othpc.SubmitFunction`
+        each time it polls its jobs, and before each submission.
+        """
+        for k, in_flight in enumerate(self._in_flight):
+            running = []
+            for job, submitted, started in in_flight:
+                done = job.done()
+                if started is None or done:
+                    start, end = self._task_times(job)
+                    if started is None and start is not None:
+                        started = start
+                        self._waits[k] = (self._waits[k] + [max(0.0, start - submitted)])[
+                            -self.history :
+                        ]
+                if not done:
+                    running.append((job, submitted, started))
+                elif started is not None and end is not None:
+                    self._durations[k] = (self._durations[k] + [max(0.0, end - started)])[
+                        -self.history :
+                    ]
+            self._in_flight[k] = running
+
+    def _score(self, k):
+        """
+        Returns the expected time for a new job on an executor to finish,
+        and the load of the executor, used to break ties.
+        """
+        wait = sum(self._waits[k]) / len(self._waits[k]) if self._waits[k] else 0.0
+        duration = (
+            sum(self._durations[k]) / len(self._durations[k]) if self._durations[k] else 0.0
+        )
+        load = (len(self._in_flight[k]) + 1) / self.weights[k]
+        return (wait + duration * load, load)
+
+    def _choose(self):
+        """Returns the index of the executor of the next job."""
+        self.refresh()
+        return min(range(len(self.executors)), key=self._score)
+
+    def submit(self, fn, *args):
+        """
+        Submits a job running `fn(*args)` to the executor where it is expected to finish first.
+
+        Returns
+        -------
+        job : submitit.Job or :class:`~othpc.local_executor.LocalJob`
+            Handle on the submitted job.
+        """
+        k = self._choose()
+        job = self.executors[k].submit(fn, *args)
+        self._in_flight[k].append((job, time.time(), None))
+        self.submitted[k] += 1
+        return job
+
+    def reattach(self, job_id, num_tasks):
+        """
+        Returns a handle on a job submitted by a previous driver process,
+        through the first executor of the same kind as the one which submitted it.
+        """
+        local = job_id.startswith("local-")
+        for executor in self.executors:
+            if local and hasattr(executor, "reattach"):
+                return executor.reattach(job_id)
+            if not local and not hasattr(executor, "reattach"):
+                return executor._executor.job_class(
+                    folder="logs/%j", job_id=job_id, tasks=range(num_tasks)
+                )
+        raise ValueError(f"No executor can reattach to job {job_id}.")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+
+
+class EvaluationGroup(object):
+    """
+    Group of SLURM tasks (MPI ranks) running one evaluation together.
+
+    When a :class:`~othpc.SubmitFunction` has `ranks_per_evaluation` greater than 1,
+    each evaluation is run by a group of consecutive tasks of a job. Every rank of the group
+    calls the callable on the same input point, and the callable finds its place in the group with
+    :func:`get_evaluation_group`. Only the rank 0 of the group writes the input, output and timing files
+    of the evaluation, and its output is the one returned.
+
+    Parameters
+    ----------
+    index : int
+        Index of the group in its job, i.e. of the evaluation.
+    rank : int
+        Rank of the current task within the group.
+    size : int
+        Number of ranks of the group.
+    comm : mpi4py.MPI.Comm
+        Communicator gathering the ranks of the group, obtained by splitting `MPI.COMM_WORLD`.
+        None if mpi4py is not installed or if the tasks of the job do not share `MPI.COMM_WORLD`,
+        for example with the local backend.
+    """
+
+    def __init__(self, index=0, rank=0, size=1, comm=None):
+        self.index = index
+        self.rank = rank
+        self.size = size
+        self.comm = comm
+
+    def __repr__(self):
+        return f"EvaluationGroup(index={self.index}, rank={self.rank}, size={self.size})"
+
+
+# Group of the task running in the current process
+_current_group = EvaluationGroup()
+
+
+def get_evaluation_group():
+    """
+    Returns the evaluation group of the current task.
+
+    Outside of a job, or with one rank per evaluation, the group has a single rank.
+
+    Returns
+    -------
+    group : :class:`~othpc.EvaluationGroup`
+        Group of the current task.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> othpc.get_evaluation_group()
+    EvaluationGroup(index=0, rank=0, size=1)
+    """
+    return _current_group
+
+
+def _split_world(job_env, group_index, group_rank):
+    """
+    Returns the communicator of an evaluation group, or None if the tasks of the job
+    are not the ranks of `MPI.COMM_WORLD`.
+
+    It must be called by all the tasks of the job, since splitting the communicator is collective.
+    """
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        return None
+    world = MPI.COMM_WORLD
+    if job_env is None or world.Get_size() != job_env.num_tasks:
+        return None
+    return world.Split(color=group_index, key=group_rank)
+
+
+def _set_evaluation_group(group):
+    global _current_group
+    _current_group = group
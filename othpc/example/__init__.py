@@ -1,3 +1,7 @@
 from .cantilever_beam.cantilever_beam import CantileverBeam
-from .warren_truss_structure.truss_fem_model import warren_truss_displacement
+from .warren_truss_structure.truss_fem_model import (
+    warren_truss_displacement,
+    WarrenTrussModel,
+    WarrenTrussSession,
+)
 from .load_simulator.MPILoadSimulator import MPILoadSimulator
@@ -7,6 +7,7 @@ Copyright (C) EDF 2025
 """
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 import openturns as ot
 import openturns.coupling_tools as otct
 import othpc
@@ -25,7 +26,9 @@ class CantileverBeam(ot.OpenTURNSPythonFunction):
         Name of the result directory where the result sub-folders are written.
 
     n_cpus : integer
-        Number of parallel evaluations realized by multiprocessing.
+        Number of parallel evaluations realized by multiprocessing when a sample is evaluated,
+        each one in its own simulation directory. Under :class:`~othpc.SubmitFunction`, a task only
+        evaluates a sample with `points_per_task` greater than one, for example equal to `cpus_per_task`.
 
     fake_load_time : int
         Duration in seconds of a fake computational load used to simulate long computations.
@@ -44,6 +47,9 @@ class CantileverBeam(ot.OpenTURNSPythonFunction):
                 f"The input template {input_template_file} file does not exist."
             )
         self.input_template_file = input_template_file
+        self.input_template = othpc.InputTemplate(
+            input_template_file, ["@F@", "@E@", "@L@", "@I@"]
+        )
         #
         license_file = os.path.join(template_dir, "LICENCE.xml")
         if not os.path.isfile(license_file):
@@ -75,13 +81,8 @@ class CantileverBeam(ot.OpenTURNSPythonFunction):
             Simulation directory dedicated to the evaluation of the input point x.
         """
         # Creation du fichier d'entree
-        otct.replace(
-            # File template including your tokens to be replaced by values from a design of exp.
-            self.input_template_file,
-            # File written after replacing the tokens by the values in X
-            os.path.join(simulation_directory, "beam_input.xml"),
-            ["@F@", "@E@", "@L@", "@I@"],
-            [x[0], x[1], x[2], x[3]],
+        self.input_template.write(
+            x, os.path.join(simulation_directory, "beam_input.xml")
         )
 
     def _parse_output(self, simulation_directory):
@@ -141,3 +142,18 @@ class CantileverBeam(ot.OpenTURNSPythonFunction):
             # Write input-output summary csv file
             othpc.make_report_file(simu_dir, x, [y])
         return [y]
+
+    def _exec_sample(self, X):
+        """
+        Executes the evaluations of the black-box model for a sample, up to `n_cpus` at once.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Input points to be evaluated.
+        """
+        X = [list(x) for x in X]
+        if self.n_cpus == 1 or len(X) <= 1:
+            return [self._exec(x) for x in X]
+        with ProcessPoolExecutor(max_workers=min(self.n_cpus, len(X))) as executor:
+            return list(executor.map(self._exec, X))
@@ -6,6 +6,7 @@ Copyright (C) EDF 2025
 @authors: Elias Fekhari, Joseph Muré
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 import openturns as ot
 import openturns.coupling_tools as otct
 import othpc
@@ -14,7 +15,35 @@ from subprocess import CalledProcessError
 
 class MPILoadSimulator(ot.OpenTURNSPythonFunction):
     """
-    TBD
+    This class allows to evaluate an MPI program simulating a computational load on various input points.
+
+    Parameters:
+    ----------
+    nb_mpi_proc : int
+        Number of MPI processes of one evaluation.
+    simu_duration : float
+        Duration in seconds of the load simulated by one evaluation.
+    nb_slurm_nodes : int
+        Number of nodes the MPI processes of one evaluation are spread on.
+    slurm_timeout : int
+        Timeout in minutes of the allocation requested by `salloc` for one evaluation.
+    results_directory : str
+        Name of the result directory where the result sub-folders are written.
+    launcher : str
+        How an evaluation is launched:
+
+        - "salloc" (default) requests a new allocation per evaluation,
+        - "srun" runs the evaluation as a job step of the enclosing SLURM allocation,
+          so that it does not queue again and shares the nodes of the allocation with the other evaluations.
+          The allocation must hold `nb_mpi_proc` CPUs times the number of concurrent evaluations,
+          for example with `cpus_per_task=nb_mpi_proc` when each SLURM task runs one evaluation,
+          otherwise SLURM rejects the steps,
+        - "mpiexec" runs the evaluation on the local host,
+        - "auto" uses "srun" inside a SLURM job and "mpiexec" otherwise.
+    slurm_wckey : str
+        Project identification key of the allocations requested by `salloc`.
+    n_parallel : int
+        Number of evaluations run at once when a sample is evaluated.
     """
 
     def __init__(
@@ -24,6 +53,9 @@ class MPILoadSimulator(ot.OpenTURNSPythonFunction):
         nb_slurm_nodes=1,
         slurm_timeout=5,
         results_directory="my_results",
+        launcher="salloc",
+        slurm_wckey="P12H8:SALOME",
+        n_parallel=1,
     ):
         super().__init__(2, 1)
         #
@@ -41,6 +73,13 @@ class MPILoadSimulator(ot.OpenTURNSPythonFunction):
         self.nb_slurm_nodes = nb_slurm_nodes
         self.simu_duration = simu_duration
         self.slurm_timeout = slurm_timeout
+        if launcher not in ["salloc", "srun", "mpiexec", "auto"]:
+            raise ValueError(
+                f'Unknown launcher "{launcher}", expected "salloc", "srun", "mpiexec" or "auto".'
+            )
+        self.launcher = launcher
+        self.slurm_wckey = slurm_wckey
+        self.n_parallel = n_parallel
 
     def _parse_output(self, simulation_directory):
         """
@@ -62,6 +101,19 @@ class MPILoadSimulator(ot.OpenTURNSPythonFunction):
             y = float("nan")
         return y
 
+    def _command(self, x):
+        """Returns the command line of the evaluation of the input point x."""
+        command = f"{self.executable_file} {x[0]} {x[1]} --cpu-interval={self.simu_duration}"
+        if self.launcher == "salloc":
+            return (
+                f"salloc --nodes={self.nb_slurm_nodes} --ntasks-per-node={self.nb_mpi_proc//self.nb_slurm_nodes} "
+                f"--time={self.slurm_timeout} --wckey={self.slurm_wckey} mpiexec -n {self.nb_mpi_proc} {command}"
+            )
+        launcher = None if self.launcher == "auto" else self.launcher
+        return othpc.mpi_launch_command(
+            command, self.nb_mpi_proc, self.nb_slurm_nodes, launcher
+        )
+
     def _exec(self, x):
         """
         Executes one evaluation of the black-box model for one input x.
@@ -74,12 +126,8 @@ class MPILoadSimulator(ot.OpenTURNSPythonFunction):
         with othpc.TempSimuDir(res_dir=self.results_directory) as simu_dir:
             # Execution
             try:
-                otct.execute(
-                    f"salloc --nodes={self.nb_slurm_nodes} --ntasks-per-node={self.nb_mpi_proc//self.nb_slurm_nodes} --time={self.slurm_timeout} --wckey=P12H8:SALOME mpiexec -n {self.nb_mpi_proc} {self.executable_file} {x[0]} {x[1]} --cpu-interval={self.simu_duration}",
-                    shell=True,
-                    cwd=simu_dir,
-                )
-                print("SBATCH DONE")
+                otct.execute(self._command(x), shell=True, cwd=simu_dir)
+                print("SIMULATION DONE")
                 # Parse outputs
                 y = self._parse_output(simu_dir)
             except CalledProcessError as error:
@@ -90,3 +138,19 @@ class MPILoadSimulator(ot.OpenTURNSPythonFunction):
             # Write input-output summary csv file
             # othpc.make_report_file(simu_dir, x, [y])
         return [y]
+
+    def _exec_sample(self, X):
+        """
+        Executes the evaluations of a sample, up to `n_parallel` at once.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Input points to be evaluated.
+        """
+        X = [list(x) for x in X]
+        if self.n_parallel == 1 or len(X) <= 1:
+            return [self._exec(x) for x in X]
+        # The evaluations run in their own processes, threads are enough to wait for them
+        with ThreadPoolExecutor(max_workers=min(self.n_parallel, len(X))) as executor:
+            return list(executor.map(self._exec, X))
@@ -9,10 +9,16 @@ import othpc
 import openturns as ot
 from MPILoadSimulator import MPILoadSimulator
 
+# Each evaluation runs as a job step of the allocation of its SLURM task,
+# the evaluations of a job share its two nodes instead of queuing for their own.
+# The allocation must hold the 10 MPI processes of each of the 2 concurrent evaluations:
+# 2 tasks of 10 CPUs each, one per node.
 cb = MPILoadSimulator(
-    nb_mpi_proc=10, nb_slurm_nodes=2, simu_duration=2, slurm_timeout=5
+    nb_mpi_proc=10, nb_slurm_nodes=2, simu_duration=2, launcher="srun"
+)
+sf = othpc.SubmitFunction(
+    cb, nodes_per_job=2, ntasks_per_node=1, cpus_per_task=10, timeout_per_job=5
 )
-sf = othpc.SubmitFunction(cb, timeout_per_job=5)
 f = ot.Function(sf)
 X = ot.Sample.ImportFromCSVFile("input_doe/doe_small.csv", ",")
 Y = f(X[:3])
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari
+
+Compares the per-point Warren truss model with its vectorized version.
+The per-point model is only run up to 10^4 points, its time being extrapolated beyond.
+"""
+import time
+import numpy as np
+import openturns as ot
+from othpc.example import warren_truss_displacement, WarrenTrussModel
+
+E = ot.LogNormalMuSigma(2.1e11, 2.1e10).getDistribution()
+A = ot.LogNormalMuSigma(0.01, 0.001).getDistribution()
+P = ot.Normal(-2000, 200)
+distribution = ot.JointDistribution([E, A, P])
+
+per_point_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+vectorized_model = ot.Function(WarrenTrussModel())
+
+print(f"{'size':>8} {'per point (s)':>14} {'vectorized (s)':>15} {'speedup':>8}")
+per_point_rate = None
+for size in [10**3, 10**4, 10**5, 10**6]:
+    X = distribution.getSample(size)
+    start = time.perf_counter()
+    Y_vectorized = vectorized_model(X)
+    vectorized_time = time.perf_counter() - start
+    if size <= 10**4:
+        start = time.perf_counter()
+        Y_per_point = per_point_model(X)
+        per_point_time = time.perf_counter() - start
+        per_point_rate = per_point_time / size
+        assert np.allclose(Y_vectorized, Y_per_point, rtol=1e-10)
+        label = f"{per_point_time:14.3f}"
+    else:
+        per_point_time = per_point_rate * size
+        label = f"{per_point_time:13.1f}*"
+    print(
+        f"{size:8d} {label} {vectorized_time:15.3f} {per_point_time / vectorized_time:8.0f}"
+    )
+print("* extrapolated")
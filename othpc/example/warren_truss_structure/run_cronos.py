@@ -7,7 +7,7 @@ Copyright (C) EDF 2025
 """
 import othpc
 import openturns as ot
-from othpc.example import warren_truss_displacement
+from othpc.example import WarrenTrussModel
 
 # Material and section properties
 E = ot.LogNormalMuSigma(2.1e11, 2.1e10).getDistribution()  # Young's modulus (Pa)
@@ -17,7 +17,7 @@ P = ot.Normal(-2000, 200)  # uniform load applied uniformally per node (in N, do
 
 distribution = ot.JointDistribution([E, A, P])
 X = distribution.getSample(int(5))
-truss_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+truss_model = WarrenTrussModel()
 slurm_truss_model = othpc.SubmitFunction(
     truss_model, ntasks_per_node=1, nodes_per_job=1, cpus_per_task=1, timeout_per_job=1
 )
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import numpy as np
+import openturns as ot
+import othpc
 # from truss_plot import plot_truss_structure
 
 
@@ -103,3 +105,105 @@ def warren_truss_displacement(X):
     max_disp = np.max(magnitudes)
     max_node = np.argmax(magnitudes)
     return [displacements[3][1]] #displacement at central node
+
+
+class WarrenTrussModel(ot.OpenTURNSPythonFunction):
+    """
+    Vectorized version of :func:`warren_truss_displacement`.
+
+    The topology of the truss, the unit stiffness of its elements and the load pattern are
+    computed once. A sample is then evaluated by blocks: the stiffness matrices of a block of points
+    are assembled at once with `numpy.einsum`, and solved with a stacked `numpy.linalg.solve`.
+
+    Parameters
+    ----------
+    block_size : int
+        Number of points whose stiffness matrices are assembled and solved together,
+        which bounds the memory used by the evaluation of large samples.
+    """
+
+    def __init__(self, block_size=10000):
+        super().__init__(3, 1)
+        self.setInputDescription(["E", "A", "P"])
+        self.setOutputDescription(["displacement"])
+        self.block_size = block_size
+        n_panels = 6
+        panel_length = 1.0
+        height = 1.0
+        DOF = 2
+        # Same nodes and elements as warren_truss_displacement
+        nodes = [[i * panel_length, 0.0] for i in range(n_panels + 1)]
+        nodes += [[(i + 0.5) * panel_length, height] for i in range(n_panels)]
+        nodes = np.array(nodes)
+        top_offset = n_panels + 1
+        elements = [(i, i + 1) for i in range(n_panels)]
+        elements += [(top_offset + i, top_offset + i + 1) for i in range(n_panels - 1)]
+        for i in range(n_panels):
+            if i % 2 == 0:
+                elements += [(i, top_offset + i), (top_offset + i, i + 1)]
+            else:
+                elements += [(i + 1, top_offset + i), (top_offset + i, i)]
+        n_dofs = len(nodes) * DOF
+
+        # Stiffness of each element for E * A = 1, scattered in the global dofs
+        unit_stiffness = np.zeros((len(elements), n_dofs, n_dofs))
+        for e, (i, j) in enumerate(elements):
+            delta = nodes[j] - nodes[i]
+            L = np.linalg.norm(delta)
+            direction = np.array([-delta[0], -delta[1], delta[0], delta[1]]) / L
+            dof_map = [i * DOF, i * DOF + 1, j * DOF, j * DOF + 1]
+            unit_stiffness[e][np.ix_(dof_map, dof_map)] = np.outer(direction, direction) / L
+
+        fixed_dofs = [0, 1, n_panels * DOF, n_panels * DOF + 1]
+        free_dofs = np.setdiff1d(np.arange(n_dofs), fixed_dofs)
+        self._unit_stiffness = unit_stiffness[:, free_dofs][:, :, free_dofs]
+        # Unit vertical load on the bottom nodes
+        unit_load = np.zeros(n_dofs)
+        unit_load[[node * DOF + 1 for node in range(n_panels + 1)]] = 1.0
+        self._unit_load = unit_load[free_dofs]
+        # Vertical displacement of the central bottom node
+        self._output_dof = int(np.searchsorted(free_dofs, 3 * DOF + 1))
+
+    def _exec(self, x):
+        return self._exec_sample([x])[0]
+
+    def _exec_sample(self, X):
+        X = np.array(X, dtype=float)
+        Y = np.empty((len(X), 1))
+        n_elements = len(self._unit_stiffness)
+        for start in range(0, len(X), self.block_size):
+            E, A, P = X[start : start + self.block_size].T
+            # Every element shares the same Young's modulus and cross-section
+            stiffness = np.repeat((E * A)[:, None], n_elements, axis=1)
+            K = np.einsum("pe,eij->pij", stiffness, self._unit_stiffness)
+            F = P[:, None] * self._unit_load
+            u = np.linalg.solve(K, F[:, :, None])[:, :, 0]
+            Y[start : start + self.block_size, 0] = u[:, self._output_dof]
+        return Y
+
+
+class WarrenTrussSession(othpc.PersistentModel):
+    """
+    Version of :func:`warren_truss_displacement` with a session built once per process.
+
+    As every element shares the same Young's modulus and cross-section, the stiffness matrix is
+    `E * A` times the one of a truss with unit stiffness, and the load is `P` times a unit load.
+    The setup assembles the unit stiffness matrix and solves for the unit load once, which stands
+    for the mesh reading and factorization of a simulation code; an evaluation only scales the solution.
+    """
+
+    def __init__(self):
+        super().__init__(3, 1)
+        self.setInputDescription(["E", "A", "P"])
+        self.setOutputDescription(["displacement"])
+
+    def setup(self):
+        # The unit stiffness matrices are scaled by E * A = 1
+        truss = WarrenTrussModel()
+        unit_stiffness = truss._unit_stiffness.sum(axis=0)
+        unit_displacement = np.linalg.solve(unit_stiffness, truss._unit_load)
+        self.unit_output = unit_displacement[truss._output_dof]
+
+    def evaluate(self, x):
+        E, A, P = x
+        return [P / (E * A) * self.unit_output]
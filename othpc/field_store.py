@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import json
+import socket
+import threading
+import numpy as np
+from numpy.lib.format import (
+    open_memmap,
+    read_magic,
+    read_array_header_1_0,
+    read_array_header_2_0,
+)
+
+
+class FieldStore(object):
+    """
+    Chunked binary store of field-valued outputs, such as time series or finite element fields.
+
+    Passed to :class:`~othpc.SubmitFunction` as `field_store`, it receives the whole output vector
+    of each evaluation, written by its task at a slot of the store. The function only returns,
+    for each point, the index of its slot followed by scalar summaries of the field, so that neither the
+    per-task CSV files nor the memory of the driver hold the fields.
+
+    The slots are stored by chunks of rows in NumPy binary files of the directory,
+    which are read by memory mapping. Several drivers can share a store: each range of slots
+    is reserved by a file created atomically on the shared filesystem, so that they never
+    hand out the same slots.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the store, on the shared filesystem. An existing store is reopened.
+    field_size : int
+        Number of values of a field, i.e. output dimension of the model.
+    summary : callable
+        Function mapping a field, as a 1-d :py:class:`numpy.ndarray`, to a list of scalar summaries.
+        By default, its mean, minimum and maximum.
+    summary_description : list of str
+        Names of the summaries. Required with a custom summary.
+    chunk_size : int
+        Number of fields per chunk file. By default, chunks of about 256 MB.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import tempfile
+    >>> store = othpc.FieldStore(tempfile.mkdtemp(), 4)
+    >>> slots = store.allocate(2)
+    >>> store.write(slots[1], [1.0, 2.0, 3.0, 4.0])
+    >>> store.summarize(store[slots[1]])
+    [2.5, 1.0, 4.0]
+    """
+
+    def __init__(
+        self,
+        directory,
+        field_size,
+        summary=None,
+        summary_description=None,
+        chunk_size=None,
+    ):
+        if summary is None:
+            summary = _default_summary
+            summary_description = ["mean", "min", "max"]
+        elif summary_description is None:
+            raise ValueError("The description of a custom summary is required.")
+        self.directory = os.path.abspath(directory)
+        self.field_size = field_size
+        self.summary = summary
+        self.summary_description = list(summary_description)
+        if chunk_size is None:
+            chunk_size = max(1, 2**25 // field_size)
+        self.chunk_size = chunk_size
+        self._size = 0
+        os.makedirs(self.directory, exist_ok=True)
+        index_file = os.path.join(self.directory, "index.json")
+        if os.path.isfile(index_file):
+            with open(index_file) as file:
+                index = json.load(file)
+            if index["field_size"] != field_size or index["chunk_size"] != chunk_size:
+                raise ValueError(
+                    f"The store in {self.directory} holds fields of size {index['field_size']} "
+                    f"by chunks of {index['chunk_size']}."
+                )
+            self._size = index["size"]
+
+    def __len__(self):
+        self._size = self._reserved_size()
+        return self._size
+
+    def _chunk_file(self, chunk):
+        return os.path.join(self.directory, f"chunk_{chunk}.npy")
+
+    def _range_file(self, start):
+        return os.path.join(self.directory, "ranges", f"{start}.json")
+
+    def _create_exclusive(self, filename, write):
+        """
+        Creates a file atomically, unless it exists: the content is written to a temporary file
+        by `write`, then hard-linked to its name, which is atomic on NFS too.
+        Returns True if the file was created by this call.
+        """
+        temporary_file = f"{filename}.{_writer_suffix()}"
+        write(temporary_file)
+        try:
+            os.link(temporary_file, filename)
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(temporary_file)
+        return True
+
+    def _reserved_size(self, start=None):
+        """
+        Returns the end of the slots reserved in the directory,
+        following the ranges reserved from `start`, by default from the size in the index.
+        """
+        if start is None:
+            start = self._size
+            index_file = os.path.join(self.directory, "index.json")
+            if os.path.isfile(index_file):
+                with open(index_file) as file:
+                    start = max(start, json.load(file)["size"])
+        while os.path.isfile(self._range_file(start)):
+            with open(self._range_file(start)) as file:
+                start += json.load(file)["count"]
+        return start
+
+    def allocate(self, count):
+        """
+        Reserves slots for new fields, creating the chunk files they need.
+
+        It is called by the drivers only, before the tasks write their fields.
+        The range of slots is claimed by creating its file, named after its first slot,
+        exclusively: a driver losing the race for a range tries the next one.
+
+        Parameters
+        ----------
+        count : int
+            Number of slots.
+
+        Returns
+        -------
+        slots : range
+            Indices of the slots reserved.
+        """
+        os.makedirs(os.path.join(self.directory, "ranges"), exist_ok=True)
+
+        def write_range(filename):
+            with open(filename, "w") as file:
+                json.dump({"count": count}, file)
+
+        start = self._reserved_size()
+        while not self._create_exclusive(self._range_file(start), write_range):
+            start = self._reserved_size(start)
+        end = start + count
+        self._size = max(self._size, end)
+
+        def write_chunk(filename):
+            # Only the header is written, the rows are left to the tasks
+            open_memmap(
+                filename,
+                mode="w+",
+                dtype=float,
+                shape=(self.chunk_size, self.field_size),
+            ).flush()
+
+        last_chunk = (end - 1) // self.chunk_size
+        for chunk in range(start // self.chunk_size, last_chunk + 1):
+            # A chunk created by another driver meanwhile may already hold fields
+            if not os.path.isfile(self._chunk_file(chunk)):
+                self._create_exclusive(self._chunk_file(chunk), write_chunk)
+        # The index only speeds up the search of the next free range
+        index = {
+            "size": end,
+            "field_size": self.field_size,
+            "chunk_size": self.chunk_size,
+        }
+        index_file = os.path.join(self.directory, "index.json")
+        with open(f"{index_file}.{_writer_suffix()}", "w") as file:
+            json.dump(index, file)
+        os.replace(f"{index_file}.{_writer_suffix()}", index_file)
+        return range(start, end)
+
+    def write(self, slot, field):
+        """
+        Writes a field at its slot, for example from a task.
+
+        Only the bytes of the row of the slot are written, at their offset in the chunk file.
+        Through a memory map, the tasks writing neighbouring slots of a chunk from different nodes
+        would share memory pages, and the flush of a page on NFS could overwrite the row of another task.
+
+        Parameters
+        ----------
+        slot : int
+            Index of the slot, reserved by :meth:`allocate`.
+        field : sequence of float
+            Values of the field.
+        """
+        field = np.asarray(field, dtype=float).ravel()
+        if len(field) != self.field_size:
+            raise ValueError(
+                f"The field has {len(field)} values, expected {self.field_size}."
+            )
+        chunk_file = self._chunk_file(slot // self.chunk_size)
+        with open(chunk_file, "rb") as file:
+            version = read_magic(file)
+            if version == (1, 0):
+                read_array_header_1_0(file)
+            else:
+                read_array_header_2_0(file)
+            offset = file.tell() + (slot % self.chunk_size) * field.nbytes
+        data = field.tobytes()
+        descriptor = os.open(chunk_file, os.O_WRONLY)
+        try:
+            written = 0
+            while written < len(data):
+                written += os.pwrite(descriptor, data[written:], offset + written)
+        finally:
+            os.close(descriptor)
+
+    def __getitem__(self, slot):
+        """Returns a read-only, memory-mapped view of the field of a slot."""
+        slot = int(slot)
+        if slot >= self._size:  # Reserved by another driver meanwhile
+            self._size = self._reserved_size()
+        if not 0 <= slot < self._size:
+            raise IndexError(f"Slot {slot} is out of the {self._size} slots of the store.")
+        fields = np.load(self._chunk_file(slot // self.chunk_size), mmap_mode="r")
+        return fields[slot % self.chunk_size]
+
+    def read(self, slots):
+        """
+        Reads the fields of several slots.
+
+        Parameters
+        ----------
+        slots : sequence of int
+            Indices of the slots, for example the first output of a :class:`~othpc.SubmitFunction`.
+
+        Returns
+        -------
+        fields : :py:class:`numpy.ndarray`
+            Array with one row per slot.
+        """
+        fields = np.empty((len(slots), self.field_size))
+        for k, slot in enumerate(slots):
+            fields[k] = self[slot]
+        return fields
+
+    def summarize(self, field):
+        """Returns the scalar summaries of a field."""
+        return [float(value) for value in self.summary(np.asarray(field, dtype=float))]
+
+
+def _writer_suffix():
+    """Suffix of the temporary files of the thread, unique on the shared filesystem."""
+    return f"{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}"
+
+
+def _default_summary(field):
+    return [field.mean(), field.min(), field.max()]
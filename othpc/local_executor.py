@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import time
+import signal
+import atexit
+import pickle
+import weakref
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import cloudpickle
+from submitit.core.utils import DelayedSubmission
+
+
+def available_cpus():
+    """
+    Returns the number of CPUs available to the current process.
+
+    Inside a SLURM allocation, this is the number of cores allocated to the process.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def _serve(connection):
+    """
+    Runs the tasks received by a worker process and sends back their outcomes, until its pipe is closed.
+
+    The function of the last task is kept unpickled, so that the next tasks of the same job or call
+    reuse it, along with the state it builds, such as the session of a :class:`~othpc.PersistentModel`.
+    A worker terminated by a cancellation first kills the workers its task started, if any.
+    """
+    signal.signal(signal.SIGTERM, _terminate)
+    pickled_function = None
+    function = None
+    while True:
+        try:
+            message = connection.recv_bytes()
+        except EOFError:
+            break
+        try:
+            task_function, pickled_args, environment = pickle.loads(message)
+            os.environ.update(environment)
+            if task_function != pickled_function:
+                function = cloudpickle.loads(task_function)
+                pickled_function = task_function
+            outcome = (True, function(*cloudpickle.loads(pickled_args)))
+        except Exception as error:
+            outcome = (False, error)
+        try:
+            reply = cloudpickle.dumps(outcome)
+        except Exception as error:  # E.g. an exception which cannot be pickled
+            reply = cloudpickle.dumps((False, RuntimeError(repr(error))))
+        connection.send_bytes(reply)
+
+
+def _terminate(signum, frame):
+    _kill_workers()
+    os._exit(1)
+
+
+class _Worker(object):
+    """Worker process running the tasks of a thread of the pool, one after the other."""
+
+    def __init__(self):
+        context = multiprocessing.get_context()
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_connection,))
+        self.process.start()
+        child_connection.close()
+        # A process forked by a task inherits a copy of the worker, which is not its own
+        self.owner_pid = os.getpid()
+        _workers.add(self)
+
+    def kill(self):
+        if os.getpid() != self.owner_pid:
+            return
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+        _workers.discard(self)
+
+    def __del__(self):
+        if os.getpid() == self.owner_pid and self.process.is_alive():
+            self.kill()
+
+
+# Workers of the threads of the pools, each thread keeping its own one
+_thread_workers = threading.local()
+_workers = weakref.WeakSet()
+
+
+@atexit.register
+def _kill_workers():
+    """Kills the idle workers, which would otherwise be waited for at exit."""
+    for worker in list(_workers):
+        worker.kill()
+
+
+class _LocalTask(object):
+    """One task of a local job, run by the worker process of a thread of the pool."""
+
+    def __init__(
+        self, job_id, task_number, pickled_function, pickled_args, environment, timeout
+    ):
+        self.job_id = job_id
+        self.task_number = task_number
+        self.pickled_function = pickled_function
+        self.pickled_args = pickled_args
+        self.environment = environment
+        self.timeout = timeout
+        self.process = None
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            if self.cancelled:
+                raise RuntimeError(
+                    f"Task {self.task_number} of job {self.job_id} was cancelled."
+                )
+            worker = getattr(_thread_workers, "worker", None)
+            if worker is None or not worker.process.is_alive():
+                worker = _thread_workers.worker = _Worker()
+            self.process = worker.process
+        outcome = None
+        try:
+            worker.connection.send_bytes(
+                pickle.dumps((self.pickled_function, self.pickled_args, self.environment))
+            )
+            # The end of the pipe may be held open by the processes the task forked,
+            # so that the death of the worker is checked along the way
+            deadline = None if self.timeout is None else time.time() + self.timeout
+            while not worker.connection.poll(1.0):
+                if not worker.process.is_alive() or (
+                    deadline is not None and time.time() > deadline
+                ):
+                    break
+            else:
+                outcome = cloudpickle.loads(worker.connection.recv_bytes())
+        except (EOFError, OSError):  # The process died without sending anything
+            pass
+        timed_out = outcome is None and worker.process.is_alive()
+        # Only a worker whose task was cancelled, timed out or crashed is replaced
+        if outcome is None or self.cancelled or not worker.process.is_alive():
+            worker.kill()
+            _thread_workers.worker = None
+        if self.cancelled:
+            raise RuntimeError(
+                f"Task {self.task_number} of job {self.job_id} was cancelled."
+            )
+        if timed_out:
+            raise TimeoutError(
+                f"Task {self.task_number} of job {self.job_id} did not finish in time (state: TIMEOUT)."
+            )
+        if outcome is None:
+            raise RuntimeError(
+                f"Task {self.task_number} of job {self.job_id} ended with exit code {self.process.exitcode}."
+            )
+        success, value = outcome
+        if not success:
+            raise value
+        return value
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if self.process is not None:
+                self.process.terminate()
+
+
+class LocalJob(object):
+    """
+    Handle on a job submitted to a :class:`LocalPoolExecutor`.
+
+    It mimics the part of the `submitit.Job` interface used by othpc.
+
+    Parameters
+    ----------
+    job_id : str
+        Identifier of the job.
+    tasks : list of `_LocalTask`
+        Tasks of the job.
+    futures : list of :py:class:`concurrent.futures.Future`
+        One future per task of the job.
+    submission : :py:class:`submitit.core.utils.DelayedSubmission`
+        Function and arguments submitted, None for a job submitted by another process.
+    """
+
+    def __init__(self, job_id, tasks, futures, submission):
+        self.job_id = job_id
+        self._tasks = tasks
+        self._futures = futures
+        self._submission = submission
+
+    @property
+    def num_tasks(self):
+        return len(self._futures)
+
+    @property
+    def state(self):
+        if any(task.cancelled for task in self._tasks):
+            return "CANCELLED"
+        if self.done():
+            return "FAILED" if self.exception() is not None else "COMPLETED"
+        if any(future.running() or future.done() for future in self._futures):
+            return "RUNNING"
+        return "PENDING"
+
+    def done(self):
+        return all(future.done() for future in self._futures)
+
+    def submission(self):
+        return self._submission
+
+    def results(self):
+        if self._submission is None:
+            raise self.exception()
+        return [future.result() for future in self._futures]
+
+    def result(self):
+        return self.results()[0]
+
+    def exception(self):
+        if self._submission is None:
+            return Exception(
+                f"Job {self.job_id} was run by another process, only its output files remain."
+            )
+        for future in self._futures:
+            if future.cancelled():
+                return Exception(f"Job {self.job_id} was cancelled.")
+            exception = future.exception()
+            if exception is not None:
+                return exception
+        return None
+
+    def cancel(self, check=True):
+        """Cancels the pending tasks of the job and kills the running ones."""
+        for task, future in zip(self._tasks, self._futures):
+            task.cancel()
+            future.cancel()
+
+
+class LocalPoolExecutor(object):
+    """
+    Executor running jobs on the local host, with a pool of worker processes.
+
+    It follows the interface of the submitit executors, so that
+    :class:`~othpc.SubmitFunction` uses the same code path on a workstation or
+    a login-node allocation as on the SLURM cluster.
+    Each thread of the pool runs the tasks in its own worker process, where each task sees the same
+    submitit job environment (job id and global rank) as on the cluster. The workers are kept from
+    a task to the next one, so that the function they run is unpickled once per job or call,
+    and only the worker of a task cancelled or timed out is killed and replaced.
+    The number of concurrent tasks is given by the core budget divided by `cpus_per_task`.
+
+    Parameters
+    ----------
+    folder : str
+        Log folder of the jobs, `%j` is replaced by the job id.
+    cpus : int
+        Number of cores that the pool may use.
+        By default, all the cores available to the current process.
+    """
+
+    _job_counter = itertools.count()
+
+    def __init__(self, folder="logs/%j", cpus=None):
+        self.folder = str(folder)
+        self.cpus = available_cpus() if cpus is None else cpus
+        self.parameters = {
+            "tasks_per_node": 1,
+            "nodes": 1,
+            "cpus_per_task": 1,
+            "timeout_min": None,
+        }
+        self._pool = None
+
+    def __getstate__(self):
+        # The pool of threads cannot be sent to the workers
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    @property
+    def max_workers(self):
+        return max(1, self.cpus // self.parameters["cpus_per_task"])
+
+    def update_parameters(self, **kwargs):
+        """
+        Updates the parameters of the jobs submitted afterwards.
+
+        Parameters specific to SLURM are ignored.
+        """
+        for key in self.parameters:
+            if kwargs.get(key) is not None:
+                self.parameters[key] = kwargs[key]
+
+    def submit(self, fn, *args):
+        """
+        Submits a job running `fn(*args)` in each one of its tasks.
+
+        Returns
+        -------
+        job : :class:`LocalJob`
+            Handle on the submitted job.
+        """
+        if self._pool is None or self._pool._max_workers != self.max_workers:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        job_id = f"local-{os.getpid()}-{next(self._job_counter)}"
+        os.makedirs(self.folder.replace("%j", job_id), exist_ok=True)
+        num_tasks = self.parameters["tasks_per_node"] * self.parameters["nodes"]
+        timeout = self.parameters["timeout_min"]
+        timeout = None if timeout is None else 60.0 * timeout
+        pickled_function = cloudpickle.dumps(fn)
+        pickled_args = cloudpickle.dumps(args)
+        tasks = []
+        futures = []
+        for task_number in range(num_tasks):
+            environment = {
+                "SUBMITIT_EXECUTOR": "local",
+                "SUBMITIT_LOCAL_JOB_ID": job_id,
+                "SUBMITIT_LOCAL_NTASKS": str(num_tasks),
+                "SUBMITIT_LOCAL_JOB_NUM_NODES": "1",
+                "SUBMITIT_LOCAL_NODEID": "0",
+                "SUBMITIT_LOCAL_GLOBALID": str(task_number),
+                "SUBMITIT_LOCAL_LOCALID": str(task_number),
+            }
+            task = _LocalTask(
+                job_id, task_number, pickled_function, pickled_args, environment, timeout
+            )
+            tasks.append(task)
+            futures.append(self._pool.submit(task))
+        return LocalJob(job_id, tasks, futures, DelayedSubmission(fn, *args))
+
+    def reattach(self, job_id):
+        """
+        Returns a handle on a job submitted by another process.
+
+        The processes of such a job do not survive their driver process,
+        so the job is considered as finished and only its output files can be collected.
+        """
+        return LocalJob(job_id, [], [], None)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import openturns as ot
+
+
+class PersistentModel(ot.OpenTURNSPythonFunction):
+    """
+    Base class of the models whose expensive preparation is shared by many evaluations.
+
+    Simulation codes often read a mesh, build a model and factorize a matrix before each run,
+    although only a few load or material values change from one point to another.
+    A subclass splits this work into :meth:`setup`, which builds a session once per process,
+    and :meth:`evaluate`, which evaluates one point with it.
+
+    The session is built on the first evaluation in each process, and kept for the lifetime of the process:
+    the points of a sample evaluated by the model all reuse it. Under :class:`~othpc.SubmitFunction` with the
+    local backend, the worker processes of the :class:`~othpc.LocalPoolExecutor` keep the model from one task
+    to the next within a call, so that each worker builds a single session for all the points it evaluates.
+    On SLURM, each task is a process of its own and builds its own session, which serves the `points_per_task`
+    points of the task, evaluated as a sample (see :class:`~othpc.SubmitFunction`).
+    The attributes created by :meth:`setup` are not pickled, so that a copy of the model sent
+    to a worker process builds its own session there.
+
+    Parameters
+    ----------
+    input_dimension : int
+        Dimension of the input points.
+    output_dimension : int
+        Dimension of the outputs.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> class Affine(othpc.PersistentModel):
+    ...     def __init__(self):
+    ...         super().__init__(1, 1)
+    ...
+    ...     def setup(self):
+    ...         self.slope = 2.0  # Stands for an expensive computation
+    ...
+    ...     def evaluate(self, x):
+    ...         return [self.slope * x[0]]
+    >>> model = Affine()
+    >>> model([[1.0], [2.0]])
+    [[2.0], [4.0]]
+    """
+
+    def __init__(self, input_dimension, output_dimension):
+        super().__init__(input_dimension, output_dimension)
+        self._session_pid = None
+        self._session_attributes = []
+
+    def setup(self):
+        """
+        Builds the session of the current process, by setting attributes of the model.
+
+        To be implemented by subclasses.
+        """
+        raise NotImplementedError("setup must be implemented by the subclass.")
+
+    def evaluate(self, x):
+        """
+        Evaluates one input point with the session of the current process.
+
+        To be implemented by subclasses.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+
+        Returns
+        -------
+        y : sequence of float
+            Output of the model.
+        """
+        raise NotImplementedError("evaluate must be implemented by the subclass.")
+
+    def _ensure_session(self):
+        """Builds the session if the current process has none yet."""
+        if self._session_pid == os.getpid():
+            return
+        attributes = set(self.__dict__)
+        self.setup()
+        self._session_attributes = [
+            name for name in self.__dict__ if name not in attributes
+        ]
+        self._session_pid = os.getpid()
+
+    def _exec(self, x):
+        self._ensure_session()
+        return self.evaluate(x)
+
+    def _exec_sample(self, X):
+        self._ensure_session()
+        return [self.evaluate(x) for x in X]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._session_attributes:
+            state.pop(name, None)
+        state["_session_pid"] = None
+        state["_session_attributes"] = []
+        return state
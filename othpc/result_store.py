@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import json
+import time
+import socket
+import hashlib
+import numpy as np
+
+
+class ResultStore(object):
+    """
+    Store of evaluations shared by the drivers of several studies on the same model.
+
+    Passed to :class:`~othpc.SubmitFunction` as `result_store`, it coordinates the drivers through
+    files of a shared directory, for example next to the results of the model. Before submitting a point,
+    a driver atomically creates its claim file, marking the point as in progress. A driver requesting
+    a point claimed by another one waits for its result instead of submitting it again,
+    and the results written in the store are reused by the next calls.
+
+    A failed evaluation is recorded in the store and its claim released. Once a point has failed
+    `max_failures` times, the drivers return NaN for it instead of evaluating it again,
+    since the failures of a model are usually deterministic. The claims of a driver which died are taken over: on the same host, as soon as its process
+    is gone, and otherwise once the claim has not been refreshed for `stale_after` seconds,
+    the driver refreshing its claims while it waits for its jobs.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the store, on the shared filesystem. An existing store is reopened.
+    stale_after : float
+        Delay in seconds after which a claim which was not refreshed is considered abandoned.
+    max_failures : int
+        Number of failed evaluations of a point after which it is not evaluated anymore.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import tempfile
+    >>> store = othpc.ResultStore(tempfile.mkdtemp())
+    >>> store.claim([1.0, 2.0])
+    True
+    >>> store.put([1.0, 2.0], [3.0])
+    >>> store.get([1.0, 2.0])
+    [3.0]
+    """
+
+    def __init__(self, directory, stale_after=600.0, max_failures=1):
+        self.directory = os.path.abspath(directory)
+        self.stale_after = stale_after
+        self.max_failures = max_failures
+        self._owner = {"host": socket.gethostname(), "pid": os.getpid()}
+        self._claims = set()
+        self._last_refresh = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __getstate__(self):
+        # The claims belong to the driver which made them
+        state = self.__dict__.copy()
+        state["_claims"] = set()
+        return state
+
+    def key(self, x):
+        """Returns the name of the files of a point in the store, a hash of its coordinates."""
+        return hashlib.sha256(np.asarray(x, dtype=float).tobytes()).hexdigest()
+
+    def _claim_file(self, key):
+        return os.path.join(self.directory, f"{key}.claim")
+
+    def _result_file(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _failures_file(self, key):
+        return os.path.join(self.directory, f"{key}.failures")
+
+    def get(self, x):
+        """
+        Returns the output of a point, or None if it is not in the store.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+        """
+        try:
+            return [float(value) for value in np.load(self._result_file(self.key(x)))]
+        except FileNotFoundError:
+            return None
+
+    def failures(self, x):
+        """
+        Returns the number of failed evaluations of a point recorded in the store.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+        """
+        try:
+            with open(self._failures_file(self.key(x))) as file:
+                return int(file.read())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def given_up(self, x):
+        """Tells whether a point failed `max_failures` times, so that it is not evaluated anymore."""
+        return self.failures(x) >= self.max_failures
+
+    def _read_owner(self, claim_file):
+        try:
+            with open(claim_file) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):  # Being written or removed
+            return None
+
+    def _stale_owner(self, claim_file):
+        """Returns the owner of a claim if the driver which made it is gone, None otherwise."""
+        owner = self._read_owner(claim_file)
+        try:
+            age = time.time() - os.path.getmtime(claim_file)
+        except FileNotFoundError:
+            return None
+        if owner is None:
+            return None
+        if owner["host"] == self._owner["host"]:
+            try:
+                os.kill(owner["pid"], 0)
+            except ProcessLookupError:
+                return owner
+            except PermissionError:  # Process of another user
+                pass
+        return owner if age > self.stale_after else None
+
+    def claim(self, x):
+        """
+        Marks a point as in progress for this driver.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+
+        Returns
+        -------
+        claimed : bool
+            True if the point was claimed by this driver, now or before,
+            False if another driver is evaluating it.
+        """
+        key = self.key(x)
+        if key in self._claims:
+            return True
+        claim_file = self._claim_file(key)
+        stale_owner = self._stale_owner(claim_file)
+        if stale_owner is not None:
+            # Only one of the drivers taking over the claim manages to move it away
+            stale_file = f"{claim_file}.{self._owner['host']}.{self._owner['pid']}"
+            try:
+                os.rename(claim_file, stale_file)
+            except FileNotFoundError:
+                pass
+            else:
+                if self._read_owner(stale_file) != stale_owner:
+                    # Another driver took the claim over between the check and the rename:
+                    # its fresh claim is put back, unless a newer one was made meanwhile
+                    try:
+                        os.link(stale_file, claim_file)
+                    except FileExistsError:
+                        pass
+                os.remove(stale_file)
+        try:
+            descriptor = os.open(claim_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(self._owner, file)
+        self._claims.add(key)
+        return True
+
+    def put(self, x, y):
+        """
+        Writes the output of a point and releases its claim.
+
+        The file is replaced atomically so that it is never read half-written.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+        y : sequence of float
+            Output of the point.
+        """
+        key = self.key(x)
+        result_file = self._result_file(key)
+        temporary_file = f"{result_file}.{self._owner['host']}.{self._owner['pid']}.tmp"
+        with open(temporary_file, "wb") as file:
+            np.save(file, np.asarray(y, dtype=float))
+        os.replace(temporary_file, result_file)
+        try:
+            os.remove(self._failures_file(key))
+        except FileNotFoundError:
+            pass
+        self.release(x)
+
+    def fail(self, x):
+        """
+        Records a failed evaluation of a point and releases its claim.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+        """
+        failures_file = self._failures_file(self.key(x))
+        temporary_file = f"{failures_file}.{self._owner['host']}.{self._owner['pid']}.tmp"
+        with open(temporary_file, "w") as file:
+            file.write(str(self.failures(x) + 1))
+        os.replace(temporary_file, failures_file)
+        self.release(x)
+
+    def release(self, x):
+        """
+        Releases the claim of this driver on a point, for example when its evaluation failed.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Input point.
+        """
+        key = self.key(x)
+        if key in self._claims:
+            self._claims.remove(key)
+            try:
+                os.remove(self._claim_file(key))
+            except FileNotFoundError:
+                pass
+
+    def refresh(self):
+        """
+        Touches the claims of this driver, so that the other drivers do not take them over.
+
+        It is called periodically while the driver waits, and does nothing
+        if the claims were refreshed less than a tenth of `stale_after` ago.
+        """
+        now = time.time()
+        if now - self._last_refresh < self.stale_after / 10.0:
+            return
+        self._last_refresh = now
+        for key in self._claims:
+            try:
+                os.utime(self._claim_file(key))
+            except FileNotFoundError:
+                pass
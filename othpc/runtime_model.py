@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import math
+import numpy as np
+import pandas as pd
+import openturns as ot
+
+
+class RuntimeModel(object):
+    """
+    Predicts the evaluation time and peak memory of a model from its inputs.
+
+    The prediction is the average over the nearest past evaluations, the inputs being scaled
+    by their standard deviation. The past evaluations are recorded by the tasks of
+    :class:`~othpc.SubmitFunction` and stored in a CSV history file, for example next to the summary file.
+    The model is updated incrementally each time a call of a function using it finishes.
+
+    Passed to :class:`~othpc.SubmitFunction` as `runtime_model`, it is used to pack the points
+    into jobs by decreasing predicted duration, and to request shorter walltimes.
+    Passed to :class:`~othpc.SchedulerSimulator`, it predicts the makespan of a given design.
+
+    Parameters
+    ----------
+    input_dimension : int
+        Dimension of the inputs of the model.
+    history_file : str
+        Path of the CSV file storing the past evaluations, with the inputs followed by
+        the `runtime` (in seconds) and `peak_memory` (in MB) columns.
+        It is loaded if it exists. By default, the history is kept in memory only.
+    neighbours : int
+        Number of nearest past evaluations averaged by a prediction.
+    margin : float
+        Safety factor applied to the predicted duration to choose a walltime.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> model = othpc.RuntimeModel(1, neighbours=2)
+    >>> model.update([[1.0], [2.0], [10.0]], [10.0, 20.0, 100.0], [50.0, 50.0, 80.0])
+    >>> print(model.predict([[1.4], [9.0]]))
+        [ runtime ]
+    0 : [ 15      ]
+    1 : [ 60      ]
+    """
+
+    def __init__(self, input_dimension, history_file=None, neighbours=5, margin=2.0):
+        self.input_dimension = input_dimension
+        self.history_file = history_file
+        self.neighbours = neighbours
+        self.margin = margin
+        self._inputs = np.zeros((0, input_dimension))
+        self._runtimes = np.zeros(0)
+        self._memories = np.zeros(0)
+        if history_file is not None and os.path.isfile(history_file):
+            df = pd.read_csv(history_file)
+            self._inputs = df.iloc[:, :input_dimension].to_numpy(dtype=float)
+            self._runtimes = df["runtime"].to_numpy(dtype=float)
+            self._memories = df["peak_memory"].to_numpy(dtype=float)
+
+    def getSize(self):
+        """Returns the number of past evaluations known by the model."""
+        return len(self._runtimes)
+
+    def update(self, X, runtimes, memories):
+        """
+        Adds past evaluations to the model, and appends them to the history file.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points evaluated.
+        runtimes : sequence of float
+            Evaluation times in seconds.
+        memories : sequence of float
+            Peak memory of the evaluations in MB.
+        """
+        X = np.array(X, dtype=float).reshape(-1, self.input_dimension)
+        if len(X) == 0:
+            return
+        runtimes = np.array(runtimes, dtype=float)
+        memories = np.array(memories, dtype=float)
+        self._inputs = np.vstack([self._inputs, X])
+        self._runtimes = np.concatenate([self._runtimes, runtimes])
+        self._memories = np.concatenate([self._memories, memories])
+        if self.history_file is not None:
+            df = pd.DataFrame(X, columns=[f"X{i}" for i in range(self.input_dimension)])
+            df["runtime"] = runtimes
+            df["peak_memory"] = memories
+            header = not os.path.isfile(self.history_file)
+            df.to_csv(self.history_file, mode="a", header=header, index=False)
+
+    def _neighbour_average(self, X, values):
+        X = np.array(X, dtype=float).reshape(-1, self.input_dimension)
+        if self.getSize() == 0:
+            return np.zeros(len(X))
+        scale = self._inputs.std(axis=0)
+        scale[scale == 0.0] = 1.0
+        reference = self._inputs / scale
+        k = min(self.neighbours, self.getSize())
+        predictions = np.empty(len(X))
+        # Blocks of points bound the size of the distance matrix
+        block = max(1, 10**6 // self.getSize())
+        for start in range(0, len(X), block):
+            points = X[start : start + block] / scale
+            distances = ((points[:, None, :] - reference[None, :, :]) ** 2).sum(axis=2)
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            predictions[start : start + block] = values[nearest].mean(axis=1)
+        return predictions
+
+    def predict(self, X):
+        """
+        Predicts the evaluation time of points, zero if no evaluation is known yet.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points to evaluate.
+
+        Returns
+        -------
+        runtimes : :py:class:`openturns.Sample`
+            Predicted evaluation times in seconds.
+        """
+        runtimes = ot.Sample.BuildFromPoint(self._neighbour_average(X, self._runtimes))
+        runtimes.setDescription(["runtime"])
+        return runtimes
+
+    def predict_memory(self, X):
+        """
+        Predicts the peak memory of the evaluation of points, zero if no evaluation is known yet.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points to evaluate.
+
+        Returns
+        -------
+        memories : :py:class:`openturns.Sample`
+            Predicted peak memory in MB.
+        """
+        memories = ot.Sample.BuildFromPoint(self._neighbour_average(X, self._memories))
+        memories.setDescription(["peak_memory"])
+        return memories
+
+    def __call__(self, X):
+        return self.predict(X)
+
+    def walltime(self, X):
+        """
+        Returns the walltime in minutes of a job evaluating points in parallel,
+        or None if no evaluation is known yet.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points evaluated by the job.
+        """
+        if self.getSize() == 0:
+            return None
+        longest = max(self._neighbour_average(X, self._runtimes))
+        return max(1, math.ceil(self.margin * longest / 60.0))
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cloudpickle
+import submitit
+from tqdm import tqdm
+import openturns as ot
+from .local_executor import LocalPoolExecutor, _LocalTask
+
+
+class SharedScheduler(object):
+    """
+    Scheduler shared by several :class:`~othpc.SubmitFunction` instances.
+
+    Studies often evaluate several models on the same design, for example a cheap model
+    and an expensive one. Instead of keeping one job stream per model, the functions registered
+    with a shared scheduler have their evaluations packed together into single-node allocations,
+    according to the CPUs (`cpus_per_task`) and memory (`mem / ntasks_per_node`) each evaluation requires.
+    The results are routed back to each function, in the order of its inputs.
+
+    Each allocation runs one SLURM task which starts the evaluations it holds at once,
+    each one in its own process, within the same `logs` layout as :class:`~othpc.SubmitFunction`.
+
+    Parameters
+    ----------
+    cpus_per_node : int
+        Number of CPUs of an allocation.
+    mem_per_node : int
+        Memory (in MB) of an allocation.
+    timeout_per_job : int
+        Timeout requested (in minutes) per SLURM job.
+    slurm_wckey : str
+        Project identification key, passed to SLURM as `--wckey`.
+    slurm_additional_parameters : dictionary
+        Extra parameters to pass to SLURM.
+    backend : str
+        Either "slurm" (default) or "local", as for :class:`~othpc.SubmitFunction`.
+
+    Notes
+    -----
+    The evaluations lost because of an infrastructure failure are returned as NaN, and not resubmitted.
+    The features of the job stream of a function are not available through the scheduler,
+    so registering a function which sets `max_retries`, `straggler_factor`, `burst_cpus`,
+    `max_node_hours`, `max_evaluations`, `max_jobs_in_flight`, `shared_inputs`, `cost_model`,
+    `runtime_model`, `points_per_task`, `telemetry`, `result_store` or `field_store` raises an error,
+    as well as a function using another backend than the scheduler. The calls through the scheduler
+    are not checkpointed, whatever the `checkpoint` key of the function.
+    Cancelling a registered function cancels the whole call of the scheduler in progress,
+    since its allocations are shared with the other requests.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import openturns as ot
+    >>> cheap = othpc.SubmitFunction(ot.SymbolicFunction(["x"], ["2 * x"]), backend="local")
+    >>> costly = othpc.SubmitFunction(
+    ...     ot.SymbolicFunction(["x"], ["x^2"]), cpus_per_task=2, backend="local"
+    ... )
+    >>> scheduler = othpc.SharedScheduler(cpus_per_node=4, backend="local")
+    >>> scheduler.register(cheap)
+    >>> scheduler.register(costly)
+    >>> X = [[1.0], [2.0], [3.0]]
+    >>> Y_cheap, Y_costly = scheduler.evaluate([(cheap, X), (costly, X)])
+    """
+
+    def __init__(
+        self,
+        cpus_per_node,
+        mem_per_node=16000,
+        timeout_per_job=5,
+        slurm_wckey="P12H8:SALOME",
+        slurm_additional_parameters={},
+        backend="slurm",
+    ):
+        self.cpus_per_node = cpus_per_node
+        self.mem_per_node = mem_per_node
+        self.backend = backend
+        self.timeout_per_job = timeout_per_job
+        self.functions = []
+        if backend == "slurm":
+            self.executor = submitit.AutoExecutor(folder="logs/%j")
+        elif backend == "local":
+            self.executor = LocalPoolExecutor(folder="logs/%j")
+        else:
+            raise ValueError(
+                f'Unknown backend "{backend}", expected "slurm" or "local".'
+            )
+        self.executor.update_parameters(
+            timeout_min=timeout_per_job,
+            tasks_per_node=1,
+            nodes=1,
+            cpus_per_task=cpus_per_node,
+            slurm_mem=mem_per_node,
+            slurm_wckey=slurm_wckey,
+            slurm_additional_parameters=slurm_additional_parameters,
+        )
+
+    def register(self, submit_function):
+        """
+        Registers a function, whose calls are then evaluated by the shared scheduler.
+
+        Parameters
+        ----------
+        submit_function : :class:`~othpc.SubmitFunction`
+            Function to register.
+        """
+        self._requirements(submit_function)
+        if submit_function not in self.functions:
+            self.functions.append(submit_function)
+        submit_function.scheduler = self
+
+    def _requirements(self, submit_function):
+        """Returns the CPUs and memory required by one evaluation of a function."""
+        if submit_function.ranks_per_evaluation > 1:
+            raise ValueError("Evaluations running on several ranks cannot be co-scheduled.")
+        if submit_function.field_store is not None:
+            raise ValueError("Evaluations writing to a field store cannot be co-scheduled.")
+        if submit_function.backend != self.backend:
+            raise ValueError(
+                f"The function uses the backend {submit_function.backend!r}, "
+                f"the scheduler submits its jobs with {self.backend!r}."
+            )
+        unsupported = {
+            "max_retries": submit_function.max_retries > 0,
+            "straggler_factor": submit_function.straggler_factor is not None,
+            "burst_cpus": submit_function.burst_cpus is not None,
+            "max_node_hours": submit_function.max_node_hours is not None,
+            "max_evaluations": submit_function.max_evaluations is not None,
+            "max_jobs_in_flight": submit_function.max_jobs_in_flight is not None,
+            "shared_inputs": submit_function.shared_inputs,
+            "cost_model": submit_function.cost_model is not None,
+            "runtime_model": submit_function.runtime_model is not None,
+            "points_per_task": submit_function.points_per_task > 1,
+            "telemetry": submit_function.telemetry is not None,
+            "result_store": submit_function.result_store is not None,
+        }
+        unsupported = [name for name, is_set in unsupported.items() if is_set]
+        if len(unsupported) > 0:
+            raise ValueError(
+                f"The shared scheduler does not support {', '.join(unsupported)}, "
+                "which must be left unset."
+            )
+        cpus = submit_function.cpus_per_task
+        mem = submit_function.mem / submit_function.ntasks_per_node
+        if cpus > self.cpus_per_node or mem > self.mem_per_node:
+            raise ValueError(
+                f"An evaluation requires {cpus} CPUs and {mem} MB, "
+                f"more than an allocation of {self.cpus_per_node} CPUs and {self.mem_per_node} MB."
+            )
+        return cpus, mem
+
+    def _pack(self, entries):
+        """
+        Packs evaluations into allocations by first-fit decreasing on their CPUs, then memory.
+
+        Parameters
+        ----------
+        entries : list of tuple
+            Evaluations as (request number, index, cpus, mem) tuples.
+
+        Returns
+        -------
+        jobs : list of list of tuple
+            Evaluations held by each allocation.
+        """
+        jobs = []
+        loads = []
+        for entry in sorted(entries, key=lambda entry: (-entry[2], -entry[3])):
+            for job, load in zip(jobs, loads):
+                if (
+                    load[0] + entry[2] <= self.cpus_per_node
+                    and load[1] + entry[3] <= self.mem_per_node
+                ):
+                    job.append(entry)
+                    load[0] += entry[2]
+                    load[1] += entry[3]
+                    break
+            else:
+                jobs.append([entry])
+                loads.append([entry[2], entry[3]])
+        return jobs
+
+    def _run_job(self, evaluations):
+        """
+        Runs the evaluations of an allocation at once, each one in its own worker process.
+
+        The evaluation number `k` of the allocation is run by the `task` method of its function,
+        as if it were the task of rank `k` of the job.
+        """
+        job_id = submitit.JobEnvironment().job_id
+        tasks = []
+        for k, (submit_function, x) in enumerate(evaluations):
+            environment = {
+                "SUBMITIT_EXECUTOR": "local",
+                "SUBMITIT_LOCAL_JOB_ID": job_id,
+                "SUBMITIT_LOCAL_NTASKS": str(len(evaluations)),
+                "SUBMITIT_LOCAL_JOB_NUM_NODES": "1",
+                "SUBMITIT_LOCAL_NODEID": "0",
+                "SUBMITIT_LOCAL_GLOBALID": str(k),
+                "SUBMITIT_LOCAL_LOCALID": str(k),
+            }
+            tasks.append(
+                _LocalTask(
+                    job_id,
+                    k,
+                    cloudpickle.dumps(submit_function.task),
+                    cloudpickle.dumps((x, k)),
+                    environment,
+                    None,
+                )
+            )
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = [pool.submit(task) for task in tasks]
+        outputs = []
+        for future, (submit_function, _) in zip(futures, evaluations):
+            if future.exception() is None:
+                outputs.append(future.result())
+            else:
+                outputs.append([float("nan")] * submit_function.getOutputDimension())
+        return outputs
+
+    def evaluate(self, requests):
+        """
+        Evaluates the samples of several registered functions in shared allocations.
+
+        Parameters
+        ----------
+        requests : list of tuple
+            Pairs of a registered :class:`~othpc.SubmitFunction` and of the sample it evaluates.
+
+        Returns
+        -------
+        outputs : list of :py:class:`openturns.Sample`
+            Outputs of each request, in the order of its inputs.
+        """
+        samples = []
+        entries = []
+        for number, (submit_function, X) in enumerate(requests):
+            if submit_function not in self.functions:
+                raise ValueError("The function is not registered with the scheduler.")
+            submit_function._cancel_event.clear()
+            X = ot.Sample(X)
+            X.setDescription(submit_function.getInputDescription())
+            samples.append(X)
+            cpus, mem = self._requirements(submit_function)
+            entries += [(number, index, cpus, mem) for index in range(len(X))]
+        packing = self._pack(entries)
+
+        # Submit one job per allocation
+        jobs = []
+        for allocation in packing:
+            evaluations = [
+                (requests[number][0], samples[number][index : index + 1])
+                for number, index, _, _ in allocation
+            ]
+            jobs.append(self.executor.submit(self._run_job, evaluations))
+
+        # Track progress
+        with tqdm(total=len(jobs)) as pbar:
+            completed = [False] * len(jobs)
+            while not all(completed):
+                if any(function._cancel_event.is_set() for function, _ in requests):
+                    # The allocations are shared by the requests, the whole call is cancelled
+                    for i, job in enumerate(jobs):
+                        if not completed[i]:
+                            job.cancel(check=False)
+                    break
+                for i, job in enumerate(jobs):
+                    if not completed[i] and job.done():
+                        completed[i] = True
+                        pbar.update(1)
+                time.sleep(1)  # Avoids spamming the scheduler
+
+        # Route the results back to each request
+        outputs = []
+        for (submit_function, _), X in zip(requests, samples):
+            Y = ot.Sample(len(X), submit_function.getOutputDimension())
+            Y.setDescription(submit_function.getOutputDescription())
+            outputs.append(Y)
+        for job, allocation in zip(jobs, packing):
+            try:
+                job_results = job.result()
+            except Exception:  # The allocation failed, recover the finished evaluations
+                job_results = []
+                for k, (number, _, _, _) in enumerate(allocation):
+                    submit_function = requests[number][0]
+                    filename = submit_function._task_file(job.job_id, k, "output")
+                    if os.path.isfile(filename):
+                        job_results.append(ot.Sample.ImportFromCSVFile(filename)[0])
+                    else:
+                        job_results.append(
+                            [float("nan")] * submit_function.getOutputDimension()
+                        )
+            for output, (number, index, _, _) in zip(job_results, allocation):
+                outputs[number][index] = output
+        return outputs
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import glob
+import heapq
+import openturns as ot
+from .runtime_model import RuntimeModel
+
+
+def load_task_runtimes(log_dir="logs"):
+    """
+    Loads the evaluation times recorded by the tasks of :class:`~othpc.SubmitFunction`.
+
+    Parameters
+    ----------
+    log_dir : str
+        Path to the log folder of the jobs.
+
+    Returns
+    -------
+    runtimes : :py:class:`openturns.Sample`
+        Evaluation times in seconds, one per task that succeeded.
+    """
+    runtimes = ot.Sample(0, 1)
+    for filename in glob.glob(os.path.join(log_dir, "*", "*_timing.csv")):
+        runtimes.add([ot.Sample.ImportFromCSVFile(filename)[0, 1]])
+    runtimes.setDescription(["runtime"])
+    return runtimes
+
+
+def load_queue_waits(log_dir="logs"):
+    """
+    Loads the queue waiting times of the SLURM jobs found in the log folder.
+
+    The waiting time of a job is the delay between its submission, recorded by submitit,
+    and the start of its first evaluation.
+
+    Parameters
+    ----------
+    log_dir : str
+        Path to the log folder of the jobs.
+
+    Returns
+    -------
+    waits : :py:class:`openturns.Sample`
+        Queue waiting times in seconds, one per job.
+    """
+    waits = ot.Sample(0, 1)
+    for job_dir in glob.glob(os.path.join(log_dir, "*")):
+        job_id = os.path.basename(job_dir)
+        submitted_file = os.path.join(job_dir, f"{job_id}_submitted.pkl")
+        timing_files = glob.glob(os.path.join(job_dir, "*_timing.csv"))
+        if not os.path.isfile(submitted_file) or len(timing_files) == 0:
+            continue
+        start = min(ot.Sample.ImportFromCSVFile(f)[0, 0] for f in timing_files)
+        waits.add([max(0.0, start - os.path.getmtime(submitted_file))])
+    waits.setDescription(["queue_wait"])
+    return waits
+
+
+class SchedulerSimulator(object):
+    """
+    Simulates the execution of a :class:`~othpc.SubmitFunction` on a modeled SLURM cluster.
+
+    The simulator replays the batching and submission logic of the function
+    against a first-in first-out scheduler, in order to predict the cost of a study
+    before launching it. If the function limits its jobs in flight (`max_jobs_in_flight`),
+    the next batch is submitted when a job ends, as by the sliding window of the function,
+    and the tasks evaluating several points (`points_per_task`) run them one after the other.
+
+    Parameters
+    ----------
+    submit_function : :class:`~othpc.SubmitFunction`
+        Function whose settings (tasks and nodes per job, timeout) are simulated.
+    node_number : int
+        Number of nodes of the cluster available to the study.
+    runtime_distribution : :py:class:`openturns.Distribution` or :class:`~othpc.RuntimeModel`
+        Distribution of the duration (in seconds) of one evaluation,
+        for example fitted on :func:`load_task_runtimes`.
+        A runtime model predicts instead the duration of each point of the simulated design.
+    queue_wait_distribution : :py:class:`openturns.Distribution`
+        Distribution of the queue waiting time (in seconds) of a job before it is eligible,
+        for example fitted on :func:`load_queue_waits`. No waiting time by default.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import openturns as ot
+    >>> f = ot.SymbolicFunction(["x"], ["x"])
+    >>> sf = othpc.SubmitFunction(f, ntasks_per_node=4, backend="local")
+    >>> simulator = othpc.SchedulerSimulator(sf, 2, ot.Uniform(50.0, 70.0), ot.Dirac(600.0))
+    >>> report = simulator.simulate(10)
+    >>> report["padding_slots"]
+    2.0
+    """
+
+    def __init__(
+        self,
+        submit_function,
+        node_number,
+        runtime_distribution,
+        queue_wait_distribution=None,
+    ):
+        self.submit_function = submit_function
+        self.node_number = node_number
+        self.runtime_distribution = runtime_distribution
+        if queue_wait_distribution is None:
+            queue_wait_distribution = ot.Dirac(0.0)
+        self.queue_wait_distribution = queue_wait_distribution
+
+    def _simulate_once(self, size):
+        sf = self.submit_function
+        if sf.nodes_per_job > self.node_number:
+            raise ValueError(
+                f"A job requires {sf.nodes_per_job} nodes but the cluster only has {self.node_number}."
+            )
+        X = None
+        if not isinstance(size, int):
+            X = ot.Sample(size)
+            size = X.getSize()
+        predicted = X is not None and isinstance(self.runtime_distribution, RuntimeModel)
+        if isinstance(self.runtime_distribution, RuntimeModel) and not predicted:
+            raise ValueError("A runtime model requires the design to simulate.")
+        costs = None if X is None else sf._estimate_costs(X)
+        batches = sf._make_batches(size, costs)
+        timeout = sf.timeout_per_job * 60.0
+        waits = self.queue_wait_distribution.getSample(len(batches)).asPoint()
+        cap = sf._job_cap()
+        if cap is None:
+            cap = len(batches)
+        # Jobs are submitted while fewer than `cap` are in flight, and become eligible after their queue wait
+        pending = []  # Eligibility time and number of the jobs submitted, waiting in the queue
+        ends = []  # End times of the jobs started and not yet replaced in the window
+        submitted = 0
+        submit_time = 0.0
+        node_free_times = [0.0] * self.node_number
+        makespan = 0.0
+        allocated_time = 0.0
+        busy_time = 0.0
+        timeouts = 0
+        while submitted < len(batches) or len(pending) > 0:
+            while submitted < len(batches) and len(pending) + len(ends) < cap:
+                heapq.heappush(pending, (submit_time + waits[submitted], submitted))
+                submitted += 1
+            if (
+                submitted < len(batches)
+                and len(ends) > 0
+                and (len(pending) == 0 or ends[0] < pending[0][0])
+            ):
+                # The window is full until the first job in flight ends
+                submit_time = max(submit_time, heapq.heappop(ends))
+                continue
+            wait, number = heapq.heappop(pending)
+            batch = batches[number]
+            if predicted:
+                runtimes = self.runtime_distribution.predict(X.select(batch)).asPoint()
+            else:
+                runtimes = self.runtime_distribution.getSample(len(batch)).asPoint()
+            # Each task evaluates its points one after the other
+            task_runtimes = [
+                runtimes[first : first + sf.points_per_task]
+                for first in range(0, len(runtimes), sf.points_per_task)
+            ]
+            nodes = [heapq.heappop(node_free_times) for _ in range(sf.nodes_per_job)]
+            start = max([wait] + nodes)
+            duration = min(max(sum(task) for task in task_runtimes), timeout)
+            end = start + duration
+            for _ in range(sf.nodes_per_job):
+                heapq.heappush(node_free_times, end)
+            heapq.heappush(ends, end)
+            makespan = max(makespan, end)
+            allocated_time += duration * sf.tasks_per_job
+            for task in task_runtimes:
+                elapsed = 0.0
+                for runtime in task:
+                    busy_time += max(0.0, min(runtime, duration - elapsed))
+                    elapsed += runtime
+                    timeouts += elapsed > timeout
+        return {
+            "makespan": makespan,
+            "node_hours": allocated_time / sf.tasks_per_job * sf.nodes_per_job / 3600.0,
+            "utilization": busy_time / allocated_time if allocated_time > 0 else 0.0,
+            "padding_slots": float(len(batches) * sf.points_per_job - size),
+            "timeouts": float(timeouts),
+        }
+
+    def simulate(self, size, repetitions=1):
+        """
+        Simulates the evaluation of a sample.
+
+        Parameters
+        ----------
+        size : int or 2-d sequence of float
+            Size of the input sample, or the input sample itself, required if the durations
+            are predicted by a runtime model.
+        repetitions : int
+            Number of simulated replications, the reported values are averaged over them.
+
+        Returns
+        -------
+        report : dict
+            Expected makespan (in seconds), node-hours consumed, utilization of the allocated
+            task slots, number of NaN-padding slots and number of timed-out evaluations.
+        """
+        reports = [self._simulate_once(size) for _ in range(repetitions)]
+        return {key: sum(r[key] for r in reports) / repetitions for key in reports[0]}
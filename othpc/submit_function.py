@@ -6,13 +6,43 @@ Copyright (C) EDF 2025
 @authors: Elias Fekhari, Joseph Muré, Michaël Baudin
 """
 import os
+import math
+import json
+import hashlib
+import socket
+import resource
+from collections import OrderedDict
 from pathlib import Path
 import time
+import threading
+import warnings
 import submitit
 from tqdm import tqdm
 import openturns as ot
-from numpy import concatenate
-from .utils import evaluation_error_log
+from numpy import array, full, load, save
+from .utils import evaluation_error_log, slurm_job_limit, slurm_queued_jobs
+from . import evaluation_group
+from .local_executor import LocalPoolExecutor
+from .dispatch import DispatchExecutor
+
+
+class _SharedSubsample(object):
+    """
+    Points of a sample stored in a NumPy binary file, read lazily by memory mapping.
+
+    It is what a job receives instead of its subsample when the inputs are shared,
+    so that only the path of the file and the indices of its points are pickled.
+    """
+
+    def __init__(self, filename, indices):
+        self.filename = filename
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, k):
+        return list(load(self.filename, mmap_mode="r")[self.indices[k]])
 
 
 class SubmitFunction(ot.OpenTURNSPythonFunction):
@@ -28,7 +58,8 @@ class SubmitFunction(ot.OpenTURNSPythonFunction):
     timeout_per_job : int
         Timeout requested (in minutes) per SLURM job.
     ntasks_per_node : int
-        Number of tasks (a task is a single evaluation of *callable*) that can be handled by a single node.
+        Number of tasks (a task is a single evaluation of *callable*, or a rank of it if `ranks_per_evaluation` > 1)
+        that can be handled by a single node.
         Passed to SLURM as `--ntasks-per-node`.
     nodes_per_job : int
         Number of HPC nodes requested per SLURM job submitted.
@@ -46,7 +77,109 @@ class SubmitFunction(ot.OpenTURNSPythonFunction):
     slurm_additional_parameters : dictionary
         Extra parameters to pass to SLURM (for example, `{"exclusive": True, "mem_per_cpu": 12}`).
         Empty by default.
+    backend : str or executor
+        Either "slurm" (default) to submit the jobs to SLURM, or "local" to run them
+        on the local host with a :class:`~othpc.LocalPoolExecutor`. An executor following the
+        submitit interface may also be given, such as a :class:`~othpc.DispatchExecutor`
+        spreading the jobs across several partitions.
+        The local backend uses the cores available to the current process as a budget,
+        and runs as many tasks at once as `cpus_per_task` allows.
+        Both backends share the same `logs` layout.
+    max_retries : int
+        Number of times the points lost because of an infrastructure failure (timeout, node failure...)
+        are resubmitted, packed into new jobs. No resubmission by default.
+        The points for which the callable raised an exception are never resubmitted,
+        since such failures of the model are deterministic.
+    timeout_escalation : float
+        Factor applied to the timeout of the resubmitted jobs when the previous jobs timed out.
+    checkpoint : str
+        Key identifying the model and the settings changing its outputs, for example its name and version.
+        If set, each call writes a manifest in `logs/manifests` listing the jobs submitted
+        and the indices of the points they evaluate, named after a hash of the key and of the input sample.
+        Disabled by default.
+        A driver restarted after a crash and called with the same sample reattaches to these jobs
+        and collects their results instead of submitting new ones.
+        The manifest records the host and process of its driver, and is only reattached
+        once this driver is gone: a call of a live driver on the same sample is left alone,
+        the new call writing its own manifest. With the local backend, whose jobs die with their driver,
+        only the jobs which finished are collected and the other points are submitted again.
+        The manifest is removed once the call returns.
+    straggler_factor : float
+        If set, an evaluation running for longer than `straggler_factor` times the median duration
+        of the evaluations already finished is duplicated in a new job, and the first result to arrive wins.
+        Disabled by default.
+    max_speculative_fraction : float
+        Maximal fraction of the points of a call which may be duplicated, which bounds the extra node-hours.
+    cache_size : int
+        Number of recent evaluations kept in memory, so that the finite differences computed by
+        :meth:`gradients` and :meth:`hessians` do not evaluate again a point such as the center.
+    cost_model : callable
+        Function mapping an input sample to the expected cost (for instance the duration)
+        of the evaluation of each point, such as a :py:class:`openturns.Function`.
+        If set, the points are packed into jobs by decreasing cost instead of in their order,
+        the outputs being returned in the order of the inputs.
+    runtime_model : :class:`~othpc.RuntimeModel`
+        Model of the evaluation time, updated with the times recorded by the tasks
+        each time a call finishes. It is used as the cost model if none is given,
+        and the jobs of the first submission of a call request the walltime it predicts,
+        within `timeout_per_job`. The points of a job killed before the walltime it predicted
+        are resubmitted once with `timeout_per_job`, even without `max_retries`.
+    ranks_per_evaluation : int
+        Number of tasks running each evaluation, for MPI models. A job of `nodes_per_job * ntasks_per_node` tasks
+        runs that many divided by `ranks_per_evaluation` evaluations at the same time, each one by a group of
+        consecutive tasks, see :class:`~othpc.EvaluationGroup`. One task per evaluation by default.
+    shared_inputs : bool
+        If True, each call writes its input sample once to a NumPy binary file in `logs/inputs`,
+        on the shared filesystem, and the jobs only receive the indices of their points, which they read
+        by memory mapping. This saves the serialization of the sample, job by job, for large designs.
+        The file is removed once the call returns. False by default.
+    field_store : :class:`~othpc.FieldStore`
+        Store receiving the outputs of the callable, for models returning fields with many values.
+        Each task writes the output vector of its evaluation at a slot of the store, and the function
+        returns the index of this slot (output `field_index`) followed by the scalar summaries of the field.
+        The slots of the points of a call are reserved when it starts, and the retries and duplicates
+        of a point write its field at the same slot. By default, the outputs of the callable are returned as they are.
+    max_jobs_in_flight : int or str
+        Maximal number of jobs of a call queued or running at the same time. The batches are then submitted
+        through a sliding window, the next one as soon as a job finishes, which keeps large studies within the
+        `MaxSubmitJobs` and `MaxJobs` limits of the cluster and spares the fair-share priority.
+        If "auto", the limit is discovered with :func:`~othpc.slurm_job_limit` at each call,
+        minus the jobs the user already has in the queue. All the jobs are submitted at once by default.
+    telemetry : :class:`~othpc.Telemetry`
+        Live metrics of the calls (points done, failed and pending, jobs queued and running, throughput,
+        time left, evaluation times), updated while the driver waits for the jobs. None by default.
+    burst_cpus : int
+        If set, number of cores of the driver host (or of its interactive allocation) evaluating the points
+        of the jobs still waiting in the queue, so that small and medium studies do not wait for the scheduler.
+        The points evaluated locally are skipped by their task, and the jobs whose points were all
+        evaluated locally are cancelled. A point whose local evaluation fails for another reason than
+        the model itself is evaluated by its task if the job has not started yet, and resubmitted
+        otherwise, once more even without `max_retries`. Disabled by default.
+    max_node_hours : float
+        Budget of node-hours of the function, over all its calls. The node-hours are counted by the driver,
+        from the time each job is seen running to the time it ends, times `nodes_per_job`.
+        Once the budget is spent, the outstanding jobs are cancelled and the call returns the outputs
+        finished so far, NaN for the other points. Unlimited by default.
+    max_evaluations : int
+        Budget of points submitted by the function, over all its calls, resubmissions included.
+        The points beyond the budget are not submitted and their outputs are NaN. Unlimited by default.
+    result_store : :class:`~othpc.ResultStore`
+        Store of evaluations shared with the drivers of other studies on the same model.
+        Each call reuses the outputs found in the store, claims the points it submits, and waits for the points
+        claimed by another driver instead of submitting them again. None by default.
+    points_per_task : int
+        Number of points evaluated by each task, with a single call of the callable on their sample,
+        so that a callable evaluating samples in parallel fills the `cpus_per_task` cores of its task,
+        and a :class:`~othpc.PersistentModel` keeps its session across them. A job then evaluates
+        `points_per_task` times as many points. Its files are still written point by point,
+        but a failure of the callable fails all the points of the task. One point per task by default,
+        not available with several ranks per evaluation or with stragglers duplicated.
 
+    Notes
+    -----
+    A call may be stopped early with :meth:`cancel`, for example from another thread once an algorithm
+    has converged, or by hitting Ctrl-C: the outstanding jobs are then cancelled, so that they do not
+    burn allocation hours, and the call returns the outputs finished so far, NaN for the other points.
 
     Examples
     --------
@@ -70,12 +203,53 @@ class SubmitFunction(ot.OpenTURNSPythonFunction):
         mem=16000,
         slurm_wckey="P12H8:SALOME",
         slurm_additional_parameters={},
+        backend="slurm",
+        max_retries=0,
+        timeout_escalation=2.0,
+        checkpoint=None,
+        straggler_factor=None,
+        max_speculative_fraction=0.1,
+        cache_size=1000,
+        cost_model=None,
+        runtime_model=None,
+        ranks_per_evaluation=1,
+        shared_inputs=False,
+        field_store=None,
+        max_jobs_in_flight=None,
+        telemetry=None,
+        burst_cpus=None,
+        max_node_hours=None,
+        max_evaluations=None,
+        result_store=None,
+        points_per_task=1,
     ):
-        super().__init__(callable.getInputDimension(), callable.getOutputDimension())
+        if field_store is None:
+            output_description = callable.getOutputDescription()
+        else:
+            if field_store.field_size != callable.getOutputDimension():
+                raise ValueError(
+                    f"The field store holds fields of size {field_store.field_size}, "
+                    f"but the output dimension of the callable is {callable.getOutputDimension()}."
+                )
+            output_description = ["field_index"] + field_store.summary_description
+        super().__init__(callable.getInputDimension(), len(output_description))
         self.setInputDescription(callable.getInputDescription())
-        self.setOutputDescription(callable.getOutputDescription())
-        # assume a task means an evaluation of callable
-        self.tasks_per_job = nodes_per_job * ntasks_per_node
+        self.setOutputDescription(output_description)
+        # A group of ranks_per_evaluation tasks runs an evaluation of callable
+        if (nodes_per_job * ntasks_per_node) % ranks_per_evaluation != 0:
+            raise ValueError(
+                f"The {nodes_per_job * ntasks_per_node} tasks of a job cannot be divided "
+                f"into groups of {ranks_per_evaluation} ranks."
+            )
+        if points_per_task > 1 and (ranks_per_evaluation > 1 or straggler_factor is not None):
+            raise ValueError(
+                "Several points per task are not available with several ranks per evaluation "
+                "or with stragglers duplicated."
+            )
+        self.ranks_per_evaluation = ranks_per_evaluation
+        self.tasks_per_job = nodes_per_job * ntasks_per_node // ranks_per_evaluation
+        self.points_per_task = points_per_task
+        self.points_per_job = self.tasks_per_job * points_per_task
         self.timeout_per_job = timeout_per_job
         self.ntasks_per_node = ntasks_per_node
         self.nodes_per_job = nodes_per_job
@@ -83,108 +257,1151 @@ class SubmitFunction(ot.OpenTURNSPythonFunction):
         self.mem = mem
         self.slurm_wckey = slurm_wckey
         self.callable = callable
+        self.backend = backend
+        self.max_retries = max_retries
+        self.timeout_escalation = timeout_escalation
+        if checkpoint is not None and not isinstance(checkpoint, str):
+            raise ValueError(
+                "checkpoint expects a key identifying the model, for example its name and version."
+            )
+        self.checkpoint = checkpoint
+        self.straggler_factor = straggler_factor
+        self.max_speculative_fraction = max_speculative_fraction
+        self.cache_size = cache_size
+        self.cost_model = cost_model
+        self.runtime_model = runtime_model
+        self.shared_inputs = shared_inputs
+        self.field_store = field_store
+        self.max_jobs_in_flight = max_jobs_in_flight
+        self.telemetry = telemetry
+        self.burst_cpus = burst_cpus
+        self.max_node_hours = max_node_hours
+        self.max_evaluations = max_evaluations
+        self.result_store = result_store
+        # Budgets spent by the previous calls
+        self.node_hours_used = 0.0
+        self.evaluations_used = 0
+        self._cancel_event = threading.Event()
+        self.slurm_additional_parameters = slurm_additional_parameters
+        # Jobs requesting a walltime shorter than the timeout per job
+        self._shortened_jobs = set()
+        # Set by SharedScheduler.register
+        self.scheduler = None
+        self._cache = OrderedDict()
 
         # Setup submitit executor
-        self.executor = submitit.AutoExecutor(folder="logs/%j")
+        if backend == "slurm":
+            self.executor = submitit.AutoExecutor(folder="logs/%j")
+        elif backend == "local":
+            self.executor = LocalPoolExecutor(folder="logs/%j")
+        elif hasattr(backend, "submit"):
+            self.executor = backend
+        else:
+            raise ValueError(
+                f'Unknown backend "{backend}", expected "slurm", "local" or an executor.'
+            )
         self.executor.update_parameters(
             timeout_min=timeout_per_job,
-            slurm_ntasks_per_node=ntasks_per_node,
+            tasks_per_node=ntasks_per_node,
             nodes=nodes_per_job,
             cpus_per_task=cpus_per_task,
             slurm_mem=mem,
             slurm_wckey=slurm_wckey,
             slurm_additional_parameters=slurm_additional_parameters,
         )
+        if burst_cpus is not None:
+            self._burst_executor = LocalPoolExecutor(folder="logs/%j", cpus=burst_cpus)
+            self._burst_executor.update_parameters(
+                timeout_min=timeout_per_job, cpus_per_task=cpus_per_task
+            )
+
+    def __getstate__(self):
+        # Only the driver publishes telemetry,
+        # evaluates points locally, coordinates with the other drivers, looks up its cache
+        # or predicts the costs of the points
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        state["_shortened_jobs"] = set()
+        state["cost_model"] = None
+        state["runtime_model"] = None
+        state["telemetry"] = None
+        state["result_store"] = None
+        state.pop("_cancel_event")
+        state.pop("_burst_executor", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cancel_event = threading.Event()
 
-    def task(self, X):
-        """Wrapper around callable to allow us to dispatch a single evaluation as a SLURM task"""
+    def task(self, X, first_task=0, field_slots=None):
+        """
+        Wrapper around callable to allow us to dispatch a single evaluation as a SLURM task.
+
+        The task of rank `r` evaluates `X[r - first_task]`. With several ranks per evaluation,
+        the tasks are grouped and the group of index `g` evaluates `X[g - first_task]`.
+        With several points per task, the task of rank `r` evaluates the points at the positions
+        `r * points_per_task` to `(r + 1) * points_per_task - 1`, the position `p` being the point
+        `X[p - first_task]`, and returns the list of their outputs. The files of the points
+        are named after their positions.
+        With a field store, the output of `X[k]` is written at the slot `field_slots[k]`.
+        """
 
         # Get job and task ids
-        jobid = os.environ.get("SLURM_JOBID", 0)
-        task_number = int(os.environ.get("SLURM_PROCID", 0))
+        try:
+            job_env = submitit.JobEnvironment()
+            jobid = job_env.job_id
+            global_rank = job_env.global_rank
+        except RuntimeError:  # Outside of a job
+            job_env = None
+            jobid = "0"
+            global_rank = 0
+        # The files of an evaluation are named after its group, written by its rank 0
+        task_number = global_rank // self.ranks_per_evaluation
+        group_rank = global_rank % self.ranks_per_evaluation
+        if self.ranks_per_evaluation > 1:
+            comm = evaluation_group._split_world(job_env, task_number, group_rank)
+            evaluation_group._set_evaluation_group(
+                evaluation_group.EvaluationGroup(
+                    task_number, group_rank, self.ranks_per_evaluation, comm
+                )
+            )
 
-        # If the task is unnecessary, make a quick return
-        if not task_number < len(X):
-            return [float("nan")] * self.getOutputDimension()
+        # The positions in the job of the points of the task
+        positions = range(
+            task_number * self.points_per_task, (task_number + 1) * self.points_per_task
+        )
+        outputs = [[float("nan")] * self.getOutputDimension() for _ in positions]
+        evaluated = [
+            k
+            for k, position in enumerate(positions)
+            # The positions beyond the points of the job are unnecessary
+            if 0 <= position - first_task < len(X)
+            # The point was evaluated on the driver host while the job was waiting
+            and not os.path.isfile(self._task_file(jobid, position, "skip"))
+        ]
+        if len(evaluated) == 0:  # Make a quick return
+            return outputs if self.points_per_task > 1 else outputs[0]
+        points = [X[positions[k] - first_task] for k in evaluated]
+        if group_rank > 0:
+            # The other ranks of the group take part in the evaluation only
+            return self.callable(points[0])
 
-        # Write input to CSV file for future reference
-        x = X[task_number]
-        input_as_sample = ot.Sample([x])
-        input_as_sample.setDescription(self.getInputDescription())
+        # Write inputs to CSV files for future reference
         folder = os.path.join("logs", jobid)
-        input_file = os.path.join(folder, f"{jobid}_{task_number}_input.csv")
-        input_as_sample.exportToCSVFile(input_file)
+        os.makedirs(folder, exist_ok=True)
+        for k, x in zip(evaluated, points):
+            input_as_sample = ot.Sample([x])
+            input_as_sample.setDescription(self.getInputDescription())
+            input_file = os.path.join(folder, f"{jobid}_{positions[k]}_input.csv")
+            input_as_sample.exportToCSVFile(input_file)
 
         # Actual call to the callable
-        output = self.callable(x)
+        start = time.time()
+        try:
+            if self.points_per_task > 1:
+                sample = ot.Sample(points)
+                sample.setDescription(self.getInputDescription())
+                evaluated_outputs = [list(y) for y in self.callable(sample)]
+            else:
+                evaluated_outputs = [self.callable(points[0])]
+        except Exception as error:
+            # Failure of the model itself, which is not worth a resubmission
+            for k in evaluated:
+                evaluation_error_log(error, folder, f"{jobid}_{positions[k]}_error.txt")
+            raise
+        if self.field_store is not None:
+            # Only the reference to the field and its summaries leave the task
+            for n, (k, output) in enumerate(zip(evaluated, evaluated_outputs)):
+                slot = field_slots[positions[k] - first_task]
+                self.field_store.write(slot, output)
+                evaluated_outputs[n] = [slot] + self.field_store.summarize(output)
+        runtime = (time.time() - start) / len(points)
 
-        # Save output to CSV file in case the job fails
-        # because some other task fails
-        output_as_sample = ot.Sample([output])
-        output_as_sample.setDescription(self.getOutputDescription())
-        output_file = os.path.join(folder, f"{jobid}_{task_number}_output.csv")
-        output_as_sample.exportToCSVFile(output_file)
+        # Record the evaluation time and peak memory (in MB),
+        # e.g. for the scheduler simulator and the runtime model
+        peak_memory = (
+            max(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            )
+            / 1024.0
+        )
+        for k, output in zip(evaluated, evaluated_outputs):
+            timing = ot.Sample([[start, runtime, peak_memory]])
+            timing.setDescription(["start", "runtime", "peak_memory"])
+            timing.exportToCSVFile(
+                os.path.join(folder, f"{jobid}_{positions[k]}_timing.csv")
+            )
+
+            # Save output to CSV file in case the job fails
+            # because some other task fails
+            output_as_sample = ot.Sample([output])
+            output_as_sample.setDescription(self.getOutputDescription())
+            output_file = os.path.join(folder, f"{jobid}_{positions[k]}_output.csv")
+            output_as_sample.exportToCSVFile(output_file)
+            outputs[k] = output
 
-        return output
+        return outputs if self.points_per_task > 1 else outputs[0]
 
     def _exec(self, X):
         return self._exec_point_on_exec_sample(X)
 
-    def _exec_sample(self, X):
-        # Divide input points across jobs (e.g. create batches)
-        X = ot.Sample(X)
-        X.setDescription(self.getInputDescription())
-        job_number = len(X) // self.tasks_per_job
-        if len(X) % self.tasks_per_job:
-            job_number += 1  # an additional job is needed
-        subsamples = [
-            X[self.tasks_per_job * i : self.tasks_per_job * (i + 1)]
-            for i in range(job_number)
+    def _make_batches(self, size, costs=None):
+        """
+        Divides the indices of a sample across jobs.
+
+        Without costs, consecutive points are evaluated by the same job.
+        With costs, the points are sorted by decreasing cost (longest processing time first)
+        before being packed, so that each job gathers points of similar costs and no task slot
+        waits for a much longer task of the same job. The most expensive jobs come first,
+        hence are submitted first.
+
+        Parameters
+        ----------
+        size : int
+            Size of the input sample.
+        costs : sequence of float
+            Expected cost of the evaluation of each point.
+
+        Returns
+        -------
+        batches : list of sequence of int
+            Indices of the input points evaluated by each job,
+            as ranges when the points are taken in their order.
+        """
+        if costs is None:
+            order = range(size)
+        else:
+            order = sorted(range(size), key=lambda i: -costs[i])
+        return [
+            order[start : start + self.points_per_job]
+            for start in range(0, size, self.points_per_job)
         ]
 
-        # Submit multiple jobs
-        jobs = [self.executor.submit(self.task, subsample) for subsample in subsamples]
+    def _estimate_costs(self, X):
+        """
+        Returns the expected cost of each point of X according to the cost model,
+        or else to the runtime model, if any.
+        """
+        cost_model = self.cost_model
+        if cost_model is None:
+            cost_model = self.runtime_model
+        if cost_model is None:
+            return None
+        return array(cost_model(X), dtype=float).ravel()
+
+    def _submit_jobs(
+        self, X, batches, predicted_walltime=False, shared_file=None, field_slots=None
+    ):
+        """
+        Submits one job per batch of indices of X.
+
+        If `predicted_walltime` is True and the runtime model knows past evaluations,
+        each job requests the walltime predicted for its points, within the timeout per job.
+        If `shared_file` is set, the jobs read their points from this file of the sample.
+        If `field_slots` is set, the fields of the points of X are written at these slots of the field store.
+        """
+        if not predicted_walltime or self.runtime_model is None:
+            return [
+                self.executor.submit(self.task, *self._task_arguments(X, batch, shared_file, field_slots))
+                for batch in batches
+            ]
+        jobs = []
+        for batch in batches:
+            walltime = self.runtime_model.walltime(X.select(batch))
+            if walltime is not None:
+                walltime = min(walltime, self.timeout_per_job)
+            self.executor.update_parameters(timeout_min=walltime or self.timeout_per_job)
+            jobs.append(
+                self.executor.submit(self.task, *self._task_arguments(X, batch, shared_file, field_slots))
+            )
+            if walltime is not None and walltime < self.timeout_per_job:
+                self._shortened_jobs.add(jobs[-1].job_id)
+        self.executor.update_parameters(timeout_min=self.timeout_per_job)
+        return jobs
+
+    def _task_arguments(self, X, batch, shared_file=None, field_slots=None):
+        """
+        Returns the arguments of the task of the job evaluating a batch of points of X,
+        with the slots of their fields if there is a field store, reserved now unless `field_slots` gives
+        the slots of the points of X.
+        """
+        if shared_file is not None:
+            subsample = _SharedSubsample(shared_file, batch)
+        else:
+            subsample = X.select(batch)
+        if self.field_store is None:
+            return (subsample,)
+        if field_slots is None:
+            return (subsample, 0, self.field_store.allocate(len(batch)))
+        return (subsample, 0, [field_slots[index] for index in batch])
 
-        # Track progress
-        with tqdm(total=job_number) as pbar:
+    def _write_shared_inputs(self, X, manifest_file):
+        """
+        Writes the sample of a call to a NumPy binary file named as its manifest,
+        unless a previous driver already wrote it, and returns its path.
+        """
+        folder = os.path.join("logs", "inputs")
+        os.makedirs(folder, exist_ok=True)
+        filename = os.path.join(
+            folder, os.path.basename(manifest_file).replace(".json", ".npy")
+        )
+        if not os.path.isfile(filename):
+            with open(filename + ".tmp", "wb") as file:
+                save(file, array(X, dtype=float))
+            os.replace(filename + ".tmp", filename)
+        return os.path.abspath(filename)
+
+    def _job_cap(self):
+        """Returns the maximal number of jobs of a call in flight, None if unlimited."""
+        if self.max_jobs_in_flight != "auto":
+            return self.max_jobs_in_flight
+        limit = slurm_job_limit(qos=self.slurm_additional_parameters.get("qos"))
+        if limit is None:
+            return None
+        return max(1, limit - slurm_queued_jobs())
+
+    def _wait_jobs(
+        self,
+        X,
+        jobs,
+        batches,
+        cap=None,
+        predicted_walltime=False,
+        on_submit=None,
+        shared_file=None,
+        burst_points=None,
+        field_slots=None,
+    ):
+        """
+        Waits for the jobs to finish while tracking progress.
+
+        The batches whose job is None are submitted while fewer than `cap` jobs are in flight,
+        and `on_submit` is called once after the submissions of each poll, for example to update the manifest.
+        If `shared_file` is set, the jobs read their points from this file of the sample,
+        and if `field_slots` is set, they write the fields of the points of X at these slots of the field store.
+
+        If `straggler_factor` is set, the points whose evaluation lasts much longer than the
+        evaluations already finished are duplicated in new jobs. The first result to arrive wins:
+        an original job whose unfinished points have all been evaluated by duplicates is cancelled,
+        and a duplicate is cancelled as soon as the original tasks of its points have finished.
+
+        If `burst_cpus` is set, the points of the jobs still waiting in the queue are evaluated on the local host
+        meanwhile, starting with the last jobs submitted. A task finding that its point was taken by the local host
+        returns at once, and a job whose points were all evaluated locally is cancelled. The points are added to
+        `burst_points`, and the points already in it are evaluated on the cluster only.
+
+        If the call is cancelled, by :meth:`cancel`, a KeyboardInterrupt or once the budget of node-hours
+        is spent, the outstanding jobs are cancelled and the batches not submitted yet are left out.
+
+        Returns
+        -------
+        speculative_results : dict
+            Outputs of the points evaluated by a duplicate, indexed by their position in X.
+        """
+        if burst_points is None:
+            burst_points = set()
+        speculative_jobs = []
+        burst_jobs = []
+        # Task of the original job of each point evaluated locally
+        burst_origin = {}
+        speculative_results = {}
+        # Jobs seen running and the time they were, until they are counted in the node-hours spent
+        running_since = {}
+        collected = set()
+        # Task of the original job of each duplicated point
+        duplicated = {}
+        runtimes = []
+        budget = self.max_speculative_fraction * sum(len(batch) for batch in batches)
+        with tqdm(total=len(jobs)) as pbar:
             completed = [False] * len(jobs)
             while not all(completed):
-                for i, job in enumerate(jobs):
-                    if not completed[i] and job.done():
-                        completed[i] = True
-                        pbar.update(1)
-                time.sleep(1)  # Avoids spamming the scheduler
-
-        # Return outputs
-        partial_results_list = []
-        for job in jobs:
-            try:
-                partial_results_list.append(job.results())
-            except:  # Case where at least one task in the job failed
-                # Goal: reconstitute the results of the tasks which succeeded
-                input_size = job.submission().args[0].getSize()
-                job_results = ot.Sample(input_size, self.getOutputDimension())
-                for task_number in range(input_size):  # for every task
-                    # guess the name of the CSV file containing the output
-                    # this file exists only if the task succeeded
-                    filename = os.path.join(
-                        "logs", job.job_id, f"{job.job_id}_{task_number}_output.csv"
+                try:
+                    # Stop the call if it was cancelled or its budget is spent
+                    outstanding = [
+                        job
+                        for i, job in enumerate(jobs)
+                        if not completed[i] and job is not None
+                    ]
+                    node_hours = self._count_node_hours(
+                        running_since,
+                        outstanding + [dup_job for dup_job, _ in speculative_jobs],
                     )
-                    file = Path(filename)
-                    if file.is_file():  # if the task succeeded
-                        output_point = ot.Sample.ImportFromCSVFile(filename)[0]
-                    else:  # if the task failed
-                        output_point = [float("nan")] * self.getOutputDimension()
+                    if (
+                        self.max_node_hours is not None
+                        and node_hours >= self.max_node_hours
+                    ):
+                        warnings.warn(
+                            f"The budget of {self.max_node_hours} node-hours is spent, "
+                            "the outstanding jobs are cancelled."
+                        )
+                        self._cancel_event.set()
+                    if self._cancel_event.is_set():
+                        for job in outstanding:
+                            if not job.done():
+                                job.cancel(check=False)
+                        for extra_job, _ in speculative_jobs + burst_jobs:
+                            if not extra_job.done():
+                                extra_job.cancel(check=False)
+                        break
+
+                    # Slide the window of submitted jobs
+                    in_flight = sum(
+                        not completed[i] and job is not None for i, job in enumerate(jobs)
+                    ) + sum(not dup_job.done() for dup_job, _ in speculative_jobs)
+                    submitted = False
+                    for i, job in enumerate(jobs):
+                        if job is None and (cap is None or in_flight < cap):
+                            jobs[i] = self._submit_jobs(
+                                X, [batches[i]], predicted_walltime, shared_file, field_slots
+                            )[0]
+                            in_flight += 1
+                            submitted = True
+                    if submitted and on_submit is not None:
+                        on_submit()
+                    if self.telemetry is not None:
+                        self.telemetry.observe(self, jobs, batches, speculative_results)
+                    if hasattr(self.executor, "refresh"):
+                        self.executor.refresh()
+                    if self.result_store is not None:
+                        self.result_store.refresh()
+                    for i, job in enumerate(jobs):
+                        if job is None:
+                            continue
+                        if not completed[i] and job.done():
+                            completed[i] = True
+                            pbar.update(1)
+                            if self.straggler_factor is not None:
+                                runtimes += [
+                                    timing[1]
+                                    for timing in self._read_timings(job, batches[i])
+                                ]
+                    if self.straggler_factor is None and self.burst_cpus is None:
+                        time.sleep(1)  # Avoids spamming the scheduler
+                        continue
+
+                    # Collect the duplicates and the local evaluations which finished
+                    for dup_job, dup_batch in speculative_jobs + burst_jobs:
+                        if dup_job.done() and dup_job.job_id not in collected:
+                            collected.add(dup_job.job_id)
+                            dup_results, dup_failed = self._gather_job(dup_job, dup_batch)
+                            for k, index in enumerate(dup_batch):
+                                if index not in dup_failed:
+                                    speculative_results[index] = dup_results[k]
+                                elif index in burst_origin:
+                                    # The local evaluation was lost: the task of the original job
+                                    # evaluates the point if it has not started yet
+                                    job_id, task_number = burst_origin[index]
+                                    original = next(
+                                        job for job in jobs if job is not None and job.job_id == job_id
+                                    )
+                                    if original.state == "PENDING":
+                                        os.remove(self._task_file(job_id, task_number, "skip"))
+
+                    # Cancel the duplicates whose original tasks all finished first
+                    for dup_job, dup_batch in speculative_jobs:
+                        if dup_job.job_id not in collected and all(
+                            os.path.isfile(self._task_file(*duplicated[index], "output"))
+                            or os.path.isfile(self._task_file(*duplicated[index], "error"))
+                            for index in dup_batch
+                        ):
+                            dup_job.cancel(check=False)
+                            collected.add(dup_job.job_id)
+
+                    # Cancel the original jobs whose unfinished points were all evaluated by duplicates
+                    for i, job in enumerate(jobs):
+                        if completed[i] or job is None:
+                            continue
+                        unfinished = self._unfinished_tasks(job, batches[i])
+                        if len(unfinished) > 0 and all(
+                            batches[i][task_number] in speculative_results
+                            for task_number in unfinished
+                        ):
+                            job.cancel(check=False)
+                            completed[i] = True
+                            pbar.update(1)
+
+                    # Duplicate the stragglers, within the budget of extra evaluations
+                    stragglers = {}
+                    if self.straggler_factor is not None and len(runtimes) >= 3:
+                        threshold = self.straggler_factor * sorted(runtimes)[len(runtimes) // 2]
+                        for i, job in enumerate(jobs):
+                            if completed[i] or job is None or job.state != "RUNNING":
+                                continue
+                            for task_number in self._unfinished_tasks(job, batches[i]):
+                                index = batches[i][task_number]
+                                input_file = self._task_file(job.job_id, task_number, "input")
+                                if (
+                                    index not in duplicated
+                                    and len(duplicated) + len(stragglers) < budget
+                                    and (cap is None or in_flight + len(stragglers) < cap)
+                                    and os.path.isfile(input_file)
+                                    and time.time() - os.path.getmtime(input_file) > threshold
+                                ):
+                                    stragglers[index] = (job.job_id, task_number)
+                    if len(stragglers) > 0:
+                        straggler_indices = list(stragglers)
+                        dup_batches = [
+                            [straggler_indices[k] for k in batch]
+                            for batch in self._make_batches(len(stragglers))
+                        ]
+                        dup_jobs = self._submit_jobs(
+                            X, dup_batches, shared_file=shared_file, field_slots=field_slots
+                        )
+                        speculative_jobs += list(zip(dup_jobs, dup_batches))
+                        duplicated.update(stragglers)
+
+                    # Evaluate locally the points of the jobs waiting in the queue, the last ones first
+                    if self.burst_cpus is not None:
+                        free = self._burst_executor.max_workers - sum(
+                            not burst_job.done() for burst_job, _ in burst_jobs
+                        )
+                        for i in reversed(range(len(jobs))):
+                            if free <= 0:
+                                break
+                            if completed[i] or jobs[i] is None or jobs[i].state != "PENDING":
+                                continue
+                            for task_number, index in enumerate(batches[i]):
+                                if free <= 0:
+                                    break
+                                if index in burst_points or index in speculative_results:
+                                    continue
+                                skip_file = self._task_file(jobs[i].job_id, task_number, "skip")
+                                os.makedirs(os.path.dirname(skip_file), exist_ok=True)
+                                Path(skip_file).touch()
+                                burst_origin[index] = (jobs[i].job_id, task_number)
+                                burst_points.add(index)
+                                burst_job = self._burst_executor.submit(
+                                    self.task,
+                                    *self._task_arguments(X, [index], shared_file, field_slots),
+                                )
+                                burst_jobs.append((burst_job, [index]))
+                                free -= 1
+                    time.sleep(1)  # Avoids spamming the scheduler
+                except KeyboardInterrupt:
+                    warnings.warn("Interrupted, the outstanding jobs are cancelled.")
+                    self._cancel_event.set()
+
+        # The original jobs won the remaining races
+        for dup_job, dup_batch in speculative_jobs:
+            if not dup_job.done():
+                dup_job.cancel(check=False)
+        # Except for the points their tasks skipped, whose local evaluation is awaited
+        for burst_job, burst_batch in burst_jobs:
+            if burst_job.job_id in collected:
+                continue
+            job_id, task_number = burst_origin[burst_batch[0]]
+            if not burst_job.done() and (
+                self._cancel_event.is_set()
+                or os.path.isfile(self._task_file(job_id, task_number, "output"))
+            ):
+                burst_job.cancel(check=False)
+                continue
+            while not burst_job.done():
+                time.sleep(1)
+            burst_results, burst_failed = self._gather_job(burst_job, burst_batch)
+            if len(burst_failed) == 0:
+                speculative_results[burst_batch[0]] = burst_results[0]
+        # The jobs still running were cancelled
+        self._count_node_hours(running_since, [], ended=True)
+        return speculative_results
+
+    def _count_node_hours(self, running_since, jobs, ended=False):
+        """
+        Adds the node-hours of the jobs which ended to the node-hours spent by the function,
+        and returns the node-hours spent including the jobs still running.
+
+        Parameters
+        ----------
+        running_since : dict
+            Each job first seen running and the time it was, indexed by job id, updated in place.
+        jobs : list of submitit.Job
+            Jobs in flight, which are tracked from the time they are seen running.
+        ended : bool
+            If True, the jobs still tracked are counted as ended, e.g. once they are cancelled.
+        """
+        now = time.time()
+        if self.max_node_hours is not None:
+            for job in jobs:
+                if job.job_id not in running_since and job.state == "RUNNING":
+                    running_since[job.job_id] = (job, now)
+        # Every tracked job is checked, including those cancelled or finished since they were last in flight
+        for job_id, (job, since) in list(running_since.items()):
+            if ended or job.done():
+                del running_since[job_id]
+                self.node_hours_used += (now - since) * self.nodes_per_job / 3600.0
+        running = sum(now - since for _, since in running_since.values())
+        return self.node_hours_used + running * self.nodes_per_job / 3600.0
+
+    def _task_file(self, job_id, task_number, kind):
+        """Path of a file written by or for a task: input, output, timing, error or skip."""
+        extension = "txt" if kind in ["error", "skip"] else "csv"
+        return os.path.join("logs", job_id, f"{job_id}_{task_number}_{kind}.{extension}")
+
+    def _unfinished_tasks(self, job, batch):
+        """Returns the task numbers of a job which have neither written an output nor failed."""
+        return [
+            task_number
+            for task_number in range(len(batch))
+            if not os.path.isfile(self._task_file(job.job_id, task_number, "output"))
+            and not os.path.isfile(self._task_file(job.job_id, task_number, "error"))
+        ]
+
+    def _read_timings(self, job, batch):
+        """
+        Returns the evaluation time and peak memory recorded by the tasks of a finished job,
+        as a list of (index, runtime, peak_memory) tuples.
+        """
+        timings = []
+        for task_number, index in enumerate(batch):
+            filename = self._task_file(job.job_id, task_number, "timing")
+            if os.path.isfile(filename):
+                timing = ot.Sample.ImportFromCSVFile(filename)[0]
+                timings.append((index, timing[1], timing[2]))
+        return timings
+
+    def _manifest_file(self, X):
+        """
+        Path of the manifest of the call evaluating X, named after a hash of the model and of the sample.
+        The model is identified by the key given as `checkpoint`, since two models of the same type
+        and output description cannot be told apart otherwise.
+        """
+        digest = hashlib.sha256()
+        digest.update(str(self.checkpoint).encode())
+        digest.update(str(list(self.getOutputDescription())).encode())
+        if self.field_store is not None:  # The outputs are slots of the store
+            digest.update(self.field_store.directory.encode())
+        digest.update(array(X, dtype=float).tobytes())
+        return os.path.join("logs", "manifests", f"{digest.hexdigest()}.json")
+
+    def _write_manifest(self, manifest_file, rounds):
+        """
+        Writes the manifest of a call, i.e. the jobs submitted in each round and
+        the indices of the points they evaluate. The batches not submitted yet are left out.
+        The file is replaced atomically so that it is never left half-written.
+        """
+        os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+        manifest = {
+            "sample": os.path.basename(manifest_file)[:-5],
+            "owner": {"host": socket.gethostname(), "pid": os.getpid()},
+            "rounds": [
+                [
+                    {"job_id": job.job_id, "indices": list(batch)}
+                    for job, batch in jobs
+                    if job is not None
+                ]
+                for jobs in rounds
+            ],
+        }
+        with open(manifest_file + ".tmp", "w") as file:
+            json.dump(manifest, file)
+        os.replace(manifest_file + ".tmp", manifest_file)
+
+    def _reattach_job(self, job_id):
+        """Returns a handle on a job submitted by a previous driver process."""
+        if isinstance(self.executor, LocalPoolExecutor):
+            return self.executor.reattach(job_id)
+        if isinstance(self.executor, DispatchExecutor):
+            return self.executor.reattach(
+                job_id, self.tasks_per_job * self.ranks_per_evaluation
+            )
+        return self.executor._executor.job_class(
+            folder="logs/%j",
+            job_id=job_id,
+            tasks=range(self.tasks_per_job * self.ranks_per_evaluation),
+        )
+
+    def _manifest_owner_alive(self, manifest_file):
+        """
+        Tells whether the driver which wrote a manifest is still running.
+        A driver on another host cannot be checked and is considered gone.
+        """
+        try:
+            with open(manifest_file) as file:
+                owner = json.load(file).get("owner")
+        except (FileNotFoundError, ValueError):
+            return False
+        if owner is None or owner["host"] != socket.gethostname():
+            return False
+        try:
+            os.kill(owner["pid"], 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:  # Process of another user
+            pass
+        return True
+
+    def _read_manifest(self, manifest_file):
+        """Reattaches to the jobs listed in the manifest of an interrupted call."""
+        with open(manifest_file) as file:
+            manifest = json.load(file)
+        rounds = [
+            [(self._reattach_job(job["job_id"]), job["indices"]) for job in jobs]
+            for jobs in manifest["rounds"]
+        ]
+        if isinstance(self.executor, LocalPoolExecutor):
+            # The unfinished local jobs died with their driver, their points are submitted again
+            rounds = [
+                [(job, batch) for job, batch in jobs if not self._unfinished_tasks(job, batch)]
+                for jobs in rounds
+            ]
+        return [jobs for jobs in rounds if len(jobs) > 0]
+
+    def _gather_job(self, job, batch, speculative_results=None):
+        """
+        Collects the outputs of a finished job.
+
+        Parameters
+        ----------
+        job : submitit.Job
+            Finished job.
+        batch : list of int
+            Indices of the input points evaluated by the job.
+        speculative_results : dict
+            Outputs of the points evaluated by duplicates of the tasks, indexed by their position.
+
+        Returns
+        -------
+        job_results : list or :py:class:`openturns.Sample`
+            Outputs of the tasks of the job, NaN for the failed tasks.
+        failed : list of int
+            Indices of the input points lost because of an infrastructure failure
+            (timeout, node failure...), as opposed to a failure of the model itself.
+        """
+        if speculative_results is None:
+            speculative_results = {}
+        failed = []
+        try:
+            if not job.done():  # Cancelled in favour of speculative duplicates
+                raise RuntimeError(f"Job {job.job_id} was cancelled.")
+            # Only the rank 0 of each group returns the output of an evaluation
+            job_results = job.results()[:: self.ranks_per_evaluation]
+            if self.points_per_task > 1:
+                job_results = [output for outputs in job_results for output in outputs]
+            # The tasks whose point was evaluated locally returned at once
+            for task_number, index in enumerate(batch):
+                if os.path.isfile(self._task_file(job.job_id, task_number, "output")):
+                    continue
+                if index in speculative_results:
+                    job_results[task_number] = speculative_results[index]
+                elif os.path.isfile(
+                    self._task_file(job.job_id, task_number, "skip")
+                ) and not self._cancel_event.is_set():
+                    # The task skipped the point and its local evaluation was lost
+                    failed.append(index)
+        except:  # Case where at least one task in the job failed
+            # Goal: reconstitute the results of the tasks which succeeded
+            job_results = ot.Sample(len(batch), self.getOutputDimension())
+            for task_number in range(len(batch)):  # for every task
+                # guess the name of the CSV file containing the output
+                # this file exists only if the task succeeded
+                filename = self._task_file(job.job_id, task_number, "output")
+                file = Path(filename)
+                if file.is_file():  # if the task succeeded
+                    output_point = ot.Sample.ImportFromCSVFile(filename)[0]
+                elif batch[task_number] in speculative_results:
+                    output_point = speculative_results[batch[task_number]]
+                else:  # if the task failed
+                    output_point = [float("nan")] * self.getOutputDimension()
+                    # The error file only exists if the model itself failed,
+                    # and the points left out by a cancellation are not lost either
+                    error_file = Path(self._task_file(job.job_id, task_number, "error"))
+                    if not error_file.is_file() and not self._cancel_event.is_set():
                         evaluation_error_log(
                             Exception(job.exception()),
                             "logs",
                             f"LikelyTimeout_{job.job_id}_{task_number}.txt",
                         )
-                    job_results[task_number] = output_point
-                partial_results_list.append(job_results)
-        results = ot.Sample(concatenate(partial_results_list, axis=0))
+                        failed.append(batch[task_number])
+                job_results[task_number] = output_point
+        return job_results, failed
+
+    def _exec_sample(self, X):
+        if self.scheduler is not None:
+            return self.scheduler.evaluate([(self, X)])[0]
+        self._cancel_event.clear()
+        if self.result_store is not None:
+            return self._evaluate_with_store(X)
+        return self._evaluate_sample(X)
+
+    def _evaluate_with_store(self, X):
+        """
+        Evaluates a sample in coordination with the other drivers sharing the result store.
+
+        The outputs found in the store are reused, and the points claimed by this driver are evaluated.
+        The points claimed by another driver are waited for, and evaluated as well if their claim is released
+        or abandoned without a result. The outputs of the successful evaluations are written in the store,
+        and the failed ones are recorded there, their points being returned as NaN once they failed
+        `max_failures` times instead of being evaluated by every driver.
+        """
+        X = ot.Sample(X)
+        store = self.result_store
+        results = full((len(X), self.getOutputDimension()), float("nan"))
+        pending = range(len(X))
+        try:
+            while len(pending) > 0 and not self._cancel_event.is_set():
+                claimed = []
+                waiting = []
+                for index in pending:
+                    output = store.get(X[index])
+                    if output is not None:
+                        results[index] = output
+                    elif store.given_up(X[index]):
+                        continue  # Failed too many times, left as NaN
+                    elif store.claim(X[index]):
+                        claimed.append(index)
+                    else:
+                        waiting.append(index)
+                if len(claimed) > 0:
+                    Y = None
+                    try:
+                        Y = self._evaluate_sample(X.select(claimed))
+                    finally:
+                        for k, index in enumerate(claimed):
+                            if Y is None or self._cancel_event.is_set():
+                                store.release(X[index])
+                            elif any(math.isnan(value) for value in Y[k]):
+                                store.fail(X[index])
+                            else:
+                                store.put(X[index], Y[k])
+                                results[index] = Y[k]
+                elif len(waiting) > 0:
+                    time.sleep(1)  # Avoids spamming the shared filesystem
+                pending = waiting
+        except KeyboardInterrupt:
+            warnings.warn("Interrupted, the points claimed by other drivers are not waited for.")
+        results = ot.Sample(results)
+        results.setDescription(self.getOutputDescription())
+        return results
+
+    def _evaluate_sample(self, X):
+        """Evaluates a sample with jobs, and returns the outputs in the order of the inputs."""
+        X = ot.Sample(X)
+        X.setDescription(self.getInputDescription())
+
+        # Reattach to the jobs of an identical call if the previous driver died
+        manifest_file = self._manifest_file(X)
+        own_manifest_file = manifest_file.replace(
+            ".json", f".{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.json"
+        )
+        rounds = []
+        if not self.checkpoint:
+            # Without reattachment, the files of the call are its own
+            manifest_file = own_manifest_file
+        elif os.path.isfile(manifest_file):
+            if self._manifest_owner_alive(manifest_file):
+                # Another call on the same sample is running, its files are left alone
+                manifest_file = own_manifest_file
+            else:
+                rounds = self._read_manifest(manifest_file)
+        shared_file = None
+        try:
+            if self.shared_inputs:
+                shared_file = self._write_shared_inputs(X, manifest_file)
+            results = self._evaluate_rounds(X, rounds, manifest_file, shared_file)
+        finally:
+            if self.checkpoint and os.path.isfile(manifest_file):
+                os.remove(manifest_file)
+            if shared_file is not None and os.path.isfile(shared_file):
+                os.remove(shared_file)
+        self._update_cache(X, results)
+        return results
+
+    def _evaluate_rounds(self, X, rounds, manifest_file, shared_file):
+        """
+        Evaluates a sample by rounds of jobs, starting with the rounds of a previous driver if any,
+        and returns the outputs in the order of the inputs.
+        """
+        # The first round evaluates every point, the next ones resubmit
+        # the points lost because of infrastructure failures.
+        # The outputs of each job are written at their final rows, and converted once at the end.
+        results = full((len(X), self.getOutputDimension()), float("nan"))
+        failed = range(len(X))
+        timed_out = False
+        timeout = self.timeout_per_job
+        round_number = 0
+        extra_rounds = 0
+        cap = self._job_cap()
+        # Points evaluated locally once, whose next evaluations run on the cluster
+        burst_points = set()
+        # The retries and duplicates of a point write its field at the same slot
+        field_slots = None
+        if self.field_store is not None:
+            field_slots = self.field_store.allocate(len(X))
+        if self.telemetry is not None:
+            self.telemetry.start(len(X))
+        while len(failed) > 0 and round_number <= self.max_retries + extra_rounds:
+            if round_number < len(rounds):
+                jobs, batches = map(list, zip(*rounds[round_number]))
+                # The batches the previous driver had not submitted yet
+                covered = set(index for batch in batches for index in batch)
+                missing = [index for index in failed if index not in covered]
+                if len(missing) > 0:
+                    new_batches = [
+                        [missing[k] for k in batch]
+                        for batch in self._make_batches(len(missing))
+                    ]
+                    jobs += [None] * len(new_batches)
+                    batches += new_batches
+            else:
+                # Only the points within the budget of evaluations are submitted
+                if self.max_evaluations is not None:
+                    remaining = max(0, self.max_evaluations - self.evaluations_used)
+                    if len(failed) > remaining:
+                        warnings.warn(
+                            f"The budget of {self.max_evaluations} evaluations is spent, "
+                            f"{len(failed) - remaining} points are not submitted."
+                        )
+                        failed = failed[:remaining]
+                    if len(failed) == 0:
+                        break
+                if timed_out:
+                    timeout *= self.timeout_escalation
+                    self.executor.update_parameters(timeout_min=math.ceil(timeout))
+                # Divide input points across jobs (e.g. create batches)
+                costs = None
+                if self.cost_model is not None or self.runtime_model is not None:
+                    costs = self._estimate_costs(X.select(failed))
+                batches = self._make_batches(len(failed), costs)
+                if round_number > 0:  # Only the points left are resubmitted
+                    batches = [[failed[k] for k in batch] for batch in batches]
+                self.evaluations_used += len(failed)
+                if cap is None:
+                    jobs = self._submit_jobs(
+                        X, batches, round_number == 0, shared_file, field_slots
+                    )
+                else:  # Submitted through a sliding window
+                    jobs = [None] * len(batches)
+                rounds.append(list(zip(jobs, batches)))
+
+            def update_manifest():
+                rounds[round_number] = list(zip(jobs, batches))
+                self._write_manifest(manifest_file, rounds)
+
+            if self.checkpoint:
+                update_manifest()
+            speculative_results = self._wait_jobs(
+                X,
+                jobs,
+                batches,
+                cap,
+                round_number == 0,
+                update_manifest if self.checkpoint else None,
+                shared_file,
+                burst_points,
+                field_slots,
+            )
+
+            # Gather outputs
+            failed = []
+            cut_short = []
+            lost_locally = []
+            timed_out = False
+            timings = []
+            for job, batch in zip(jobs, batches):
+                if job is None:  # Left out by a cancellation
+                    continue
+                job_results, job_failed = self._gather_job(
+                    job, batch, speculative_results
+                )
+                # The last rows of a job are dummy rows if it has fewer points than tasks
+                results[batch] = array(job_results, dtype=float)[: len(batch)]
+                failed += job_failed
+                job_timed_out = bool(job_failed) and "TIMEOUT" in str(job.exception())
+                if job.job_id in self._shortened_jobs:
+                    self._shortened_jobs.discard(job.job_id)
+                    if job_timed_out:  # Killed before its predicted walltime
+                        cut_short += job_failed
+                else:
+                    timed_out |= job_timed_out
+                # The points skipped by their task, whose local evaluation failed
+                lost_locally += [
+                    index
+                    for task_number, index in enumerate(batch)
+                    if index in job_failed
+                    and os.path.isfile(self._task_file(job.job_id, task_number, "skip"))
+                ]
+                if self.runtime_model is not None:
+                    timings += self._read_timings(job, batch)
+            if len(timings) > 0:
+                indices, runtimes, memories = zip(*timings)
+                self.runtime_model.update(X.select(indices), runtimes, memories)
+            round_number += 1
+            if self._cancel_event.is_set():
+                break
+            extra = cut_short + [index for index in lost_locally if index not in cut_short]
+            if round_number > self.max_retries and extra_rounds == 0 and len(extra) > 0:
+                # The points whose walltime was underestimated get one more round without prediction,
+                # and the points left to a local evaluation which failed one more round on the cluster
+                failed = extra
+                extra_rounds += 1
+
+        results = ot.Sample(results)
         results.setDescription(self.getOutputDescription())
-        # Rows beyond len(X) are dummy rows filled with NaNs.
-        # They are generated by the useless tasks in the last job if len(X) % self.tasks_per_job != 0.
-        # If len(X) % self.tasks_per_job == 0, then len(result) == len(X) anyway.
-        return results[0 : len(X)]
+        if self.telemetry is not None:
+            self.telemetry.finish(results)
+        if timeout != self.timeout_per_job:
+            self.executor.update_parameters(timeout_min=self.timeout_per_job)
+        return results
+
+    def cancel(self):
+        """
+        Cancels the call in progress, for example from another thread once an algorithm has converged.
+
+        The outstanding jobs of the call are cancelled, and the call returns the outputs finished so far,
+        NaN for the other points.
+        """
+        self._cancel_event.set()
+
+    def _update_cache(self, X, Y):
+        """Keeps the most recent successful evaluations in memory."""
+        for i in range(max(0, len(X) - self.cache_size), len(X)):
+            y = list(Y[i])
+            if not any(math.isnan(value) for value in y):
+                key = tuple(X[i])
+                self._cache.pop(key, None)
+                self._cache[key] = y
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _evaluate_points(self, points):
+        """
+        Evaluates a list of points in a single wave of jobs, skipping the duplicates
+        and the points found in the cache of recent evaluations.
+        """
+        # The cached values are copied first, since the evaluation of the new points may evict them
+        values = {}
+        new_points = []
+        new_points_set = set()
+        for point in points:
+            key = tuple(point)
+            if key in values or key in new_points_set:
+                continue
+            if key in self._cache:
+                values[key] = self._cache[key]
+            else:
+                new_points.append(key)
+                new_points_set.add(key)
+        if len(new_points) > 0:
+            Y = self._exec_sample(new_points)
+            values.update((new_points[i], list(Y[i])) for i in range(len(new_points)))
+        return [values[tuple(point)] for point in points]
+
+    def gradients(self, X):
+        """
+        Computes the gradients of the function at several points by centered finite differences.
+
+        All the perturbed points are evaluated in a single wave of jobs, so that the gradients
+        at `n` points of dimension `d` cost one queue wait instead of `n` rounds of `2 d` evaluations.
+        The step is the one of OpenTURNS, given by the
+        `CenteredFiniteDifferenceGradient-DefaultEpsilon` key of :py:class:`openturns.ResourceMap`.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points where the gradients are computed.
+
+        Returns
+        -------
+        gradients : list of :py:class:`openturns.Matrix`
+            Gradient at each point, with one row per input and one column per output.
+        """
+        X = ot.Sample(X)
+        dimension = self.getInputDimension()
+        step = ot.ResourceMap.GetAsScalar(
+            "CenteredFiniteDifferenceGradient-DefaultEpsilon"
+        )
+        points = []
+        for x in X:
+            for i in range(dimension):
+                for sign in (1.0, -1.0):
+                    point = list(x)
+                    point[i] += sign * step
+                    points.append(point)
+        values = self._evaluate_points(points)
+        gradients = []
+        for n in range(len(X)):
+            gradient = ot.Matrix(dimension, self.getOutputDimension())
+            for i in range(dimension):
+                y_plus = values[2 * (n * dimension + i)]
+                y_minus = values[2 * (n * dimension + i) + 1]
+                for k in range(self.getOutputDimension()):
+                    gradient[i, k] = (y_plus[k] - y_minus[k]) / (2.0 * step)
+            gradients.append(gradient)
+        return gradients
+
+    def hessians(self, X):
+        """
+        Computes the hessians of the function at several points by centered finite differences.
+
+        As for :meth:`gradients`, all the perturbed points, including the centers,
+        are evaluated in a single wave of jobs. The scheme and its step are the ones of OpenTURNS,
+        given by the `CenteredFiniteDifferenceHessian-DefaultEpsilon` key of :py:class:`openturns.ResourceMap`.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Points where the hessians are computed.
+
+        Returns
+        -------
+        hessians : list of :py:class:`openturns.SymmetricTensor`
+            Hessian at each point.
+        """
+        X = ot.Sample(X)
+        dimension = self.getInputDimension()
+        step = ot.ResourceMap.GetAsScalar(
+            "CenteredFiniteDifferenceHessian-DefaultEpsilon"
+        )
+        pairs = [(i, j) for i in range(dimension) for j in range(i + 1)]
+        # Offsets, in steps, of the points needed for each pair of inputs
+        offsets = {}
+        for i, j in pairs:
+            if i == j:
+                offsets[i, j] = [({i: 2.0}, 1.0), ({}, -2.0), ({i: -2.0}, 1.0)]
+            else:
+                offsets[i, j] = [
+                    ({i: 1.0, j: 1.0}, 1.0),
+                    ({i: 1.0, j: -1.0}, -1.0),
+                    ({i: -1.0, j: 1.0}, -1.0),
+                    ({i: -1.0, j: -1.0}, 1.0),
+                ]
+        points = []
+        for x in X:
+            for i, j in pairs:
+                for offset, _ in offsets[i, j]:
+                    point = list(x)
+                    for component, factor in offset.items():
+                        point[component] += factor * step
+                    points.append(point)
+        values = iter(self._evaluate_points(points))
+        hessians = []
+        for x in X:
+            hessian = ot.SymmetricTensor(dimension, self.getOutputDimension())
+            for i, j in pairs:
+                denominator = 4.0 * step * step
+                terms = [(next(values), weight) for _, weight in offsets[i, j]]
+                for k in range(self.getOutputDimension()):
+                    hessian[i, j, k] = (
+                        sum(weight * y[k] for y, weight in terms) / denominator
+                    )
+            hessians.append(hessian)
+        return hessians
+
+    def _gradient(self, x):
+        gradient = self.gradients([x])[0]
+        return [
+            [gradient[i, k] for k in range(gradient.getNbColumns())]
+            for i in range(gradient.getNbRows())
+        ]
+
+    def _hessian(self, x):
+        hessian = self.hessians([x])[0]
+        return [
+            [
+                [hessian[i, j, k] for k in range(hessian.getNbSheets())]
+                for j in range(hessian.getNbColumns())
+            ]
+            for i in range(hessian.getNbRows())
+        ]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import openturns as ot
+
+
+class Telemetry(object):
+    """
+    Live metrics of the calls of a :class:`~othpc.SubmitFunction`, in the Prometheus text format.
+
+    Passed to :class:`~othpc.SubmitFunction` as `telemetry`, it is updated by the driver while it waits
+    for the jobs, from the files written by each task when it finishes: output, error and timing files.
+    It reports the number of points done, failed and pending, the number of jobs queued and running,
+    the throughput in evaluations per minute, the estimated time left at this throughput,
+    and percentiles of the evaluation times.
+
+    The metrics are exposed in a file rewritten periodically, for example in the directory
+    scraped by the textfile collector of a Prometheus node exporter, and/or by an HTTP endpoint
+    on localhost.
+
+    Parameters
+    ----------
+    metrics_file : str
+        Path of the metrics file. No file by default.
+    port : int
+        Port of the HTTP endpoint on localhost, serving the metrics at any path. No endpoint by default.
+    interval : float
+        Minimal delay in seconds between two observations of the task files, and between two rewrites
+        of the metrics file.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> telemetry = othpc.Telemetry()
+    >>> telemetry.start(10)
+    >>> print(telemetry.render().splitlines()[2])
+    othpc_points{status="pending"} 10
+    """
+
+    def __init__(self, metrics_file=None, port=None, interval=5.0):
+        self.metrics_file = metrics_file
+        self.port = port
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._server = None
+        self._last_write = 0.0
+        self._reset(0)
+
+    def _reset(self, size):
+        self._start = time.time()
+        self._last_observe = 0.0
+        self._status = ["pending"] * size
+        self._seen = set()
+        self._runtimes = []
+        self._jobs = {"pending": 0, "running": 0}
+
+    def start(self, size):
+        """
+        Starts monitoring a call.
+
+        Parameters
+        ----------
+        size : int
+            Number of points of the call.
+        """
+        with self._lock:
+            self._reset(size)
+        if self.port is not None and self._server is None:
+            self._start_server()
+        self.publish(force=True)
+
+    def observe(self, submit_function, jobs, batches, speculative_results=None):
+        """
+        Updates the metrics from the task files of the jobs of the current round,
+        at most once per interval.
+
+        The tasks of the jobs still queued are not looked at, which spares the shared filesystem.
+
+        Parameters
+        ----------
+        submit_function : :class:`~othpc.SubmitFunction`
+            Function whose jobs are observed.
+        jobs : list of submitit.Job
+            Jobs of the round, None for the ones not submitted yet.
+        batches : list of list of int
+            Indices of the points evaluated by each job.
+        speculative_results : dict
+            Outputs of the points already evaluated by a duplicate or on the local host,
+            indexed by their position in the sample, which are done whatever their task.
+        """
+        now = time.time()
+        if now - self._last_observe < self.interval:
+            return
+        self._last_observe = now
+        if speculative_results is None:
+            speculative_results = {}
+        job_states = {"pending": 0, "running": 0}
+        with self._lock:
+            for job, batch in zip(jobs, batches):
+                if job is None:
+                    for index in batch:
+                        self._status[index] = "pending"
+                    continue
+                done = job.done()
+                if not done:
+                    state = "pending" if job.state in ["PENDING", "UNKNOWN"] else "running"
+                    job_states[state] += 1
+                for task_number, index in enumerate(batch):
+                    key = (job.job_id, task_number)
+                    if key in self._seen:
+                        continue
+                    if index in speculative_results:
+                        self._status[index] = "done"
+                        continue
+                    if not done and state == "pending":
+                        self._status[index] = "pending"
+                        continue
+                    output_file = submit_function._task_file(job.job_id, task_number, "output")
+                    error_file = submit_function._task_file(job.job_id, task_number, "error")
+                    skip_file = submit_function._task_file(job.job_id, task_number, "skip")
+                    if os.path.isfile(output_file):
+                        self._status[index] = "done"
+                    elif os.path.isfile(skip_file):
+                        # Evaluated on the local host, and not collected yet
+                        self._status[index] = "pending"
+                        continue
+                    elif os.path.isfile(error_file) or done:
+                        self._status[index] = "failed"
+                    else:
+                        self._status[index] = "pending"
+                        continue
+                    # The task is finished, it is read once
+                    self._seen.add(key)
+                    timing_file = submit_function._task_file(job.job_id, task_number, "timing")
+                    if os.path.isfile(timing_file):
+                        self._runtimes.append(ot.Sample.ImportFromCSVFile(timing_file)[0, 1])
+            self._jobs = job_states
+        self.publish()
+
+    def finish(self, results):
+        """
+        Ends the monitoring of a call with its outputs, the points returned as NaN being failed.
+
+        Parameters
+        ----------
+        results : :py:class:`openturns.Sample`
+            Outputs of the call.
+        """
+        values = np.array(results, dtype=float).reshape(len(results), -1)
+        with self._lock:
+            failed = np.isnan(values).any(axis=1)
+            self._status = ["failed" if f else "done" for f in failed]
+            self._jobs = {"pending": 0, "running": 0}
+        self.publish(force=True)
+
+    def metrics(self):
+        """
+        Returns the current metrics.
+
+        Returns
+        -------
+        metrics : dict
+            Values of the metrics, by name.
+        """
+        with self._lock:
+            counts = {
+                status: self._status.count(status)
+                for status in ["done", "failed", "pending"]
+            }
+            elapsed = max(time.time() - self._start, 1e-9)
+            rate = 60.0 * counts["done"] / elapsed
+            metrics = {
+                "points_done": counts["done"],
+                "points_failed": counts["failed"],
+                "points_pending": counts["pending"],
+                "jobs_pending": self._jobs["pending"],
+                "jobs_running": self._jobs["running"],
+                "evaluations_per_minute": rate,
+                "eta_seconds": 60.0 * counts["pending"] / rate if rate > 0 else float("nan"),
+            }
+            for quantile in [0.5, 0.9, 0.99]:
+                metrics[f"runtime_p{round(100 * quantile)}"] = (
+                    float(np.quantile(self._runtimes, quantile))
+                    if len(self._runtimes) > 0
+                    else float("nan")
+                )
+        return metrics
+
+    def render(self):
+        """Returns the metrics in the Prometheus text format."""
+        m = self.metrics()
+        lines = [
+            "# HELP othpc_points Points of the current call by status.",
+            "# TYPE othpc_points gauge",
+        ]
+        for status in ["pending", "done", "failed"]:
+            lines.append(f'othpc_points{{status="{status}"}} {m["points_" + status]}')
+        lines += [
+            "# HELP othpc_jobs Jobs of the current call in flight by state.",
+            "# TYPE othpc_jobs gauge",
+            f'othpc_jobs{{state="pending"}} {m["jobs_pending"]}',
+            f'othpc_jobs{{state="running"}} {m["jobs_running"]}',
+            "# HELP othpc_evaluations_per_minute Throughput of the current call.",
+            "# TYPE othpc_evaluations_per_minute gauge",
+            f"othpc_evaluations_per_minute {m['evaluations_per_minute']:.6g}",
+            "# HELP othpc_eta_seconds Time left at the current throughput.",
+            "# TYPE othpc_eta_seconds gauge",
+            f"othpc_eta_seconds {m['eta_seconds']:.6g}",
+            "# HELP othpc_task_runtime_seconds Evaluation time of the tasks.",
+            "# TYPE othpc_task_runtime_seconds summary",
+        ]
+        for quantile in [0.5, 0.9, 0.99]:
+            value = m[f"runtime_p{round(100 * quantile)}"]
+            lines.append(
+                f'othpc_task_runtime_seconds{{quantile="{quantile}"}} {value:.6g}'
+            )
+        return "\n".join(lines).replace("nan", "NaN") + "\n"
+
+    def publish(self, force=False):
+        """Rewrites the metrics file, at most once per interval unless forced."""
+        if self.metrics_file is None:
+            return
+        if not force and time.time() - self._last_write < self.interval:
+            return
+        self._last_write = time.time()
+        with open(self.metrics_file + ".tmp", "w") as file:
+            file.write(self.render())
+        os.replace(self.metrics_file + ".tmp", self.metrics_file)
+
+    def _start_server(self):
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = telemetry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+
+    def close(self):
+        """Stops the HTTP endpoint, if any."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copyright (C) EDF 2025
+
+@authors: Elias Fekhari, Joseph Muré, Michaël Baudin
+"""
+import os
+import re
+
+# Compiled templates of the current process, shared by the instances of InputTemplate
+_compiled_templates = {}
+
+
+def _compile(template_file, tokens, encoding):
+    """
+    Splits a template file around the occurrences of its tokens.
+
+    Returns
+    -------
+    chunks : list of str
+        Text between the tokens, one more than the slots.
+    slots : list of int
+        Index of the token found between two consecutive chunks.
+    """
+    with open(template_file, "r", encoding=encoding, newline="") as f:
+        text = f.read()
+    # Alternatives are tried in order, so the longest tokens come first in case of overlap
+    order = sorted(range(len(tokens)), key=lambda i: -len(tokens[i]))
+    pattern = re.compile("|".join(re.escape(tokens[i]) for i in order))
+    indices = {tokens[i]: i for i in order}
+    chunks = []
+    slots = []
+    position = 0
+    for match in pattern.finditer(text):
+        chunks.append(text[position : match.start()])
+        slots.append(indices[match.group(0)])
+        position = match.end()
+    chunks.append(text[position:])
+    for index, token in enumerate(tokens):
+        if index not in slots:
+            raise ValueError(f'The token "{token}" was not found in {template_file}.')
+    return chunks, slots
+
+
+class InputTemplate(object):
+    """
+    Input file template, compiled once per process and rendered for many points.
+
+    Replacing tokens with :py:func:`openturns.coupling_tools.replace` reads and
+    searches the template file at each evaluation. This template is read once,
+    and the positions of its tokens are precomputed, so that rendering an input
+    file only formats the values and writes the text around them.
+    The compiled template is not pickled with the instance: each worker process
+    compiles it once, on its first rendering.
+
+    Parameters
+    ----------
+    template_file : str
+        Path of the template file.
+    tokens : list of str
+        Tokens replaced by the values of the inputs, in the order of the inputs.
+        They are matched literally, the longest first when they overlap.
+    formats : list of str
+        Format of each value, as in :py:meth:`str.format`, for example `"{:.6e}"`.
+        By default, `"{}"`.
+    encoding : str
+        Encoding of the template file.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> import tempfile, os
+    >>> folder = tempfile.mkdtemp()
+    >>> template_file = os.path.join(folder, "input.txt.in")
+    >>> with open(template_file, "w") as f:
+    ...     count = f.write("E=@E@ F=@F@")
+    >>> template = othpc.InputTemplate(template_file, ["@E@", "@F@"], ["{:.2e}", "{}"])
+    >>> template.render([210000.0, 3])
+    'E=2.10e+05 F=3'
+    """
+
+    def __init__(self, template_file, tokens, formats=None, encoding="utf-8"):
+        if not os.path.isfile(template_file):
+            raise ValueError(f"The input template {template_file} file does not exist.")
+        if formats is None:
+            formats = ["{}"] * len(tokens)
+        if len(formats) != len(tokens):
+            raise ValueError(
+                f"{len(formats)} formats were given for {len(tokens)} tokens."
+            )
+        self.template_file = os.path.abspath(template_file)
+        self.tokens = list(tokens)
+        self.formats = list(formats)
+        self.encoding = encoding
+        # Fails early if a token is missing
+        self._compiled()
+
+    def _compiled(self):
+        """Returns the chunks and slots of the template, compiling it if needed."""
+        key = (
+            self.template_file,
+            os.path.getmtime(self.template_file),
+            tuple(self.tokens),
+            self.encoding,
+        )
+        if key not in _compiled_templates:
+            _compiled_templates[key] = _compile(
+                self.template_file, self.tokens, self.encoding
+            )
+        return _compiled_templates[key]
+
+    def _parts(self, x):
+        """Returns the pieces of text of the template rendered for a point."""
+        if len(x) != len(self.tokens):
+            raise ValueError(
+                f"The point has dimension {len(x)}, expected {len(self.tokens)}."
+            )
+        chunks, slots = self._compiled()
+        values = [fmt.format(value) for fmt, value in zip(self.formats, x)]
+        parts = [chunks[0]]
+        for slot, chunk in zip(slots, chunks[1:]):
+            parts.append(values[slot])
+            parts.append(chunk)
+        return parts
+
+    def render(self, x):
+        """
+        Returns the text of the template with the tokens replaced by the values of a point.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Values of the tokens.
+        """
+        return "".join(self._parts(x))
+
+    def write(self, x, output_file):
+        """
+        Writes the template rendered for a point.
+
+        Parameters
+        ----------
+        x : sequence of float
+            Values of the tokens.
+        output_file : str
+            Path of the input file written.
+        """
+        with open(output_file, "w", encoding=self.encoding, newline="") as f:
+            f.writelines(self._parts(x))
+
+    def write_sample(self, X, output_files):
+        """
+        Writes the template rendered for each point of a sample.
+
+        Parameters
+        ----------
+        X : 2-d sequence of float
+            Values of the tokens, one point per input file.
+        output_files : list of str
+            Paths of the input files written, one per point.
+        """
+        if len(X) != len(output_files):
+            raise ValueError(
+                f"{len(output_files)} output files were given for {len(X)} points."
+            )
+        for x, output_file in zip(X, output_files):
+            self.write(x, output_file)
@@ -7,13 +7,16 @@ Copyright (C) EDF 2025
 """
 from datetime import datetime
 from tempfile import mkdtemp
+import numpy as np
 import pandas as pd
 import shutil
 import os
 import openturns as ot
 import time
 import math
+import getpass
 import logging
+import subprocess
 
 
 class TempSimuDir(object):
@@ -70,10 +73,15 @@ def make_report_file(
     report_file="report.csv",
     input_description=None,
     output_description=None,
+    field_store=None,
 ):
     """
     Writes a report file associated to one evaluation, including the input and the corresponding output.
 
+    With a field store, the output is a field which is not written in the report:
+    it is saved in the file `field.npy` of the evaluation directory, and the report records
+    the path of this file in the column `field_file`, followed by the summaries of the field.
+
     Parameters
     ----------
     simu_dir : str
@@ -88,7 +96,14 @@ def make_report_file(
         List of strings describing the intputs.
     output_description : list of str
         List of strings describing the outputs.
+    field_store : :class:`~othpc.FieldStore`
+        Store of the fields of the function, giving their summaries.
     """
+    if field_store is not None and y is not None:
+        field_file = os.path.join(simu_dir, "field.npy")
+        np.save(field_file, np.asarray(y, dtype=float))
+        output_description = ["field_file"] + field_store.summary_description
+        y = [field_file] + field_store.summarize(y)
     if input_description is None:
         input_description = [f"X{i}" for i in range(len(x))]
     else:
@@ -135,27 +150,43 @@ def make_summary_file(res_dir, summary_file="summary.csv", report_file="report.c
     df_table.to_csv(os.path.join(res_dir, summary_file), na_rep="NaN")
 
 
-def load_cache(function, summary_file):
+def load_cache(function, summary_file, field_store=None):
     """
     Makes an openturns.MemoizeFunction including in its cache the previous evaluations written in the summary_file.
 
+    When the reports recorded field files, the fields are written in the field store of the function,
+    and their cached outputs are their slots in the store followed by their summaries,
+    like the outputs of the function.
+
     Parameters
     ----------
     function : openturns.Function or openturns.OpenTURNSPythonFunction
         Function that will be turned into a openturns.MemoizeFunction
     summary_file : str
         Path to the summary file created by the make_summary_file method.
+    field_store : :class:`~othpc.FieldStore`
+        Store of the fields of the function, required if the summary records field files.
     """
     memoize_function = ot.MemoizeFunction(ot.Function(function))
     # load the cache from the summary file
     df = pd.read_csv(summary_file)
     df = df.drop(columns=df.columns[0])
+    outputs = df.iloc[:, function.getInputDimension() :].copy()
+    if "field_file" in outputs.columns:
+        if field_store is None:
+            raise ValueError(
+                "The summary file records field files, the field store of the function is required."
+            )
+        field_files = outputs["field_file"].dropna()
+        slots = field_store.allocate(len(field_files))
+        for slot, field_file in zip(slots, field_files):
+            field_store.write(slot, np.load(field_file))
+        outputs["field_file"] = pd.Series(slots, index=field_files.index, dtype=float)
+        outputs = outputs.rename(columns={"field_file": "field_index"})
     input_cache = ot.Sample.BuildFromDataFrame(
         df.iloc[:, : function.getInputDimension()]
     )
-    output_cache = ot.Sample.BuildFromDataFrame(
-        df.iloc[:, function.getInputDimension() :]
-    )
+    output_cache = ot.Sample.BuildFromDataFrame(outputs)
     # add the cache to the function
     memoize_function.addCacheContent(input_cache, output_cache)
     return memoize_function
@@ -187,6 +218,8 @@ def evaluation_error_log(error, simulation_directory, name="evaluation_error.txt
     # Add the handler to the logger
     logger.addHandler(fh)
     logger.error(error)
+    logger.removeHandler(fh)
+    fh.close()
 
 
 def fake_load(duration=30):
@@ -201,3 +234,116 @@ def fake_load(duration=30):
     start = time.time()
     while time.time() - start < duration:
         a = math.sqrt(64 * 64 * 64 * 64 * 64)
+
+
+def mpi_launch_command(command, ntasks, nodes=1, launcher=None):
+    """
+    Returns the command line launching an MPI program.
+
+    Inside a SLURM job, for example in a task of :class:`~othpc.SubmitFunction`,
+    the program runs as a job step of the enclosing allocation, instead of queuing for its own.
+    The steps are launched with `--overlap`, so that several evaluations share the nodes
+    of the allocation, and `--exact`, so that each one only uses the CPUs it requests.
+    The enclosing allocation must therefore hold `ntasks` CPUs times the number of evaluations
+    running at once, for example `cpus_per_task=ntasks` in :class:`~othpc.SubmitFunction`
+    when each of its tasks runs one evaluation: SLURM rejects a step requesting more CPUs
+    than the allocation has.
+
+    Parameters
+    ----------
+    command : str
+        Command line of the program, with its arguments.
+    ntasks : int
+        Number of MPI processes.
+    nodes : int
+        Number of nodes the processes are spread on, only used by `srun`.
+    launcher : str
+        Either "srun" or "mpiexec". By default, "srun" inside a SLURM job and "mpiexec" otherwise.
+
+    Examples
+    --------
+    >>> import othpc
+    >>> othpc.mpi_launch_command("myMPIProgram 1.0", 4, launcher="mpiexec")
+    'mpiexec -n 4 myMPIProgram 1.0'
+    >>> othpc.mpi_launch_command("myMPIProgram 1.0", 4, nodes=2, launcher="srun")
+    'srun --overlap --exact --nodes=2 --ntasks=4 myMPIProgram 1.0'
+    """
+    if launcher is None:
+        launcher = "srun" if "SLURM_JOB_ID" in os.environ else "mpiexec"
+    if launcher == "srun":
+        return f"srun --overlap --exact --nodes={nodes} --ntasks={ntasks} {command}"
+    elif launcher == "mpiexec":
+        return f"mpiexec -n {ntasks} {command}"
+    raise ValueError(f'Unknown launcher "{launcher}", expected "srun" or "mpiexec".')
+
+
+def _slurm_query(command):
+    """Returns the lines printed by a SLURM command, or None if it is not available."""
+    try:
+        process = subprocess.run(
+            command, capture_output=True, text=True, check=True, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return [line for line in process.stdout.splitlines() if line.strip() != ""]
+
+
+def slurm_job_limit(user=None, qos=None):
+    """
+    Returns the maximal number of jobs a user may have queued or running at the same time.
+
+    The limit is the smallest of the `MaxSubmitJobs` and `MaxJobs` limits of the associations
+    of the user and of the per-user limits of the quality of service, as reported by `sacctmgr`.
+
+    Parameters
+    ----------
+    user : str
+        Name of the user, the current user by default.
+    qos : str
+        Quality of service of the jobs, the default one of the user's association by default.
+
+    Returns
+    -------
+    limit : int
+        Maximal number of jobs, or None if there is no limit or `sacctmgr` is not available.
+    """
+    if user is None:
+        user = getpass.getuser()
+    limits = []
+    lines = _slurm_query(
+        [
+            "sacctmgr",
+            "-nP",
+            "show",
+            "assoc",
+            f"user={user}",
+            "format=MaxSubmitJobs,MaxJobs,DefaultQOS",
+        ]
+    )
+    for line in lines or []:
+        max_submit, max_jobs, default_qos = line.split("|")
+        limits += [int(value) for value in [max_submit, max_jobs] if value.isdigit()]
+        if qos is None and default_qos != "":
+            qos = default_qos
+    if qos is not None:
+        lines = _slurm_query(
+            ["sacctmgr", "-nP", "show", "qos", qos, "format=MaxSubmitPU,MaxJobsPU"]
+        )
+        for line in lines or []:
+            limits += [int(value) for value in line.split("|") if value.isdigit()]
+    return min(limits) if len(limits) > 0 else None
+
+
+def slurm_queued_jobs(user=None):
+    """
+    Returns the number of jobs of a user queued or running, according to `squeue`.
+
+    Parameters
+    ----------
+    user : str
+        Name of the user, the current user by default.
+    """
+    if user is None:
+        user = getpass.getuser()
+    lines = _slurm_query(["squeue", "-h", "-u", user, "-o", "%i"])
+    return 0 if lines is None else len(lines)
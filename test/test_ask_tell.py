@@ -0,0 +1,32 @@
+import othpc
+import openturns as ot
+import pytest
+
+
+@pytest.fixture
+def driver():
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local")
+    return othpc.AskTellDriver(sf, max_in_flight=4)
+
+
+def test_in_flight_target(driver):
+    assert driver.ask() == 4
+    driver.tell([[float(i)] for i in range(6)])
+    assert driver.n_in_flight == 4
+    assert driver.n_queued == 2
+    assert driver.ask() == 0
+
+
+def test_collect_everything(driver):
+    ids = driver.tell([[float(i)] for i in range(6)])
+    collected = {}
+    while len(collected) < len(ids):
+        new_ids, X, Y = driver.results(wait=True)
+        for k, index in enumerate(new_ids):
+            assert X[k, 0] == float(index)
+            collected[index] = Y[k, 0]
+        # The algorithm proposes new points as soon as there is room
+        assert driver.n_in_flight <= 4
+    assert collected == {i: 2.0 * i for i in range(6)}
+    assert driver.ask() == 4
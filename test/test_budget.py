@@ -0,0 +1,93 @@
+import os
+import math
+import time
+import threading
+import othpc
+import openturns as ot
+import pytest
+
+
+def slow_double(x):
+    time.sleep(1.0)
+    return [2.0 * x[0]]
+
+
+@pytest.fixture
+def model():
+    f = ot.PythonFunction(1, 1, slow_double)
+    return othpc.SubmitFunction(f, backend=othpc.LocalPoolExecutor(cpus=1))
+
+
+def test_cancel(model):
+    threading.Timer(2.5, model.cancel).start()
+    start = time.time()
+    Y = model([[float(i)] for i in range(20)])
+    assert time.time() - start < 10.0
+    finished = [y for y in Y.asPoint() if not math.isnan(y)]
+    assert 0 < len(finished) < 20
+    assert finished == [2.0 * i for i in range(len(finished))]
+    # The next call is not cancelled
+    assert model([[30.0]])[0, 0] == 60.0
+
+
+def test_node_hours_budget(model):
+    model.max_node_hours = 3.0 / 3600.0
+    with pytest.warns(UserWarning, match="node-hours"):
+        Y = model([[float(i)] for i in range(20)])
+    assert math.isnan(Y[19, 0])
+    assert model.node_hours_used >= model.max_node_hours
+
+
+def test_evaluations_budget():
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    sf = othpc.SubmitFunction(f, backend="local", max_evaluations=5)
+    assert list(sf([[1.0], [2.0], [3.0]]).asPoint()) == [2.0, 4.0, 6.0]
+    with pytest.warns(UserWarning, match="evaluations"):
+        Y = sf([[4.0], [5.0], [6.0]])
+    assert list(Y.asPoint())[:2] == [8.0, 10.0]
+    assert math.isnan(Y[2, 0])
+    assert sf.evaluations_used == 5
+
+
+def test_keyboard_interrupt(model, monkeypatch):
+    # Ctrl-C hit while the driver waits for the jobs
+    sleep = time.sleep
+    driver = os.getpid()
+    calls = []
+
+    def interrupted_sleep(seconds):
+        if os.getpid() == driver:
+            calls.append(seconds)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+        sleep(seconds)
+
+    monkeypatch.setattr(othpc.submit_function.time, "sleep", interrupted_sleep)
+    with pytest.warns(UserWarning, match="Interrupted"):
+        Y = model([[float(i)] for i in range(20)])
+    assert math.isnan(Y[19, 0])
+
+
+class FakeJob(object):
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.state = "RUNNING"
+
+    def done(self):
+        return self.state != "RUNNING"
+
+
+def test_node_hours_of_jobs_left_out():
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(f, backend="local", nodes_per_job=2, max_node_hours=1.0)
+    running_since = {}
+    jobs = [FakeJob("1"), FakeJob("2")]
+    sf._count_node_hours(running_since, jobs)
+    assert set(running_since) == {"1", "2"}
+    # The first job ends while it is no longer among the jobs in flight
+    jobs[0].state = "CANCELLED"
+    running_since["1"] = (jobs[0], time.time() - 3600.0)
+    node_hours = sf._count_node_hours(running_since, jobs[1:])
+    assert set(running_since) == {"2"}
+    assert 2.0 <= sf.node_hours_used < 2.01
+    assert node_hours >= sf.node_hours_used
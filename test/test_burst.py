@@ -0,0 +1,71 @@
+import os
+import math
+import time
+import othpc
+import openturns as ot
+
+
+def slow_double(x):
+    time.sleep(1.0)
+    return [2.0 * x[0]]
+
+
+def test_burst_while_queued():
+    # A single slot on the cluster, so that most jobs wait in the queue
+    f = ot.PythonFunction(1, 1, slow_double)
+    sf = othpc.SubmitFunction(
+        f, backend=othpc.LocalPoolExecutor(cpus=1), burst_cpus=3
+    )
+    burst_jobs = []
+    submit = sf._burst_executor.submit
+
+    def spy(fn, *args):
+        job = submit(fn, *args)
+        burst_jobs.append(job.job_id)
+        return job
+
+    sf._burst_executor.submit = spy
+    X = [[float(i)] for i in range(8)]
+    Y = sf(X)
+    assert list(Y.asPoint()) == [2.0 * i for i in range(8)]
+    assert len(burst_jobs) > 0
+
+
+def test_skipped_task():
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    sf = othpc.SubmitFunction(f, backend="local")
+    # Outside of a job, the task runs as the task 0 of the job "0"
+    skip_file = sf._task_file("0", 0, "skip")
+    os.makedirs(os.path.dirname(skip_file), exist_ok=True)
+    open(skip_file, "w").close()
+    try:
+        assert math.isnan(sf.task(ot.Sample([[1.0]]))[0])
+    finally:
+        os.remove(skip_file)
+    assert sf.task(ot.Sample([[1.0]])) == ot.Point([2.0])
+
+
+def lost(*args):
+    raise RuntimeError("The local worker was lost.")
+
+
+def test_lost_burst_evaluation():
+    f = ot.PythonFunction(1, 1, slow_double)
+    sf = othpc.SubmitFunction(
+        f, backend=othpc.LocalPoolExecutor(cpus=1), burst_cpus=2
+    )
+    burst_jobs = []
+    submit = sf._burst_executor.submit
+
+    def spy(fn, *args):
+        # The local evaluations fail without running the model
+        job = submit(lost, *args)
+        burst_jobs.append(job.job_id)
+        return job
+
+    sf._burst_executor.submit = spy
+    X = [[float(i)] for i in range(6)]
+    Y = sf(X)
+    assert len(burst_jobs) > 0
+    # The points are evaluated on the cluster instead
+    assert list(Y.asPoint()) == [2.0 * i for i in range(6)]
@@ -93,3 +93,33 @@ def test_sample(model):
         len(X),
         1 + model.getInputDimension() + model.getOutputDimension(),
     )
+
+
+def test_parallel_sample():
+    X = [
+        [33021.47, 28315077.8, 253.31, 397.93],
+        [18837.04, 34918130.37, 253.61, 403.45],
+        [18612.64, 28268628.1, 250.95, 367.27],
+    ]
+    shutil.rmtree("my_results", ignore_errors=True)
+    cb = CantileverBeam("my_results", n_cpus=3, fake_load_time=0)
+    Y = ot.Function(cb)(X)
+    ott.assert_almost_equal(Y, ot.Sample([[15.8784], [7.27026], [9.44405]]))
+    simu_dirs = [f for f in os.scandir("my_results") if f.is_dir()]
+    assert len(simu_dirs) == len(X)
+
+
+def test_parallel_task():
+    X = [
+        [33021.47, 28315077.8, 253.31, 397.93],
+        [18837.04, 34918130.37, 253.61, 403.45],
+        [18612.64, 28268628.1, 250.95, 367.27],
+    ]
+    shutil.rmtree("my_results", ignore_errors=True)
+    cb = CantileverBeam("my_results", n_cpus=3, fake_load_time=0)
+    # A single task evaluates the sample on its 3 cores
+    sf = othpc.SubmitFunction(cb, cpus_per_task=3, points_per_task=3, backend="local")
+    Y = sf(X)
+    ott.assert_almost_equal(Y, ot.Sample([[15.8784], [7.27026], [9.44405]]))
+    simu_dirs = [f for f in os.scandir("my_results") if f.is_dir()]
+    assert len(simu_dirs) == len(X)
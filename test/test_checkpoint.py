@@ -0,0 +1,110 @@
+import os
+import json
+import othpc
+import openturns as ot
+import pytest
+
+
+def double(x):
+    return [2.0 * x[0]]
+
+
+@pytest.fixture
+def model():
+    f = ot.PythonFunction(1, 1, double)
+    return othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", checkpoint="double")
+
+
+def die(manifest_file):
+    """Makes the manifest look written by a driver which is gone."""
+    with open(manifest_file) as file:
+        manifest = json.load(file)
+    manifest["owner"]["pid"] = 2**22 + 1
+    with open(manifest_file, "w") as file:
+        json.dump(manifest, file)
+
+
+def test_manifest_removed(model):
+    X = ot.Sample([[1.0], [2.0], [3.0]])
+    model(X)
+    assert not os.path.isfile(model._manifest_file(X))
+
+
+def test_reattach(model):
+    X = ot.Sample([[1.0], [2.0], [3.0]])
+    # A first driver submits the jobs, writes the manifest and dies
+    batches = model._make_batches(len(X))
+    jobs = model._submit_jobs(X, batches)
+    manifest_file = model._manifest_file(X)
+    model._write_manifest(manifest_file, [list(zip(jobs, batches))])
+    for job in jobs:
+        job.results()
+    die(manifest_file)
+
+    # A new driver collects the results without submitting anything
+    f = ot.PythonFunction(1, 1, double)
+    restarted = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", checkpoint="double")
+
+    def forbidden_submit(*args):
+        raise AssertionError("no job should be submitted")
+
+    restarted.executor.submit = forbidden_submit
+    Y = restarted(X)
+    assert list(Y.asPoint()) == [2.0, 4.0, 6.0]
+    assert not os.path.isfile(manifest_file)
+
+
+def test_live_owner(model):
+    X = ot.Sample([[1.0], [2.0], [3.0]])
+    # The manifest of a live driver on the same sample lists jobs which are not this call's
+    batches = model._make_batches(len(X))
+    jobs = [model.executor.reattach(f"{k}") for k in range(len(batches))]
+    manifest_file = model._manifest_file(X)
+    model._write_manifest(manifest_file, [list(zip(jobs, batches))])
+    Y = model(X)
+    assert list(Y.asPoint()) == [2.0, 4.0, 6.0]
+    # Its manifest is left in place
+    assert os.path.isfile(manifest_file)
+    assert os.listdir(os.path.dirname(manifest_file)) == [os.path.basename(manifest_file)]
+    os.remove(manifest_file)
+
+
+def test_unfinished_local_jobs(model):
+    X = ot.Sample([[1.0], [2.0], [3.0]])
+    # The local jobs of a dead driver which had not finished left no outputs
+    batches = model._make_batches(len(X))
+    jobs = [model.executor.reattach(f"{k}") for k in range(len(batches))]
+    manifest_file = model._manifest_file(X)
+    model._write_manifest(manifest_file, [list(zip(jobs, batches))])
+    die(manifest_file)
+    # Their points are submitted again instead of being returned as failures
+    Y = model(X)
+    assert list(Y.asPoint()) == [2.0, 4.0, 6.0]
+
+
+def shift(x):
+    return [x[0] + 100.0]
+
+
+def test_models_of_same_type(model):
+    X = ot.Sample([[1.0], [2.0]])
+    f = ot.PythonFunction(1, 1, shift)
+    other = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", checkpoint="shift")
+    assert list(f.getOutputDescription()) == list(model.getOutputDescription())
+    # A manifest left by a crash of the first model is not reattached by the second one
+    batches = model._make_batches(len(X))
+    jobs = model._submit_jobs(X, batches)
+    manifest_file = model._manifest_file(X)
+    model._write_manifest(manifest_file, [list(zip(jobs, batches))])
+    for job in jobs:
+        job.results()
+    die(manifest_file)
+    assert other._manifest_file(X) != manifest_file
+    assert list(other(X).asPoint()) == [101.0, 102.0]
+    os.remove(manifest_file)
+
+
+def test_checkpoint_key():
+    f = ot.PythonFunction(1, 1, double)
+    with pytest.raises(ValueError):
+        othpc.SubmitFunction(f, backend="local", checkpoint=True)
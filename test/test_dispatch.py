@@ -0,0 +1,57 @@
+import time
+import othpc
+import openturns as ot
+import pytest
+
+
+@pytest.fixture
+def executor():
+    return othpc.DispatchExecutor(
+        [othpc.LocalPoolExecutor(cpus=1), othpc.LocalPoolExecutor(cpus=2)],
+        parameters=[{"slurm_partition": "cn"}, {"slurm_partition": "bm"}],
+    )
+
+
+def test_ordered_results(executor):
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend=executor)
+    X = [[float(i)] for i in range(8)]
+    Y = sf(X)
+    assert list(Y.asPoint()) == [2.0 * i for i in range(8)]
+    assert sum(executor.submitted) == 4
+    assert min(executor.submitted) > 0
+
+
+def test_backed_up_partition(executor):
+    # The first partition made its jobs wait in the queue
+    executor._waits = [[600.0], [5.0]]
+    executor._durations = [[60.0], [60.0]]
+    assert executor._choose() == 1
+    # Its jobs are worth sending there again once the other one is loaded
+    executor._in_flight[1] = [(None, 0.0, 0.0)] * 20
+    executor.refresh = lambda: None
+    assert executor._choose() == 0
+
+
+def test_parameters_precedence(executor):
+    executor.update_parameters(timeout_min=7, cpus_per_task=2)
+    assert executor.executors[0].parameters["timeout_min"] == 7
+    assert executor.executors[1].parameters["cpus_per_task"] == 2
+
+
+def sleepy_double(x):
+    time.sleep(2.0)
+    return [2.0 * x[0]]
+
+
+def test_observed_times(executor):
+    f = ot.PythonFunction(1, 1, sleepy_double)
+    sf = othpc.SubmitFunction(f, backend=executor)
+    sf([[1.0], [2.0], [3.0]])
+    sf([[4.0], [5.0], [6.0]])
+    # The jobs are observed while the driver waits, from the files of their tasks
+    assert sum(len(durations) for durations in executor._durations) == 6
+    for durations in executor._durations:
+        assert all(1.5 < duration < 4.0 for duration in durations)
+    for waits in executor._waits:
+        assert all(wait < 4.0 for wait in waits)
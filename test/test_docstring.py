@@ -4,3 +4,51 @@ import othpc
 
 def test_submitfunction_doctest():
     doctest.testmod(othpc.submit_function, optionflags=doctest.ELLIPSIS)
+
+
+def test_simulation_doctest():
+    doctest.testmod(othpc.simulation, optionflags=doctest.ELLIPSIS)
+
+
+def test_ask_tell_doctest():
+    doctest.testmod(othpc.ask_tell, optionflags=doctest.ELLIPSIS)
+
+
+def test_runtime_model_doctest():
+    doctest.testmod(othpc.runtime_model, optionflags=doctest.ELLIPSIS)
+
+
+def test_shared_scheduler_doctest():
+    doctest.testmod(othpc.shared_scheduler, optionflags=doctest.ELLIPSIS)
+
+
+def test_template_doctest():
+    doctest.testmod(othpc.template, optionflags=doctest.ELLIPSIS)
+
+
+def test_utils_doctest():
+    doctest.testmod(othpc.utils, optionflags=doctest.ELLIPSIS)
+
+
+def test_evaluation_group_doctest():
+    doctest.testmod(othpc.evaluation_group, optionflags=doctest.ELLIPSIS)
+
+
+def test_persistent_model_doctest():
+    doctest.testmod(othpc.persistent_model, optionflags=doctest.ELLIPSIS)
+
+
+def test_field_store_doctest():
+    doctest.testmod(othpc.field_store, optionflags=doctest.ELLIPSIS)
+
+
+def test_telemetry_doctest():
+    doctest.testmod(othpc.telemetry, optionflags=doctest.ELLIPSIS)
+
+
+def test_dispatch_doctest():
+    doctest.testmod(othpc.dispatch, optionflags=doctest.ELLIPSIS)
+
+
+def test_result_store_doctest():
+    doctest.testmod(othpc.result_store, optionflags=doctest.ELLIPSIS)
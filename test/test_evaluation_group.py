@@ -0,0 +1,41 @@
+import os
+import othpc
+import openturns as ot
+import pytest
+
+
+def group_model(x):
+    group = othpc.get_evaluation_group()
+    return [2.0 * x[0], group.size, group.rank]
+
+
+@pytest.fixture
+def model():
+    f = ot.PythonFunction(1, 3, group_model)
+    return othpc.SubmitFunction(
+        f, ntasks_per_node=4, ranks_per_evaluation=2, backend="local"
+    )
+
+
+def test_groups(model):
+    assert model.tasks_per_job == 2
+    Y = model([[1.0], [2.0], [3.0]])
+    assert list(Y.getMarginal(0).asPoint()) == [2.0, 4.0, 6.0]
+    # Every evaluation ran on two ranks, the output is the one of rank 0
+    assert list(Y.getMarginal(1).asPoint()) == [2.0] * 3
+    assert list(Y.getMarginal(2).asPoint()) == [0.0] * 3
+
+
+def test_files_per_group(model):
+    model([[1.0], [2.0]])
+    prefix = f"local-{os.getpid()}-"
+    job_numbers = [int(d[len(prefix) :]) for d in os.listdir("logs") if d.startswith(prefix)]
+    files = os.listdir(os.path.join("logs", f"{prefix}{max(job_numbers)}"))
+    outputs = sorted(f for f in files if f.endswith("_output.csv"))
+    assert [f.split("_")[-2] for f in outputs] == ["0", "1"]
+
+
+def test_indivisible():
+    f = ot.SymbolicFunction(["x"], ["x"])
+    with pytest.raises(ValueError):
+        othpc.SubmitFunction(f, ntasks_per_node=3, ranks_per_evaluation=2)
@@ -0,0 +1,118 @@
+import os
+import numpy as np
+import othpc
+import openturns as ot
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+FIELD_SIZE = 5000
+
+
+def field_model(x):
+    return list(x[0] * np.linspace(0.0, 1.0, FIELD_SIZE))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return othpc.FieldStore(tmp_path / "fields", FIELD_SIZE, chunk_size=2)
+
+
+def test_field_outputs(store):
+    f = ot.PythonFunction(1, FIELD_SIZE, field_model)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", field_store=store)
+    assert list(sf.getOutputDescription()) == ["field_index", "mean", "min", "max"]
+    X = [[1.0], [2.0], [3.0]]
+    Y = sf(X)
+    assert list(Y.getMarginal(1).asPoint()) == [0.5, 1.0, 1.5]
+    assert list(Y.getMarginal(3).asPoint()) == [1.0, 2.0, 3.0]
+    fields = store.read([int(slot) for slot in Y.getMarginal(0).asPoint()])
+    for x, field in zip(X, fields):
+        np.testing.assert_allclose(field, field_model(x))
+    # The store is reopened with its slots
+    reopened = othpc.FieldStore(store.directory, FIELD_SIZE, chunk_size=2)
+    assert len(reopened) == 3
+    np.testing.assert_allclose(reopened[int(Y[2, 0])], fields[2])
+
+
+def test_wrong_size(store):
+    f = ot.SymbolicFunction(["x"], ["x"])
+    with pytest.raises(ValueError):
+        othpc.SubmitFunction(f, backend="local", field_store=store)
+
+
+def test_cached_fields(store, tmp_path):
+    results = tmp_path / "results"
+    X = [[1.0], [2.0]]
+    for k, x in enumerate(X):
+        simu_dir = results / f"eval_{k}"
+        simu_dir.mkdir(parents=True)
+        othpc.make_report_file(str(simu_dir), x, field_model(x), field_store=store)
+    othpc.make_summary_file(str(results))
+    summary_file = str(results / "summary.csv")
+
+    def failing_model(x):
+        raise RuntimeError("The cached points are not evaluated again.")
+
+    f = ot.PythonFunction(1, FIELD_SIZE, failing_model)
+    sf = othpc.SubmitFunction(f, backend="local", field_store=store)
+    with pytest.raises(ValueError):
+        othpc.load_cache(sf, summary_file)
+    memoize = othpc.load_cache(sf, summary_file, field_store=store)
+    Y = memoize(X)
+    assert list(Y.getMarginal(3).asPoint()) == [1.0, 2.0]
+    for x, y in zip(X, Y):
+        np.testing.assert_allclose(store[int(y[0])], field_model(x))
+
+
+def test_fields_per_task(store):
+    f = ot.PythonFunction(1, FIELD_SIZE, field_model)
+    sf = othpc.SubmitFunction(f, backend="local", field_store=store, points_per_task=2)
+    X = [[1.0], [2.0], [3.0]]
+    Y = sf(X)
+    fields = store.read([int(slot) for slot in Y.getMarginal(0).asPoint()])
+    for x, field in zip(X, fields):
+        np.testing.assert_allclose(field, field_model(x))
+
+
+def test_shared_store(store):
+    # Two drivers opening the same store before any allocation
+    other = othpc.FieldStore(store.directory, FIELD_SIZE, chunk_size=2)
+    first = store.allocate(3)
+    second = other.allocate(2)
+    third = store.allocate(1)
+    assert set(first).isdisjoint(second)
+    slots = list(first) + list(second) + list(third)
+    assert sorted(slots) == list(range(6))
+    other.write(second[0], np.ones(FIELD_SIZE))
+    store.write(first[2], np.zeros(FIELD_SIZE))
+    np.testing.assert_allclose(store[second[0]], np.ones(FIELD_SIZE))
+    assert len(store) == len(other) == 6
+
+
+def test_concurrent_allocations(store):
+    other = othpc.FieldStore(store.directory, FIELD_SIZE, chunk_size=2)
+    with ThreadPoolExecutor(8) as pool:
+        ranges = list(pool.map(lambda k: [store, other][k % 2].allocate(3), range(32)))
+    slots = [slot for slots in ranges for slot in slots]
+    assert sorted(slots) == list(range(96))
+
+
+def test_retried_point_same_slot(store, tmp_path):
+    marker = str(tmp_path / "crashed")
+
+    def crashing_model(x):
+        # The first evaluation kills its worker process, like a failed node
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        return field_model(x)
+
+    f = ot.PythonFunction(1, FIELD_SIZE, crashing_model)
+    sf = othpc.SubmitFunction(f, backend="local", field_store=store, max_retries=1)
+    X = [[1.0], [2.0], [3.0]]
+    Y = sf(X)
+    # No slot is reserved for the retry
+    assert len(store) == 3
+    fields = store.read([int(slot) for slot in Y.getMarginal(0).asPoint()])
+    for x, field in zip(X, fields):
+        np.testing.assert_allclose(field, field_model(x))
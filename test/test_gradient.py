@@ -0,0 +1,66 @@
+import pickle
+import othpc
+import openturns as ot
+import openturns.testing as ott
+import pytest
+
+
+@pytest.fixture
+def model():
+    f = ot.SymbolicFunction(["x0", "x1"], ["x0^4 + x0^2 * x1^2", "x0 * x1"])
+    return othpc.SubmitFunction(f, ntasks_per_node=4, backend="local")
+
+
+def test_gradient_as_openturns(model):
+    x = [1.0, 2.0]
+    f = ot.SymbolicFunction(["x0", "x1"], ["x0^4 + x0^2 * x1^2", "x0 * x1"])
+    reference = ot.Function(ot.PythonFunction(2, 2, f)).gradient(x)
+    ott.assert_almost_equal(ot.Function(model).gradient(x), reference)
+
+
+def test_hessian_as_openturns(model):
+    x = [1.0, 2.0]
+    f = ot.SymbolicFunction(["x0", "x1"], ["x0^4 + x0^2 * x1^2", "x0 * x1"])
+    reference = ot.Function(ot.PythonFunction(2, 2, f)).hessian(x)
+    hessian = ot.Function(model).hessian(x)
+    for i in range(2):
+        for j in range(2):
+            for k in range(2):
+                ott.assert_almost_equal(hessian[i, j, k], reference[i, j, k])
+
+
+def test_single_wave(model):
+    submitted = []
+    submit = model.executor.submit
+
+    def counting_submit(fn, *args):
+        submitted.append(args[0].getSize())
+        return submit(fn, *args)
+
+    model.executor.submit = counting_submit
+    X = [[1.0, 2.0], [3.0, 4.0], [1.0, 2.0]]
+    gradients = model.gradients(X)
+    assert len(gradients) == 3
+    # 2 distinct points with 4 perturbed points each, packed 4 per job
+    assert sum(submitted) == 8 and len(submitted) == 2
+    # The centers of the hessian scheme are already cached
+    model([[1.0, 2.0], [3.0, 4.0]])
+    submitted.clear()
+    model.hessians([[1.0, 2.0]])
+    assert sum(submitted) == 8
+
+
+def test_full_cache():
+    f = ot.SymbolicFunction(["x0", "x1"], ["x0^4 + x0^2 * x1^2", "x0 * x1"])
+    model = othpc.SubmitFunction(f, ntasks_per_node=4, backend="local", cache_size=4)
+    first = model.gradients([[1.0, 2.0]])
+    # The evaluation of the new points evicts the cached ones
+    gradients = model.gradients([[1.0, 2.0], [3.0, 4.0]])
+    ott.assert_almost_equal(gradients[0], first[0])
+    ott.assert_almost_equal(gradients[1], f.gradient([3.0, 4.0]), 1e-4, 1e-4)
+
+
+def test_cache_not_pickled(model):
+    model([[1.0, 2.0], [3.0, 4.0]])
+    assert len(model._cache) == 2
+    assert len(pickle.loads(pickle.dumps(model))._cache) == 0
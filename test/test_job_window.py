@@ -0,0 +1,77 @@
+import json
+import othpc
+import openturns as ot
+import pytest
+
+
+@pytest.fixture
+def model():
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    return othpc.SubmitFunction(f, backend="local", max_jobs_in_flight=2)
+
+
+def test_window(model, monkeypatch):
+    in_flight = []
+    jobs = []
+    submit = othpc.LocalPoolExecutor.submit
+
+    def spy(executor, fn, *args):
+        in_flight.append(sum(not job.done() for job in jobs))
+        job = submit(executor, fn, *args)
+        jobs.append(job)
+        return job
+
+    monkeypatch.setattr(othpc.LocalPoolExecutor, "submit", spy)
+    X = [[float(i)] for i in range(6)]
+    Y = model(X)
+    assert list(Y.asPoint()) == [2.0 * i for i in range(6)]
+    assert len(jobs) == 6
+    # Never more than two jobs in flight
+    assert max(in_flight) <= 1
+
+
+def test_auto_without_slurm(monkeypatch):
+    monkeypatch.setattr(othpc.submit_function, "slurm_job_limit", lambda qos: None)
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(f, backend="local", max_jobs_in_flight="auto")
+    assert sf._job_cap() is None
+    monkeypatch.setattr(othpc.submit_function, "slurm_job_limit", lambda qos: 10)
+    monkeypatch.setattr(othpc.submit_function, "slurm_queued_jobs", lambda: 4)
+    assert sf._job_cap() == 6
+
+
+def test_reattach_partial_window(model):
+    X = ot.Sample([[1.0], [2.0], [3.0]])
+    model.checkpoint = "double"
+    # A first driver submitted only the first batch of its window before dying
+    batches = model._make_batches(len(X))
+    jobs = model._submit_jobs(X, batches[:1])
+    manifest_file = model._manifest_file(X)
+    model._write_manifest(manifest_file, [list(zip(jobs, batches[:1]))])
+    for job in jobs:
+        job.results()
+    # Its process is gone
+    with open(manifest_file) as file:
+        manifest = json.load(file)
+    manifest["owner"]["pid"] = 2**22 + 1
+    with open(manifest_file, "w") as file:
+        json.dump(manifest, file)
+    Y = model(X)
+    assert list(Y.asPoint()) == [2.0, 4.0, 6.0]
+
+
+def test_manifest_writes(monkeypatch):
+    writes = []
+    write_manifest = othpc.SubmitFunction._write_manifest
+
+    def spy(sf, manifest_file, rounds):
+        writes.append(len(rounds[0]))
+        write_manifest(sf, manifest_file, rounds)
+
+    monkeypatch.setattr(othpc.SubmitFunction, "_write_manifest", spy)
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    sf = othpc.SubmitFunction(f, backend="local", max_jobs_in_flight=4, checkpoint="double")
+    Y = sf([[float(i)] for i in range(12)])
+    assert list(Y.asPoint()) == [2.0 * i for i in range(12)]
+    # The manifest is written once per poll, not once per submission
+    assert 0 < len(writes) < 12
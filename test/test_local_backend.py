@@ -0,0 +1,85 @@
+import math
+import os
+import time
+import multiprocessing
+import othpc
+import openturns as ot
+import openturns.testing as ott
+from othpc.example import warren_truss_displacement
+import pytest
+
+
+X = [
+    [2.22028e11, 0.0103039, -2094.11],
+    [1.84165e11, 0.00960417, -1947.8],
+    [2.00019e11, 0.0114843, -2458.01],
+    [2.35658e11, 0.0107884, -2256.58],
+    [1.68096e11, 0.0107696, -2262.36],
+]
+Y_ref = [
+    [-3.00491e-05],
+    [-3.6151e-05],
+    [-3.51279e-05],
+    [-2.91375e-05],
+    [-4.10248e-05],
+]
+
+
+@pytest.fixture
+def model():
+    truss_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+    sf = othpc.SubmitFunction(truss_model, ntasks_per_node=2, backend="local")
+    return sf
+
+
+def test_sample(model):
+    Y = ot.Function(model)(X)
+    ott.assert_almost_equal(Y, ot.Sample(Y_ref))
+
+
+def test_logs_layout(model):
+    job = model.executor.submit(model.task, ot.Sample(X[:2]))
+    assert job.results() is not None
+    for task_number in range(2):
+        filename = os.path.join(
+            "logs", job.job_id, f"{job.job_id}_{task_number}_output.csv"
+        )
+        assert os.path.isfile(filename)
+
+
+def test_partial_failure():
+    def failing_function(x):
+        if x[0] < 0.0:
+            raise ValueError("negative input")
+        return [2.0 * x[0]]
+
+    f = ot.PythonFunction(1, 1, failing_function)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local")
+    Y = sf([[1.0], [-1.0], [3.0]])
+    assert Y[0, 0] == 2.0
+    assert math.isnan(Y[1, 0])
+    assert Y[2, 0] == 6.0
+
+
+def test_cpu_budget():
+    executor = othpc.LocalPoolExecutor(cpus=8)
+    executor.update_parameters(cpus_per_task=3)
+    assert executor.max_workers == 2
+
+
+def forking_task():
+    # The child inherits the end of the pipe of the worker
+    child = multiprocessing.Process(target=time.sleep, args=(60.0,))
+    child.start()
+    time.sleep(60.0)
+
+
+def test_cancel_forking_task():
+    executor = othpc.LocalPoolExecutor(folder="logs/%j")
+    job = executor.submit(forking_task)
+    time.sleep(2.0)
+    start = time.time()
+    job.cancel()
+    with pytest.raises(Exception):
+        job.result()
+    assert time.time() - start < 10.0
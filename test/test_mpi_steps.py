@@ -0,0 +1,57 @@
+import os
+import stat
+import sys
+import openturns as ot
+import openturns.testing as ott
+from othpc.example import MPILoadSimulator
+import pytest
+
+# Stand-in for srun: records its options and computes the result of myMPIProgram
+SRUN = f"""#!{sys.executable}
+import math, os, sys
+args = sys.argv[1:]
+program = next(i for i, arg in enumerate(args) if not arg.startswith("--"))
+options = args[:program]
+values = [float(arg) for arg in args[program + 1 :] if not arg.startswith("--")]
+with open(os.path.join(os.environ["SRUN_LOG_DIR"], f"srun_{{os.getpid()}}.txt"), "w") as f:
+    f.write(" ".join(options))
+with open("result.txt", "w") as f:
+    f.write("result is : %.16e" % math.sqrt(sum(values)))
+"""
+
+
+@pytest.fixture
+def srun(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "srun"
+    script.write_text(SRUN)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("SRUN_LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("SLURM_JOB_ID", "1234")
+    return tmp_path
+
+
+def test_command():
+    model = MPILoadSimulator(
+        nb_mpi_proc=4, nb_slurm_nodes=2, launcher="mpiexec", results_directory="."
+    )
+    assert model._command([1.0, 2.0]).startswith("mpiexec -n 4 ")
+
+
+def test_steps(srun):
+    model = MPILoadSimulator(
+        nb_mpi_proc=4,
+        nb_slurm_nodes=2,
+        results_directory=str(srun),
+        launcher="auto",
+        n_parallel=2,
+    )
+    X = [[1.0, 3.0], [2.0, 7.0], [5.0, 11.0]]
+    Y = ot.Function(model)(X)
+    ott.assert_almost_equal(Y, ot.Sample([[2.0], [3.0], [4.0]]))
+    logs = [f for f in os.listdir(srun) if f.startswith("srun_")]
+    assert len(logs) == len(X)
+    with open(os.path.join(srun, logs[0])) as f:
+        assert f.read().startswith("--overlap --exact --nodes=2 --ntasks=4")
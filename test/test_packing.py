@@ -0,0 +1,22 @@
+import othpc
+import openturns as ot
+import pytest
+
+
+@pytest.fixture
+def model():
+    f = ot.SymbolicFunction(["x"], ["2 * x"])
+    cost = ot.SymbolicFunction(["x"], ["x"])
+    return othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", cost_model=cost)
+
+
+def test_longest_first(model):
+    costs = [3.0, 10.0, 1.0, 7.0, 2.0]
+    batches = model._make_batches(len(costs), costs)
+    assert batches == [[1, 3], [0, 4], [2]]
+
+
+def test_order_preserved(model):
+    X = [[3.0], [10.0], [1.0], [7.0], [2.0]]
+    Y = model(X)
+    assert list(Y.asPoint()) == [6.0, 20.0, 2.0, 14.0, 4.0]
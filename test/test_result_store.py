@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import threading
+import othpc
+import openturns as ot
+import pytest
+
+
+class CountingModel(ot.OpenTURNSPythonFunction):
+    """Slow model recording each of its evaluations in a file."""
+
+    def __init__(self, log_file):
+        super().__init__(1, 1)
+        self.log_file = log_file
+
+    def _exec(self, x):
+        time.sleep(2.0)
+        with open(self.log_file, "a") as file:
+            file.write(f"{x[0]}\n")
+        if x[0] < 0.0:
+            raise ValueError("Negative input")
+        return [2.0 * x[0]]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    return str(tmp_path / "evaluations.txt")
+
+
+def driver(log_file, directory):
+    f = ot.Function(CountingModel(log_file))
+    # Each driver has its own store object, as in another process
+    store = othpc.ResultStore(directory)
+    return othpc.SubmitFunction(f, ntasks_per_node=4, backend="local", result_store=store)
+
+
+def evaluations(log_file):
+    with open(log_file) as file:
+        return sorted(float(line) for line in file)
+
+
+def test_concurrent_drivers(tmp_path, log_file):
+    directory = tmp_path / "store"
+    outputs = {}
+    first = threading.Thread(
+        target=lambda: outputs.update(first=driver(log_file, directory)([[1.0], [2.0], [3.0]]))
+    )
+    first.start()
+    time.sleep(0.5)
+    outputs["second"] = driver(log_file, directory)([[2.0], [3.0], [4.0]])
+    first.join()
+    assert list(outputs["first"].asPoint()) == [2.0, 4.0, 6.0]
+    assert list(outputs["second"].asPoint()) == [4.0, 6.0, 8.0]
+    # The points requested by both drivers were evaluated once
+    assert evaluations(log_file) == [1.0, 2.0, 3.0, 4.0]
+    # And are reused by the next calls
+    assert list(driver(log_file, directory)([[4.0], [1.0]]).asPoint()) == [8.0, 2.0]
+    assert len(evaluations(log_file)) == 4
+
+
+def test_failed_point_recorded(tmp_path, log_file):
+    store = othpc.ResultStore(tmp_path / "store")
+    f = ot.Function(CountingModel(log_file))
+    sf = othpc.SubmitFunction(f, backend="local", result_store=store)
+    Y = sf([[-1.0]])
+    assert Y[0, 0] != Y[0, 0]
+    assert store.get([-1.0]) is None
+    # The claim is released and the failure recorded
+    assert os.listdir(store.directory) == [f"{store.key([-1.0])}.failures"]
+    assert store.failures([-1.0]) == 1
+    # The other drivers do not evaluate the point again
+    Y = driver(log_file, store.directory)([[-1.0], [1.0]])
+    assert Y[0, 0] != Y[0, 0] and Y[1, 0] == 2.0
+    assert evaluations(log_file) == [-1.0, 1.0]
+    # Unless they allow more failures
+    retrying = othpc.ResultStore(store.directory, max_failures=2)
+    sf = othpc.SubmitFunction(f, backend="local", result_store=retrying)
+    sf([[-1.0]])
+    assert evaluations(log_file) == [-1.0, -1.0, 1.0]
+    assert retrying.given_up([-1.0])
+
+
+def test_stale_claim(tmp_path):
+    store = othpc.ResultStore(tmp_path / "store", stale_after=3600.0)
+    other = othpc.ResultStore(tmp_path / "store")
+    assert store.claim([1.0])
+    assert not other.claim([1.0])
+    # The claim of a driver whose process is gone is taken over
+    claim_file = os.path.join(store.directory, f"{store.key([2.0])}.claim")
+    with open(claim_file, "w") as file:
+        json.dump({"host": store._owner["host"], "pid": 2**22 + 1}, file)
+    assert store.claim([2.0])
+    # As well as a claim of another host which was not refreshed
+    claim_file = os.path.join(store.directory, f"{store.key([3.0])}.claim")
+    with open(claim_file, "w") as file:
+        json.dump({"host": "elsewhere", "pid": 1}, file)
+    assert not store.claim([3.0])
+    os.utime(claim_file, (time.time() - 7200.0, time.time() - 7200.0))
+    assert store.claim([3.0])
+
+
+def test_claim_taken_over_meanwhile(tmp_path, monkeypatch):
+    store = othpc.ResultStore(tmp_path / "store")
+    other = othpc.ResultStore(tmp_path / "store")
+    other._owner = {"host": store._owner["host"], "pid": os.getppid()}
+    claim_file = os.path.join(store.directory, f"{store.key([1.0])}.claim")
+    with open(claim_file, "w") as file:
+        json.dump({"host": store._owner["host"], "pid": 2**22 + 1}, file)
+    stale_owner = store._stale_owner
+
+    def taken_over(claim_file):
+        # The other driver takes the stale claim over between the check and the rename
+        owner = stale_owner(claim_file)
+        os.remove(claim_file)
+        assert other.claim([1.0])
+        return owner
+
+    monkeypatch.setattr(store, "_stale_owner", taken_over)
+    assert not store.claim([1.0])
+    with open(claim_file) as file:
+        assert json.load(file) == other._owner
+    assert os.listdir(store.directory) == [os.path.basename(claim_file)]
@@ -0,0 +1,54 @@
+import glob
+import math
+import os
+import time
+import othpc
+import openturns as ot
+
+
+def test_infrastructure_failure_retried(tmp_path):
+    marker = str(tmp_path / "crashed")
+
+    def crashing_function(x):
+        # The first evaluation kills its worker process, like a failed node
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        return [2.0 * x[0]]
+
+    f = ot.PythonFunction(1, 1, crashing_function)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", max_retries=2)
+    Y = sf([[1.0], [2.0], [3.0]])
+    assert list(Y.asPoint()) == [2.0, 4.0, 6.0]
+
+
+def test_model_failure_not_retried(tmp_path):
+    counter = str(tmp_path / "counter")
+
+    def failing_function(x):
+        with open(counter, "a") as file:
+            file.write("call\n")
+        raise ValueError("F est strictement negatif")
+
+    f = ot.PythonFunction(1, 1, failing_function)
+    sf = othpc.SubmitFunction(f, backend="local", max_retries=2)
+    Y = sf([[1.0]])
+    assert math.isnan(Y[0, 0])
+    with open(counter) as file:
+        assert len(file.readlines()) == 1
+    error_files = glob.glob(os.path.join("logs", "*", "*_error.txt"))
+    assert len(error_files) > 0
+
+
+def test_timeout_escalation():
+    def slow_function(x):
+        time.sleep(2.0)
+        return [2.0 * x[0]]
+
+    f = ot.PythonFunction(1, 1, slow_function)
+    sf = othpc.SubmitFunction(
+        f, timeout_per_job=0.02, backend="local", max_retries=1
+    )
+    Y = sf([[1.0]])
+    assert Y[0, 0] == 2.0
+    assert len(glob.glob(os.path.join("logs", "LikelyTimeout_*"))) > 0
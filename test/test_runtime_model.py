@@ -0,0 +1,67 @@
+import pickle
+import time
+import othpc
+import openturns as ot
+import openturns.testing as ott
+
+
+def test_history_reloaded(tmp_path):
+    history_file = str(tmp_path / "runtimes.csv")
+    model = othpc.RuntimeModel(2, history_file, neighbours=1)
+    model.update([[0.0, 0.0], [10.0, 10.0]], [1.0, 100.0], [10.0, 20.0])
+    model.update([[5.0, 5.0]], [50.0], [15.0])
+    reloaded = othpc.RuntimeModel(2, history_file, neighbours=1)
+    assert reloaded.getSize() == 3
+    ott.assert_almost_equal(reloaded.predict([[9.0, 9.0]])[0, 0], 100.0)
+    ott.assert_almost_equal(reloaded.predict_memory([[1.0, 0.0]])[0, 0], 10.0)
+    assert reloaded.walltime([[9.0, 9.0]]) == 4
+
+
+def test_updated_by_submit_function(tmp_path):
+    def sleeping_function(x):
+        time.sleep(x[0])
+        return [x[0]]
+
+    model = othpc.RuntimeModel(1, str(tmp_path / "runtimes.csv"), neighbours=1)
+    f = ot.PythonFunction(1, 1, sleeping_function)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", runtime_model=model)
+    sf([[0.1], [1.0], [0.2]])
+    assert model.getSize() == 3
+    assert model.predict([[0.9]])[0, 0] > 0.9
+    # The longest points now go first
+    assert sf._make_batches(3, sf._estimate_costs(ot.Sample([[0.1], [0.2], [1.0]]))) == [
+        [2, 1],
+        [0],
+    ]
+
+
+def test_simulated_design():
+    model = othpc.RuntimeModel(1, neighbours=1)
+    model.update([[1.0], [2.0]], [60.0, 120.0], [1.0, 1.0])
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local")
+    simulator = othpc.SchedulerSimulator(sf, 1, model)
+    report = simulator.simulate([[1.0], [2.0], [2.0], [1.0]])
+    ott.assert_almost_equal(report["makespan"], 240.0)
+
+
+class Underestimating(othpc.RuntimeModel):
+    """Runtime model predicting a walltime of a few seconds whatever the points."""
+
+    def walltime(self, X):
+        return 0.05
+
+
+def test_underestimated_walltime():
+    def sleeping_function(x):
+        time.sleep(x[0])
+        return [x[0]]
+
+    model = Underestimating(1, neighbours=1)
+    f = ot.PythonFunction(1, 1, sleeping_function)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", runtime_model=model)
+    # The job killed before its predicted walltime is resubmitted with the timeout per job
+    Y = sf([[0.1], [6.0]])
+    assert list(Y.asPoint()) == [0.1, 6.0]
+    # The model only travels with the driver
+    assert pickle.loads(pickle.dumps(sf)).runtime_model is None
@@ -0,0 +1,71 @@
+import os
+import time
+import threading
+import othpc
+import openturns as ot
+import pytest
+from othpc.submit_function import _SharedSubsample
+
+
+@pytest.fixture
+def model():
+    f = ot.SymbolicFunction(["x0", "x1"], ["x0 + 10 * x1"])
+    return othpc.SubmitFunction(
+        f, ntasks_per_node=2, backend="local", shared_inputs=True
+    )
+
+
+def test_shared_inputs(model):
+    X = ot.Sample([[float(i), float(i + 1)] for i in range(5)])
+    submitted = []
+    submit = model.executor.submit
+
+    def spy(fn, *args):
+        submitted.append(args[0])
+        return submit(fn, *args)
+
+    model.executor.submit = spy
+    Y = model(X)
+    assert list(Y.asPoint()) == [10.0 * (i + 1) + i for i in range(5)]
+    # The jobs only received the indices of their points
+    assert all(isinstance(inputs, _SharedSubsample) for inputs in submitted)
+    assert [len(inputs) for inputs in submitted] == [2, 2, 1]
+    # The file of the sample is removed once the call returns
+    assert not os.path.isfile(submitted[0].filename)
+
+
+def slow_sum(x):
+    time.sleep(0.5)
+    return [x[0] + 10.0 * x[1]]
+
+
+def test_concurrent_calls():
+    f = ot.PythonFunction(2, 1, slow_sum)
+    model = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", shared_inputs=True)
+    X = ot.Sample([[float(i), float(i + 1)] for i in range(5)])
+    outputs = {}
+    first = threading.Thread(target=lambda: outputs.update(first=model(X)))
+    first.start()
+    time.sleep(0.5)
+    outputs["second"] = model(X)
+    first.join()
+    # Each call had its own file, which the other one did not remove under its jobs
+    for Y in outputs.values():
+        assert list(Y.asPoint()) == [10.0 * (i + 1) + i for i in range(5)]
+
+
+def test_removed_on_error(model):
+    X = ot.Sample([[float(i), float(i + 1)] for i in range(5)])
+    submitted = []
+    submit = model.executor.submit
+
+    def failing_submit(fn, *args):
+        submitted.append(args[0])
+        if len(submitted) > 1:
+            raise RuntimeError("Submission refused")
+        return submit(fn, *args)
+
+    model.executor.submit = failing_submit
+    with pytest.raises(RuntimeError):
+        model(X)
+    assert not os.path.isfile(submitted[0].filename)
@@ -0,0 +1,89 @@
+import time
+import threading
+import othpc
+import openturns as ot
+import pytest
+
+
+@pytest.fixture
+def scheduler():
+    return othpc.SharedScheduler(cpus_per_node=4, backend="local")
+
+
+def test_two_models(scheduler):
+    cheap = othpc.SubmitFunction(ot.SymbolicFunction(["x"], ["2 * x"]), backend="local")
+    costly = othpc.SubmitFunction(
+        ot.SymbolicFunction(["x"], ["x^2"]), cpus_per_task=2, backend="local"
+    )
+    scheduler.register(cheap)
+    scheduler.register(costly)
+    X = [[1.0], [2.0], [3.0]]
+    Y_cheap, Y_costly = scheduler.evaluate([(cheap, X), (costly, X)])
+    assert list(Y_cheap.asPoint()) == [2.0, 4.0, 6.0]
+    assert list(Y_costly.asPoint()) == [1.0, 4.0, 9.0]
+    # Calls of a registered function go through the scheduler
+    Y = costly([[4.0], [5.0]])
+    assert list(Y.asPoint()) == [16.0, 25.0]
+
+
+def test_packing(scheduler):
+    entries = [(0, i, 1, 1000) for i in range(4)] + [(1, i, 2, 1000) for i in range(3)]
+    jobs = scheduler._pack(entries)
+    assert len(jobs) == 3
+    for job in jobs:
+        assert sum(entry[2] for entry in job) <= 4
+
+
+def test_too_large(scheduler):
+    f = othpc.SubmitFunction(
+        ot.SymbolicFunction(["x"], ["x"]), cpus_per_task=8, backend="local"
+    )
+    with pytest.raises(ValueError):
+        scheduler.register(f)
+
+
+@pytest.mark.parametrize(
+    "setting",
+    [
+        {"max_retries": 1},
+        {"straggler_factor": 3.0},
+        {"max_evaluations": 10},
+        {"max_jobs_in_flight": 2},
+        {"shared_inputs": True},
+        {"cost_model": ot.SymbolicFunction(["x"], ["x"])},
+        {"runtime_model": othpc.RuntimeModel(1)},
+        {"backend": "slurm"},
+        {"telemetry": othpc.Telemetry("metrics.prom")},
+    ],
+)
+def test_unsupported_settings(scheduler, setting):
+    parameters = {"backend": "local"}
+    parameters.update(setting)
+    f = othpc.SubmitFunction(ot.SymbolicFunction(["x"], ["x"]), **parameters)
+    with pytest.raises(ValueError, match=list(setting)[0]):
+        scheduler.register(f)
+
+
+def slow(x):
+    time.sleep(30.0)
+    return x
+
+
+def test_cancel(scheduler):
+    f = othpc.SubmitFunction(ot.PythonFunction(1, 1, slow), backend="local")
+    scheduler.register(f)
+    canceller = threading.Timer(2.0, f.cancel)
+    canceller.start()
+    start = time.time()
+    Y = f([[1.0], [2.0]])
+    canceller.join()
+    assert time.time() - start < 20.0
+    assert all(y != y for y in Y.asPoint())
+
+
+def test_checkpoint_skipped(scheduler):
+    f = othpc.SubmitFunction(
+        ot.SymbolicFunction(["x"], ["x"]), backend="local", checkpoint="identity"
+    )
+    scheduler.register(f)
+    assert list(f([[1.0], [2.0]]).asPoint()) == [1.0, 2.0]
@@ -0,0 +1,66 @@
+import othpc
+import openturns as ot
+import openturns.testing as ott
+import pytest
+
+
+@pytest.fixture
+def model():
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(f, ntasks_per_node=4, timeout_per_job=5, backend="local")
+    return sf
+
+
+def test_makespan(model):
+    # 3 jobs of 60 s on 2 nodes: the third job waits for a free node
+    simulator = othpc.SchedulerSimulator(model, 2, ot.Dirac(60.0), ot.Dirac(100.0))
+    report = simulator.simulate(10)
+    ott.assert_almost_equal(report["makespan"], 220.0)
+    ott.assert_almost_equal(report["node_hours"], 3 * 60.0 / 3600.0)
+    ott.assert_almost_equal(report["utilization"], 10.0 / 12.0)
+    assert report["padding_slots"] == 2.0
+    assert report["timeouts"] == 0.0
+
+
+def test_timeout(model):
+    simulator = othpc.SchedulerSimulator(model, 4, ot.Dirac(600.0))
+    report = simulator.simulate(8)
+    ott.assert_almost_equal(report["makespan"], 300.0)
+    assert report["timeouts"] == 8.0
+
+
+def test_job_window():
+    # 3 jobs of 60 s on 2 nodes, but a single job in flight: each job is submitted
+    # when the previous one ends and waits in the queue again
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(
+        f, ntasks_per_node=4, timeout_per_job=5, backend="local", max_jobs_in_flight=1
+    )
+    simulator = othpc.SchedulerSimulator(sf, 2, ot.Dirac(60.0), ot.Dirac(100.0))
+    report = simulator.simulate(10)
+    ott.assert_almost_equal(report["makespan"], 3 * 160.0)
+    ott.assert_almost_equal(report["node_hours"], 3 * 60.0 / 3600.0)
+
+
+def test_points_per_task():
+    # 2 jobs of 4 tasks evaluating 2 points each, one after the other
+    f = ot.SymbolicFunction(["x"], ["x"])
+    sf = othpc.SubmitFunction(
+        f, ntasks_per_node=4, timeout_per_job=5, backend="local", points_per_task=2
+    )
+    simulator = othpc.SchedulerSimulator(sf, 2, ot.Dirac(60.0))
+    report = simulator.simulate(10)
+    ott.assert_almost_equal(report["makespan"], 120.0)
+    ott.assert_almost_equal(report["node_hours"], 2 * 120.0 / 3600.0)
+    ott.assert_almost_equal(report["utilization"], 10.0 / 16.0)
+    assert report["padding_slots"] == 6.0
+    simulator = othpc.SchedulerSimulator(sf, 2, ot.Dirac(200.0))
+    # The second point of each of the 5 tasks with 2 points exceeds the timeout of 300 s
+    assert simulator.simulate(10)["timeouts"] == 5.0
+
+
+def test_load_task_runtimes(model):
+    model([[1.0], [2.0], [3.0]])
+    runtimes = othpc.load_task_runtimes("logs")
+    assert runtimes.getSize() >= 3
+    assert runtimes.getMin()[0] >= 0.0
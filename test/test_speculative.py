@@ -0,0 +1,65 @@
+import os
+import time
+import othpc
+import openturns as ot
+
+
+def test_straggler_duplicated(tmp_path):
+    marker = str(tmp_path / "straggled")
+
+    def slow_once(x):
+        # The first evaluation of the last point is a straggler
+        if x[0] == 5.0 and not os.path.exists(marker):
+            open(marker, "w").close()
+            time.sleep(60.0)
+        else:
+            time.sleep(0.2)
+        return [2.0 * x[0]]
+
+    f = ot.PythonFunction(1, 1, slow_once)
+    sf = othpc.SubmitFunction(
+        f, backend="local", straggler_factor=3.0, max_speculative_fraction=0.5
+    )
+    sf.executor.cpus = 4
+    start = time.time()
+    Y = sf([[0.0], [1.0], [2.0], [3.0], [4.0], [5.0]])
+    assert time.time() - start < 30.0
+    assert list(Y.asPoint()) == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+
+def test_losing_duplicate_cancelled(tmp_path, monkeypatch):
+    marker = str(tmp_path / "straggled")
+
+    def slow_once(x):
+        if x[0] == 5.0:
+            # The original evaluation beats its duplicate
+            if not os.path.exists(marker):
+                open(marker, "w").close()
+                time.sleep(5.0)
+            else:
+                time.sleep(60.0)
+        elif x[0] == 4.0:
+            time.sleep(15.0)
+        else:
+            time.sleep(0.2)
+        return [2.0 * x[0]]
+
+    cancelled = []
+    cancel = othpc.local_executor.LocalJob.cancel
+
+    def spy(job, check=True):
+        cancelled.append(time.time())
+        cancel(job, check)
+
+    monkeypatch.setattr(othpc.local_executor.LocalJob, "cancel", spy)
+    f = ot.PythonFunction(1, 1, slow_once)
+    sf = othpc.SubmitFunction(
+        f, backend="local", straggler_factor=3.0, max_speculative_fraction=0.5
+    )
+    sf.executor.cpus = 8
+    start = time.time()
+    Y = sf([[0.0], [1.0], [2.0], [3.0], [4.0], [5.0]])
+    assert list(Y.asPoint()) == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    # The duplicate of the point 5 is cancelled before the point 4 finishes
+    assert len(cancelled) > 0
+    assert min(cancelled) - start < 12.0
@@ -0,0 +1,74 @@
+import math
+import urllib.request
+import othpc
+import openturns as ot
+
+
+def model(x):
+    if x[0] < 0.0:
+        raise ValueError("negative input")
+    return [2.0 * x[0]]
+
+
+def test_metrics_file(tmp_path):
+    metrics_file = str(tmp_path / "othpc.prom")
+    telemetry = othpc.Telemetry(metrics_file=metrics_file, interval=0.0)
+    f = ot.PythonFunction(1, 1, model)
+    sf = othpc.SubmitFunction(f, ntasks_per_node=2, backend="local", telemetry=telemetry)
+    sf([[1.0], [-1.0], [3.0]])
+    metrics = telemetry.metrics()
+    assert metrics["points_done"] == 2
+    assert metrics["points_failed"] == 1
+    assert metrics["points_pending"] == 0
+    assert metrics["evaluations_per_minute"] > 0.0
+    assert not math.isnan(metrics["runtime_p50"])
+    with open(metrics_file) as file:
+        text = file.read()
+    assert 'othpc_points{status="done"} 2' in text
+    assert 'othpc_task_runtime_seconds{quantile="0.9"}' in text
+
+
+def test_http_endpoint():
+    telemetry = othpc.Telemetry(port=0)
+    telemetry.start(4)
+    try:
+        port = telemetry._server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            text = response.read().decode()
+        assert 'othpc_points{status="pending"} 4' in text
+    finally:
+        telemetry.close()
+
+
+class QueuedJob(object):
+    job_id = "queued"
+    state = "PENDING"
+
+    def done(self):
+        return False
+
+
+class FilelessFunction(object):
+    def _task_file(self, job_id, task_number, kind):
+        raise AssertionError("The files of a queued job are not looked at.")
+
+
+def test_observe_queued_and_speculative():
+    telemetry = othpc.Telemetry(interval=0.0)
+    telemetry.start(3)
+    # The first point of the queued job was already evaluated on the local host
+    telemetry.observe(FilelessFunction(), [QueuedJob()], [[0, 1, 2]], {0: [1.0]})
+    metrics = telemetry.metrics()
+    assert metrics["points_done"] == 1
+    assert metrics["points_pending"] == 2
+    assert metrics["jobs_pending"] == 1
+
+
+def test_observe_throttled():
+    telemetry = othpc.Telemetry(interval=60.0)
+    telemetry.start(3)
+    telemetry.observe(FilelessFunction(), [QueuedJob()], [[0, 1, 2]])
+    assert telemetry.metrics()["jobs_pending"] == 1
+    # Within the interval, the jobs are not observed again
+    telemetry.observe(FilelessFunction(), [None], [[0, 1, 2]], {0: [1.0]})
+    assert telemetry.metrics()["points_done"] == 0
@@ -0,0 +1,36 @@
+import os
+import othpc
+import openturns as ot
+import openturns.coupling_tools as otct
+import pytest
+
+
+@pytest.fixture
+def template_file(tmp_path):
+    filename = os.path.join(tmp_path, "input.txt.in")
+    with open(filename, "w") as f:
+        f.write("x1=@x1@\nx10=@x10@\nagain=@x1@ end\n")
+    return filename
+
+
+def test_same_as_coupling_tools(template_file, tmp_path):
+    template = othpc.InputTemplate(template_file, ["@x1@", "@x10@"])
+    reference = os.path.join(tmp_path, "reference.txt")
+    otct.replace(template_file, reference, ["@x1@", "@x10@"], [1.5, 2.0])
+    rendered = os.path.join(tmp_path, "rendered.txt")
+    template.write(ot.Point([1.5, 2.0]), rendered)
+    with open(reference) as f, open(rendered) as g:
+        assert f.read() == g.read()
+
+
+def test_write_sample(template_file, tmp_path):
+    template = othpc.InputTemplate(template_file, ["@x1@", "@x10@"], ["{:.1f}", "{:d}"])
+    files = [os.path.join(tmp_path, f"input_{i}.txt") for i in range(3)]
+    template.write_sample([[float(i), i] for i in range(3)], files)
+    with open(files[2]) as f:
+        assert f.read() == "x1=2.0\nx10=2\nagain=2.0 end\n"
+
+
+def test_missing_token(template_file):
+    with pytest.raises(ValueError):
+        othpc.InputTemplate(template_file, ["@x1@", "@x2@"])
@@ -1,7 +1,12 @@
 import othpc
 import openturns as ot
 import openturns.testing as ott
-from othpc.example import warren_truss_displacement
+from othpc.example import (
+    warren_truss_displacement,
+    WarrenTrussModel,
+    WarrenTrussSession,
+)
+import pickle
 import pytest
 
 
@@ -30,3 +35,89 @@ def test_sample(model):
         [-4.10248e-05],
     ]
     ott.assert_almost_equal(Y, ot.Sample(Y_ref))
+
+
+def test_vectorized():
+    E = ot.LogNormalMuSigma(2.1e11, 2.1e10).getDistribution()
+    A = ot.LogNormalMuSigma(0.01, 0.001).getDistribution()
+    P = ot.Normal(-2000, 200)
+    X = ot.JointDistribution([E, A, P]).getSample(50)
+    per_point_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+    vectorized_model = ot.Function(WarrenTrussModel(block_size=7))
+    ott.assert_almost_equal(vectorized_model(X), per_point_model(X), 1e-10, 0.0)
+
+
+class CountingSession(WarrenTrussSession):
+    setups = 0
+
+    def setup(self):
+        CountingSession.setups += 1
+        super().setup()
+
+
+def test_session():
+    X = ot.Sample([[2.22028e11, 0.0103039, -2094.11], [1.84165e11, 0.00960417, -1947.8]])
+    session = CountingSession()
+    model = ot.Function(session)
+    per_point_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+    ott.assert_almost_equal(model(X), per_point_model(X), 1e-10, 0.0)
+    ott.assert_almost_equal(model(X[0]), per_point_model(X[0]), 1e-10, 0.0)
+    assert CountingSession.setups == 1
+    # The session is not pickled, a copy builds its own
+    copy = pickle.loads(pickle.dumps(session))
+    assert not hasattr(copy, "unit_output")
+    sf = othpc.SubmitFunction(session, ntasks_per_node=2, backend="local")
+    ott.assert_almost_equal(sf(X), per_point_model(X), 1e-10, 0.0)
+
+
+class LoggedSession(WarrenTrussSession):
+    """Session recording its setups in a file, since they happen in the worker processes."""
+
+    def __init__(self, log_file):
+        super().__init__()
+        self.log_file = log_file
+
+    def setup(self):
+        with open(self.log_file, "a") as file:
+            file.write("setup\n")
+        super().setup()
+
+
+def test_session_per_worker(tmp_path):
+    log_file = str(tmp_path / "setups.txt")
+    sf = othpc.SubmitFunction(
+        LoggedSession(log_file),
+        ntasks_per_node=4,
+        backend=othpc.LocalPoolExecutor(cpus=2),
+    )
+    X = ot.Normal([2e11, 0.01, -2000.0], [1e10, 1e-3, 100.0], ot.CorrelationMatrix(3)).getSample(8)
+    per_point_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+    ott.assert_almost_equal(sf(X), per_point_model(X), 1e-10, 0.0)
+    # The two workers of the pool built a session each, for the 8 points of the two jobs
+    with open(log_file) as file:
+        assert len(file.readlines()) <= 2
+
+
+class SampleLoggedSession(LoggedSession):
+    """Session recording the size of the samples it evaluates."""
+
+    def _exec_sample(self, X):
+        with open(self.log_file, "a") as file:
+            file.write(f"sample {len(X)}\n")
+        return super()._exec_sample(X)
+
+
+def test_session_per_task(tmp_path):
+    log_file = str(tmp_path / "setups.txt")
+    sf = othpc.SubmitFunction(
+        SampleLoggedSession(log_file), ntasks_per_node=2, backend="local", points_per_task=4
+    )
+    X = ot.Normal([2e11, 0.01, -2000.0], [1e10, 1e-3, 100.0], ot.CorrelationMatrix(3)).getSample(8)
+    per_point_model = ot.PythonFunction(3, 1, warren_truss_displacement)
+    ott.assert_almost_equal(sf(X), per_point_model(X), 1e-10, 0.0)
+    # Each of the two tasks evaluated its 4 points with a single session,
+    # as it would in a process of its own on SLURM
+    with open(log_file) as file:
+        lines = file.read().split()
+    assert lines.count("sample") == 2 and lines.count("4") == 2
+    assert lines.count("setup") <= 2